@@ -0,0 +1,90 @@
+"""
+Excel export benchmark for Lead Scraper Bot
+Compares the streaming write-only export with the DataFrame-based export
+on rows/sec and peak RSS. Each run happens in a fresh subprocess so peak
+memory is measured independently.
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+
+# Add project root to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+COLUMNS = ['name', 'address', 'phone', 'email', 'website', 'rating', 'category']
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_worker(method: str, rows: int, filename: str) -> dict:
+    """Run a single export and report timings (executed in a subprocess)"""
+    from benchmarks.datasets import generate_leads
+    from src.utils import export_to_excel, export_rows_to_excel
+
+    baseline_rss = peak_rss_mb()
+    start = time.perf_counter()
+
+    if method == 'streaming':
+        export_rows_to_excel(generate_leads(rows), filename, COLUMNS)
+    else:
+        # The DataFrame export needs the whole result list up front
+        export_to_excel(list(generate_leads(rows)), filename)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'method': method,
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed else 0.0,
+        'peak_rss_mb': peak_rss_mb(),
+        'import_rss_mb': baseline_rss,
+        'file_size_bytes': os.path.getsize(filename)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Excel export")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--methods', nargs='+', default=['streaming', 'dataframe'],
+                        choices=['streaming', 'dataframe'])
+    parser.add_argument('--json', help="Write results as JSON to this file")
+    parser.add_argument('--worker', nargs=3, metavar=('METHOD', 'ROWS', 'FILE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        method, rows, filename = args.worker
+        print(json.dumps(run_worker(method, int(rows), filename)))
+        return
+
+    report = []
+    tmp_dir = tempfile.mkdtemp(prefix='lead_scraper_export_')
+    print(f"{'method':<12}{'rows':>10}{'seconds':>10}{'rows/sec':>12}{'peak RSS':>12}")
+
+    for rows in args.rows:
+        for method in args.methods:
+            filename = os.path.join(tmp_dir, f'{method}_{rows}.xlsx')
+            output = subprocess.run(
+                [sys.executable, __file__, '--worker', method, str(rows), filename],
+                capture_output=True, text=True, check=True
+            )
+            result = json.loads(output.stdout.strip().splitlines()[-1])
+            report.append(result)
+            print(f"{method:<12}{rows:>10}{result['seconds']:>10.2f}"
+                  f"{result['rows_per_sec']:>12.0f}{result['peak_rss_mb']:>10.1f}MB")
+            os.remove(filename)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Startup benchmark for Lead Scraper Bot
+Times cold starts of the GUI and headless entry points, each in a fresh
+interpreter, and lists which heavy third-party modules were imported.
+With --compare-ref the same scenarios run against another git revision
+(checked out into a temporary worktree) to show the difference.
+
+    python benchmarks/bench_startup.py --runs 10
+    python benchmarks/bench_startup.py --compare-ref HEAD~1 --json startup.json
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules that should only load when their feature is used
+HEAVY_MODULES = ['pandas', 'openpyxl', 'pyarrow', 'selenium', 'requests', 'bs4', 'googlemaps', 'pymongo']
+
+SCENARIOS = {
+    'interpreter': "pass",
+    'gui_import': "from src.ui import MainApplication",
+    'gui_window': ("from src.ui import MainApplication\n"
+                   "app = MainApplication()\n"
+                   "app.root.update()"),
+    'headless_export': "import export_results",
+    'headless_tasks': ("from src.database import StorageFactory\n"
+                       "from src.scraper import TaskManager, ScraperFactory"),
+    'yelp_backend': "from src.scraper import YelpScraper",
+}
+
+REPORT = ("\nimport sys, json\n"
+          "print(json.dumps([m for m in {modules!r} if m in sys.modules]))\n"
+          "sys.stdout.flush()\n"
+          "import os; os._exit(0)\n")
+
+def run_scenario(root: str, code: str, runs: int, env: dict) -> dict:
+    """Median/min wall time of `runs` fresh interpreters running `code` in `root`"""
+    script = code + REPORT.format(modules=HEAVY_MODULES)
+    times = []
+    loaded = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-c', script], cwd=root, env=env,
+                                   capture_output=True, text=True)
+        times.append(time.perf_counter() - start)
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr else "failed")
+        loaded = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {
+        'median': statistics.median(times),
+        'min': min(times),
+        'heavy_modules': loaded
+    }
+
+def run_all(root: str, scenarios: list, runs: int) -> dict:
+    env = dict(os.environ, PYTHONPATH=root)
+    # The window scenario must not need a database server
+    data_dir = tempfile.mkdtemp(prefix='lead_scraper_startup_')
+    env.update(STORAGE_BACKEND='sqlite', SQLITE_PATH=os.path.join(data_dir, 'startup.db'),
+               METRICS_ENABLED='false')
+
+    results = {}
+    try:
+        for name in scenarios:
+            if name == 'gui_window' and not os.environ.get('DISPLAY') and sys.platform.startswith('linux'):
+                results[name] = {'skipped': "no display"}
+                continue
+            # One untimed run so .pyc files exist and the OS page cache is warm
+            try:
+                run_scenario(root, SCENARIOS[name], 1, env)
+                results[name] = run_scenario(root, SCENARIOS[name], runs, env)
+            except RuntimeError as e:
+                results[name] = {'skipped': str(e)}
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    return results
+
+def print_results(results: dict, baseline: dict = None):
+    header = f"{'scenario':<18}{'median ms':>11}{'min ms':>9}"
+    if baseline:
+        header += f"{'before ms':>11}{'change':>9}"
+    print(header + "  heavy modules loaded")
+    for name, result in results.items():
+        if 'skipped' in result:
+            print(f"{name:<18}{'skipped: ' + result['skipped']:>20}")
+            continue
+        line = f"{name:<18}{result['median'] * 1000:>11.1f}{result['min'] * 1000:>9.1f}"
+        if baseline:
+            before = baseline.get(name, {})
+            if 'median' in before:
+                change = (result['median'] - before['median']) / before['median']
+                line += f"{before['median'] * 1000:>11.1f}{change:>+9.0%}"
+            else:
+                line += f"{'-':>11}{'':>9}"
+        print(line + "  " + (', '.join(result['heavy_modules']) or '-'))
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start time of the app's entry points")
+    parser.add_argument('--runs', type=int, default=7, help="Fresh interpreters per scenario")
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--compare-ref', help="Also measure this git revision (e.g. HEAD~1)")
+    parser.add_argument('--json', help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    report = {'python': sys.version.split()[0], 'runs': args.runs}
+    baseline = None
+    if args.compare_ref:
+        worktree = tempfile.mkdtemp(prefix='lead_scraper_ref_')
+        subprocess.run(['git', 'worktree', 'add', '--detach', worktree, args.compare_ref],
+                       cwd=ROOT, check=True, capture_output=True)
+        try:
+            print(f"Measuring {args.compare_ref}...")
+            baseline = run_all(worktree, args.scenarios, args.runs)
+        finally:
+            subprocess.run(['git', 'worktree', 'remove', '--force', worktree], cwd=ROOT, capture_output=True)
+        report['baseline'] = {'ref': args.compare_ref, 'results': baseline}
+
+    print("Measuring working tree...")
+    report['results'] = run_all(ROOT, args.scenarios, args.runs)
+    print()
+    print_results(report['results'], baseline)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Storage backend benchmark for Lead Scraper Bot
+Compares MongoDB and SQLite on the workloads the application runs
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import tempfile
+
+# Add project root to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database import DatabaseManager, SQLiteManager
+from benchmarks.datasets import make_leads
+
+def timed(fn):
+    """Run fn and return (seconds, return value)"""
+    start = time.perf_counter()
+    value = fn()
+    return time.perf_counter() - start, value
+
+def run_workloads(factory, tasks: int, leads_per_task: int, status_updates: int) -> dict:
+    """Run every workload against one backend"""
+    timings = {}
+
+    timings['startup'], db = timed(factory)
+
+    elapsed, task_ids = timed(lambda: [db.create_task(f'keyword {i}', 'Austin, TX, USA') for i in range(tasks)])
+    timings['create_task'] = elapsed / tasks
+
+    def update_statuses():
+        for i in range(status_updates):
+            db.update_task_status(task_ids[i % tasks], 'Running')
+    elapsed, _ = timed(update_statuses)
+    timings['update_task_status'] = elapsed / status_updates
+
+    def save_all():
+        for i, task_id in enumerate(task_ids):
+            db.save_results(task_id, make_leads(leads_per_task, i * leads_per_task))
+    timings['save_results_total'], _ = timed(save_all)
+
+    def buffered_writes():
+        writer = db.get_writer()
+        for i, task_id in enumerate(task_ids):
+            writer.insert_results(task_id, make_leads(leads_per_task, i * leads_per_task))
+            writer.update_status(task_id, 'Completed')
+        writer.flush()
+    timings['buffered_writes_total'], _ = timed(buffered_writes)
+
+    timings['task_summaries_page'], _ = timed(lambda: db.get_task_summaries())
+    timings['task_stats'], _ = timed(db.get_task_stats)
+    timings['count_results'], total = timed(db.count_results)
+
+    def page_all():
+        cursor = None
+        while True:
+            _, cursor = db.get_results_page(after=cursor)
+            if not cursor:
+                break
+    timings['page_all_results'], _ = timed(page_all)
+    timings['stream_all_results'], _ = timed(lambda: sum(1 for _ in db.iter_results()))
+    timings['task_results_first_page'], _ = timed(lambda: db.get_results_page(task_ids[0]))
+
+    # Viewer queries: count plus first and deep pages for a filtered, sorted search
+    search = {'text': 'Business', 'has_email': True, 'min_rating': 4}
+    timings['search_count'], _ = timed(lambda: db.count_search_results(search))
+    timings['search_first_page'], (_, cursor) = timed(
+        lambda: db.search_results(search, sort='rating_value'))
+    timings['search_next_page'], _ = timed(
+        lambda: db.search_results(search, sort='rating_value', after=cursor))
+    timings['search_deep_offset'], _ = timed(
+        lambda: db.search_results(search, sort='name', descending=False, offset=total // 4))
+
+    for task_id in task_ids:
+        db.delete_task(task_id)
+    db.disconnect()
+
+    timings['total_results'] = total
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark storage backends")
+    parser.add_argument('--tasks', type=int, default=200)
+    parser.add_argument('--leads-per-task', type=int, default=50)
+    parser.add_argument('--status-updates', type=int, default=2000)
+    parser.add_argument('--mongodb-uri', default='mongodb://localhost:27017/?serverSelectionTimeoutMS=2000')
+    parser.add_argument('--json', help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    backends = {}
+
+    tmp_dir = tempfile.mkdtemp(prefix='lead_scraper_bench_')
+    backends['sqlite'] = lambda: SQLiteManager(os.path.join(tmp_dir, 'bench.db'))
+    backends['mongodb'] = lambda: DatabaseManager(args.mongodb_uri, 'lead_scraper_bench')
+
+    report = {}
+    for name, factory in backends.items():
+        print(f"Running {name} workloads...")
+        try:
+            report[name] = run_workloads(factory, args.tasks, args.leads_per_task, args.status_updates)
+        except Exception as e:
+            print(f"   Skipped {name}: {str(e)[:100]}")
+
+    metrics = sorted({key for timings in report.values() for key in timings})
+    print()
+    print(f"{'workload':<28}" + ''.join(f"{name:>14}" for name in report))
+    for metric in metrics:
+        row = f"{metric:<28}"
+        for timings in report.values():
+            value = timings.get(metric)
+            if metric == 'total_results':
+                row += f"{value:>14}"
+            else:
+                row += f"{value * 1000:>12.3f}ms"
+        print(row)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,498 @@
+"""
+Offline benchmark suite for Lead Scraper Bot
+Times the parsing, data cleaning, storage and export hot paths against
+recorded HTML fixtures and synthetic datasets, and writes the results as
+JSON so runs from different releases can be compared.
+
+    python benchmarks/bench_suite.py --sizes 1k 100k --json bench.json
+    python benchmarks/bench_suite.py --baseline bench.json --tolerance 0.2
+"""
+
+import sys
+import os
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import queue
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from logging.handlers import QueueListener
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add project root to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bs4 import BeautifulSoup
+from src.scraper import YelpScraper
+from src.scraper.parsing import ParserFactory
+from src.scraper.domain_cache import DomainCache
+from src.scraper.yelp import SERP_CARD, NEXT_LINK
+from src.utils import (clean_phone_number, remove_duplicates, merge_business_data,
+                       export_to_excel, export_rows_to_excel)
+from src.database import SQLiteManager, DatabaseManager
+from src.logs import FastQueueHandler, JsonFormatter, TextFormatter, RateLimitFilter, TaskContextFilter
+from benchmarks.datasets import (DATASET_SIZES, make_leads, make_leads_with_duplicates,
+                                 load_fixture)
+
+COLUMNS = ['name', 'address', 'phone', 'email', 'website', 'rating', 'category']
+
+# name -> (run, prepare, sized, max_rows); registered with @benchmark
+BENCHMARKS = {}
+
+class SkipBenchmark(Exception):
+    """Raised by a prepare function when a benchmark cannot run here"""
+
+def benchmark(name: str, sized: bool = False, max_rows: int = None):
+    """Register a benchmark
+
+    `run(ctx, *args)` is the timed call and returns the number of items it
+    processed. An optional `prepare(ctx, rows)` function registered with
+    `.prepare` builds the extra arguments outside the timing for every
+    repeat. Sized benchmarks run once per dataset size; `max_rows` skips
+    sizes that would take minutes unless --no-limits is given.
+    """
+    def register(run):
+        BENCHMARKS[name] = {'run': run, 'prepare': None, 'sized': sized, 'max_rows': max_rows}
+
+        def prepare(fn):
+            BENCHMARKS[name]['prepare'] = fn
+            return fn
+        run.prepare = prepare
+        return run
+    return register
+
+class Context:
+    """Fixtures, scrapers and scratch space shared by the benchmarks"""
+
+    def __init__(self, mongodb_uri: str = None):
+        self.tmp_dir = tempfile.mkdtemp(prefix='lead_scraper_suite_')
+        self.mongodb_uri = mongodb_uri
+        self.yelp = YelpScraper()
+        self.yelp.domain_cache = None  # time the network path; see scrape_email_cached
+        self.serp_html = load_fixture('yelp_search.html')
+        self.serp_state_html = load_fixture('yelp_search_state.html')
+        self.serp_cards = self.yelp.parser.select(self.yelp.parser.parse(self.serp_html), SERP_CARD)
+        self.detail_html = load_fixture('yelp_business.html')
+        self.home_html = load_fixture('business_home.html')
+        self.contact_html = load_fixture('business_contact.html')
+        self.server = FixtureServer(self)
+        self.log_listener = None
+        self._datasets = {}
+
+    def leads(self, rows: int):
+        if rows not in self._datasets:
+            self._datasets = {rows: make_leads(rows)}  # keep only one size in memory
+        return self._datasets[rows]
+
+    def scratch_path(self, name: str) -> str:
+        return os.path.join(self.tmp_dir, name)
+
+    def stop_log_listener(self):
+        if self.log_listener:
+            self.log_listener.stop()
+            for handler in self.log_listener.handlers:
+                handler.close()
+            self.log_listener = None
+
+    def close(self):
+        self.stop_log_listener()
+        self.server.stop()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+class FixtureServer:
+    """Serves the business website fixtures on localhost for the email lookup"""
+
+    def __init__(self, context: Context):
+        pages = {
+            '/': context.home_html,
+            '/about-us': context.home_html,
+            '/contact': context.contact_html
+        }
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out as separate writes; without this, keep-alive
+            # clients wait on Nagle + delayed ACK (~40ms) for every response
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                body = pages.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                body = body.encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+# --- Parsing ---------------------------------------------------------------
+
+@benchmark('yelp_parse_serp')
+def bench_parse_serp(ctx):
+    soup = BeautifulSoup(ctx.serp_html, 'html.parser')
+    return len(soup.find_all('div', {'data-testid': 'serp-ia-card'}))
+
+@benchmark('extract_yelp_business_info')
+def bench_extract_yelp(ctx):
+    for card in ctx.serp_cards:
+        ctx.yelp.extract_yelp_business_info(card)
+    return len(ctx.serp_cards)
+
+@benchmark('extract_yelp_detail_info')
+def bench_extract_yelp_detail(ctx):
+    details = ctx.yelp.extract_yelp_detail_info(ctx.yelp.parser.parse(ctx.detail_html))
+    assert details['website'] and details['phone'], "fixture should yield phone and website"
+    return 1
+
+def register_parser_benchmarks(parser_type: str):
+    """Full parse + extract of one search page and one detail page with a parser backend"""
+
+    @benchmark(f'yelp_serp_page_{parser_type}')
+    def bench_serp_page(ctx, scraper):
+        document = scraper.parser.parse(ctx.serp_html)
+        cards = scraper.parser.select(document, SERP_CARD)
+        for card in cards:
+            scraper.extract_yelp_business_info(card)
+            scraper.extract_detail_url(card, ctx.server.url)
+        scraper.parser.select_one(document, NEXT_LINK)
+        return len(cards)
+
+    @benchmark(f'yelp_detail_page_{parser_type}')
+    def bench_detail_page(ctx, scraper):
+        scraper.extract_yelp_detail_info(scraper.parser.parse(ctx.detail_html))
+        return 1
+
+    @bench_serp_page.prepare
+    def prepare(ctx, rows):
+        scraper = YelpScraper()
+        try:
+            scraper.parser = ParserFactory.create_parser(parser_type)
+        except ImportError:
+            raise SkipBenchmark(f"{parser_type} is not installed")
+        return (scraper,)
+
+    bench_detail_page.prepare(prepare)
+
+for parser_type in ('bs4', 'lxml', 'selectolax'):
+    register_parser_benchmarks(parser_type)
+
+@benchmark('yelp_serp_page_json')
+def bench_serp_page_json(ctx):
+    # Same page with its embedded JSON state; no DOM parse at all
+    businesses, _ = ctx.yelp.parse_search_page(ctx.serp_state_html, ctx.server.url)
+    return len(businesses)
+
+@benchmark('extract_email_no_match')
+def bench_extract_email_home(ctx):
+    # The home page has no email address, so the whole text is scanned
+    ctx.yelp.extract_email(ctx.home_html)
+    return 1
+
+@benchmark('extract_email_contact_page')
+def bench_extract_email_contact(ctx):
+    ctx.yelp.extract_email(ctx.contact_html)
+    return 1
+
+@benchmark('scrape_email_from_website')
+def bench_scrape_email(ctx):
+    # Home page, then /about-us and /contact, served locally
+    email = ctx.yelp.scrape_email_from_website(ctx.server.url)
+    assert email, "fixture site should yield an email"
+    return 1
+
+@benchmark('scrape_email_cached')
+def bench_scrape_email_cached(ctx, scraper):
+    # Domain seen before: answered from the domain cache without network I/O
+    email = scraper.scrape_email_from_website(ctx.server.url)
+    assert email, "cached lookup should yield the email"
+    return 1
+
+@bench_scrape_email_cached.prepare
+def prepare_scrape_email_cached(ctx, rows):
+    scraper = YelpScraper()
+    scraper.domain_cache = DomainCache(ctx.scratch_path('domain_cache.db'))
+    scraper.scrape_email_from_website(ctx.server.url)
+    return (scraper,)
+
+# --- Data cleaning ---------------------------------------------------------
+
+@benchmark('clean_phone_number', sized=True)
+def bench_clean_phone(ctx, leads):
+    for lead in leads:
+        clean_phone_number(lead['phone'])
+    return len(leads)
+
+@bench_clean_phone.prepare
+def prepare_clean_phone(ctx, rows):
+    return (ctx.leads(rows),)
+
+@benchmark('remove_duplicates', sized=True)
+def bench_remove_duplicates(ctx, leads):
+    remove_duplicates(leads)
+    return len(leads)
+
+@bench_remove_duplicates.prepare
+def prepare_remove_duplicates(ctx, rows):
+    return (make_leads_with_duplicates(rows),)
+
+@benchmark('merge_business_data', sized=True)
+def bench_merge(ctx, pairs):
+    for existing, new in pairs:
+        merge_business_data(existing, new)
+    return len(pairs)
+
+@bench_merge.prepare
+def prepare_merge(ctx, rows):
+    leads = ctx.leads(rows)
+    # Half-filled records merged with full ones, as when two sources overlap
+    return ([(dict(lead, email='', website=''), lead) for lead in leads],)
+
+# --- Storage ---------------------------------------------------------------
+
+@benchmark('save_results_sqlite', sized=True)
+def bench_save_sqlite(ctx, db, leads):
+    db.save_results(db.create_task('bench', 'Austin, TX, USA'), leads)
+    db.close()
+    return len(leads)
+
+@bench_save_sqlite.prepare
+def prepare_save_sqlite(ctx, rows):
+    path = ctx.scratch_path('save.db')
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    # save_results stamps every dict, so give each repeat its own copies
+    return SQLiteManager(path), [dict(lead) for lead in ctx.leads(rows)]
+
+@benchmark('save_results_mongodb', sized=True)
+def bench_save_mongodb(ctx, db, leads):
+    db.save_results(db.create_task('bench', 'Austin, TX, USA'), leads)
+    db.db.results.drop()
+    db.close()
+    return len(leads)
+
+@bench_save_mongodb.prepare
+def prepare_save_mongodb(ctx, rows):
+    if not ctx.mongodb_uri:
+        raise SkipBenchmark("pass --mongodb-uri to include MongoDB")
+    return DatabaseManager(ctx.mongodb_uri, 'lead_scraper_suite'), [dict(lead) for lead in ctx.leads(rows)]
+
+# --- Export ----------------------------------------------------------------
+
+@benchmark('export_to_excel', sized=True, max_rows=100000)
+def bench_export_dataframe(ctx, leads):
+    export_to_excel(leads, ctx.scratch_path('dataframe.xlsx'))
+    return len(leads)
+
+@bench_export_dataframe.prepare
+def prepare_export(ctx, rows):
+    return (ctx.leads(rows),)
+
+@benchmark('export_rows_to_excel', sized=True, max_rows=100000)
+def bench_export_streaming(ctx, leads):
+    export_rows_to_excel(leads, ctx.scratch_path('streaming.xlsx'), COLUMNS)
+    return len(leads)
+
+bench_export_streaming.prepare(prepare_export)
+
+# --- Logging ---------------------------------------------------------------
+
+def log_per_lead(logger: logging.Logger, leads: list, threads: int = 4) -> int:
+    """Log one line per lead from several worker threads, as scrapers do"""
+    def work(chunk):
+        for lead in chunk:
+            logger.info(f"Scraped business: {lead['name']}")
+
+    workers = [threading.Thread(target=work, args=(leads[i::threads],)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return len(leads)
+
+def bench_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.Logger(name, logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+@benchmark('log_per_lead_sync', sized=True, max_rows=100000)
+def bench_log_sync(ctx, logger, leads):
+    # FileHandler formats and writes under its lock in every worker thread
+    log_per_lead(logger, leads)
+    logger.handlers[0].close()
+    return len(leads)
+
+@bench_log_sync.prepare
+def prepare_log_sync(ctx, rows):
+    handler = logging.FileHandler(ctx.scratch_path('sync.log'), mode='w')
+    handler.setFormatter(TextFormatter())
+    return bench_logger('bench_sync', handler), ctx.leads(rows)
+
+@benchmark('log_per_lead_queued', sized=True, max_rows=100000)
+def bench_log_queued(ctx, logger, leads):
+    # Time spent in the workers only; the listener drains in the background
+    return log_per_lead(logger, leads)
+
+def queued_logger(ctx, name: str, rate: float) -> logging.Logger:
+    ctx.stop_log_listener()
+    file_handler = logging.FileHandler(ctx.scratch_path(f'{name}.log'), mode='w')
+    file_handler.setFormatter(JsonFormatter())
+    log_queue = queue.SimpleQueue()
+    handler = FastQueueHandler(log_queue)
+    handler.addFilter(RateLimitFilter(rate=rate))
+    handler.addFilter(TaskContextFilter())
+    ctx.log_listener = QueueListener(log_queue, file_handler)
+    ctx.log_listener.start()
+    return bench_logger(name, handler)
+
+@bench_log_queued.prepare
+def prepare_log_queued(ctx, rows):
+    return queued_logger(ctx, 'bench_queued', rate=0), ctx.leads(rows)
+
+@benchmark('log_per_lead_rate_limited', sized=True, max_rows=100000)
+def bench_log_rate_limited(ctx, logger, leads):
+    return log_per_lead(logger, leads)
+
+@bench_log_rate_limited.prepare
+def prepare_log_rate_limited(ctx, rows):
+    return queued_logger(ctx, 'bench_rate_limited', rate=5), ctx.leads(rows)
+
+# --- Runner ----------------------------------------------------------------
+
+def run_benchmark(ctx, name: str, spec: dict, rows: int, repeat: int) -> dict:
+    """Time one benchmark at one size: one warm-up call, then `repeat` timed calls"""
+    timings = []
+    items = 0
+    for i in range(repeat + 1):
+        args = spec['prepare'](ctx, rows) if spec['prepare'] else ()
+        start = time.perf_counter()
+        items = spec['run'](ctx, *args)
+        elapsed = time.perf_counter() - start
+        if i:
+            timings.append(elapsed)
+
+    best = min(timings)
+    return {
+        'name': name,
+        'rows': rows,
+        'items': items,
+        'repeat': repeat,
+        'best_seconds': best,
+        'median_seconds': statistics.median(timings),
+        'per_item_us': best / items * 1e6 if items else None,
+        'items_per_sec': items / best if best else None
+    }
+
+def result_key(result: dict) -> str:
+    return f"{result['name']}@{result['rows']}" if result['rows'] else result['name']
+
+def environment() -> dict:
+    """Where the numbers came from"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'commit': commit
+    }
+
+def compare(results: list, baseline_path: str, tolerance: float) -> list:
+    """Benchmarks whose median got slower than the baseline by more than `tolerance`"""
+    with open(baseline_path) as f:
+        baseline = {result_key(result): result for result in json.load(f)['results']}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result_key(result))
+        if not previous:
+            continue
+        ratio = result['median_seconds'] / previous['median_seconds']
+        if ratio > 1 + tolerance:
+            regressions.append((result_key(result), ratio))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite")
+    parser.add_argument('--sizes', nargs='+', default=['1k', '100k'], choices=list(DATASET_SIZES),
+                        help="Dataset sizes for the sized benchmarks")
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="Run only these benchmarks")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per benchmark (after one warm-up)")
+    parser.add_argument('--no-limits', action='store_true', help="Also run slow benchmarks at every size")
+    parser.add_argument('--mongodb-uri', help="Include MongoDB storage benchmarks")
+    parser.add_argument('--json', help="Write results as JSON to this file")
+    parser.add_argument('--baseline', help="Compare medians against an earlier JSON report")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed slowdown against the baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    ctx = Context(args.mongodb_uri)
+    results = []
+    print(f"{'benchmark':<30}{'rows':>10}{'best':>12}{'median':>12}{'per item':>14}")
+
+    try:
+        for name, spec in BENCHMARKS.items():
+            if args.only and name not in args.only:
+                continue
+
+            sizes = [DATASET_SIZES[size] for size in args.sizes] if spec['sized'] else [0]
+            for rows in sizes:
+                if spec['max_rows'] and rows > spec['max_rows'] and not args.no_limits:
+                    print(f"{name:<30}{rows or '-':>10}   skipped (over {spec['max_rows']} rows, use --no-limits)")
+                    continue
+
+                # Large datasets take long enough that fewer repeats suffice
+                repeat = args.repeat if rows < 100000 else max(1, args.repeat // 3)
+                try:
+                    result = run_benchmark(ctx, name, spec, rows, repeat)
+                except SkipBenchmark as e:
+                    print(f"{name:<30}{rows or '-':>10}   skipped ({e})")
+                    continue
+
+                results.append(result)
+                per_item = f"{result['per_item_us']:.2f}us" if result['per_item_us'] else ''
+                print(f"{name:<30}{rows or '-':>10}{result['best_seconds'] * 1000:>10.2f}ms"
+                      f"{result['median_seconds'] * 1000:>10.2f}ms{per_item:>14}")
+    finally:
+        ctx.close()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions over {args.tolerance:.0%}:")
+            for key, ratio in regressions:
+                print(f"   {key}: {ratio:.2f}x slower")
+            sys.exit(1)
+        print(f"\nNo regressions over {args.tolerance:.0%} against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Synthetic lead datasets and recorded HTML fixtures for benchmarks
+"""
+
+import os
+from typing import Dict, Iterator, List
+
+CATEGORIES = ['Italian', 'Mexican', 'Coffee', 'Bakery', 'Toy Store', 'Hardware']
+
+# Named dataset sizes accepted by the benchmark scripts
+DATASET_SIZES = {'1k': 1000, '100k': 100000, '1m': 1000000}
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+def generate_leads(count: int, offset: int = 0) -> Iterator[Dict]:
+    """Yield synthetic lead records shaped like scraper output"""
+    for i in range(offset, offset + count):
+        yield {
+            'name': f'Business {i}',
+            'address': f'{i} Main St, Springfield',
+            'phone': f'(555) {i % 1000:03d}-{i % 10000:04d}',
+            'email': f'info{i}@example.com' if i % 3 else '',
+            'website': f'https://business{i}.example.com',
+            'rating': f'{3 + (i % 20) / 10:.1f}',
+            'category': CATEGORIES[i % len(CATEGORIES)]
+        }
+
+def make_leads(count: int, offset: int = 0) -> List[Dict]:
+    """Build a list of synthetic lead records"""
+    return list(generate_leads(count, offset))
+
+def make_leads_with_duplicates(count: int, duplicate_every: int = 5) -> List[Dict]:
+    """Build `count` leads where every `duplicate_every`-th one repeats an earlier name"""
+    leads = make_leads(count)
+    for i in range(duplicate_every, count, duplicate_every):
+        leads[i]['name'] = leads[i - duplicate_every]['name'].upper() + ' '
+    return leads
+
+def load_fixture(name: str) -> str:
+    """Read a recorded HTML page from benchmarks/fixtures"""
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
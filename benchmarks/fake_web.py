@@ -0,0 +1,316 @@
+"""
+Local stand-in for the sites the scrapers visit
+Serves Yelp-like search pages with pagination, business detail pages and
+generated business websites with contact pages and emails, with
+configurable latency, error rate and slow (trickled) response bodies.
+
+    python benchmarks/fake_web.py --port 8800 --latency-ms 50 --error-rate 0.02
+    YELP_BASE_URL=http://127.0.0.1:8800 python main.py
+"""
+
+import sys
+import json
+import time
+import zlib
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, quote
+
+CATEGORIES = ['Pizza', 'Italian', 'Coffee & Tea', 'Bakeries', 'Toy Stores', 'Hardware Stores',
+              'Mexican', 'Bars', 'Sandwiches', 'Florists']
+STREETS = ['Main St', 'Oak Ave', 'Market St', 'Broadway', '2nd Ave', 'Elm St', 'Park Pl']
+
+# Business website layouts: contact page linked from the nav, email only in a
+# footer mailto: link, contact page listed only in the sitemap, email on the about page
+SITE_LAYOUTS = ('nav', 'mailto', 'sitemap', 'about')
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+class FakeWebServer:
+    """Threaded HTTP server generating deterministic pages per query
+
+    Every search has `results_per_query` businesses split into pages of
+    `page_size`. A business's detail page links to its website under
+    /site/<id>/, which carries an email for all but every
+    `no_email_every`-th business, placed according to its SITE_LAYOUTS entry. Search pages embed the results as
+    JSON state the way Yelp does, unless `json_state` is False.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, results_per_query: int = 50,
+                 page_size: int = 10, latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0, slow_rate: float = 0, slow_body_ms: float = 500,
+                 no_email_every: int = 4, seed: int = 0, json_state: bool = True):
+        self.results_per_query = results_per_query
+        self.page_size = page_size
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_body_ms = slow_body_ms
+        self.no_email_every = no_email_every
+        self.json_state = json_state
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'slow': 0}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out as separate writes; without this, keep-alive
+            # clients wait on Nagle + delayed ACK (~40ms) for every response
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+        self._thread = None
+
+    def start(self):
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="FakeWeb", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self.random.random()
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        self._count('requests')
+        delay = self.latency_ms + (self._roll() * 2 - 1) * self.jitter_ms
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if self.error_rate and self._roll() < self.error_rate:
+            self._count('errors')
+            self._send(request, 503, "<h1>Service Unavailable</h1>")
+            return
+
+        parsed = urlparse(request.path)
+        parts = [part for part in parsed.path.split('/') if part]
+        try:
+            if parts == ['search']:
+                status, body = 200, self.search_page(parse_qs(parsed.query))
+            elif len(parts) == 2 and parts[0] == 'biz':
+                status, body = 200, self.detail_page(parts[1])
+            elif len(parts) in (2, 3) and parts[0] == 'site':
+                status, body = 200, self.site_page(int(parts[1]), parts[2] if len(parts) == 3 else '')
+            else:
+                status, body = 404, "<h1>Not Found</h1>"
+        except (KeyError, ValueError):
+            status, body = 404, "<h1>Not Found</h1>"
+
+        slow = self.slow_rate and self._roll() < self.slow_rate
+        if slow:
+            self._count('slow')
+        self._send(request, status, body, slow)
+
+    def _send(self, request: BaseHTTPRequestHandler, status: int, body: str, slow: bool = False):
+        data = body.encode()
+        request.send_response(status)
+        request.send_header('Content-Type', 'text/html; charset=utf-8')
+        request.send_header('Content-Length', str(len(data)))
+        request.end_headers()
+
+        if not slow:
+            request.wfile.write(data)
+            return
+
+        # Trickle the body in chunks spread over slow_body_ms
+        chunks = 10
+        size = len(data) // chunks + 1
+        for i in range(chunks):
+            request.wfile.write(data[i * size:(i + 1) * size])
+            request.wfile.flush()
+            time.sleep(self.slow_body_ms / 1000 / chunks)
+
+    def business_id(self, query: str, index: int) -> int:
+        """Stable id for the index-th result of a query"""
+        return zlib.crc32(f"{query}:{index}".encode()) % 10_000_000
+
+    def business(self, business_id: int) -> dict:
+        rng = random.Random(business_id)
+        categories = rng.sample(CATEGORIES, rng.randint(1, 2))
+        return {
+            'id': business_id,
+            'name': f"{categories[0].split(' ')[0]} Place {business_id}",
+            'address': f"{rng.randint(1, 9999)} {rng.choice(STREETS)}",
+            'phone': f"({rng.randint(200, 989)}) {rng.randint(200, 999)}-{rng.randint(0, 9999):04d}",
+            'rating': f"{rng.randint(20, 50) / 10:.1f}",
+            'reviews': rng.randint(1, 3000),
+            'categories': categories,
+            'email': '' if business_id % self.no_email_every == 0 else f"hello@place{business_id}.example"
+        }
+
+    def search_page(self, params: dict) -> str:
+        query = f"{params['find_desc'][0]}|{params.get('find_loc', [''])[0]}"
+        start = int(params.get('start', ['0'])[0])
+        end = min(start + self.page_size, self.results_per_query)
+
+        cards = []
+        for index in range(start, end):
+            business = self.business(self.business_id(query, index))
+            categories = ''.join(
+                f'<span class="css-11bijt4 category-str"><a href="/search?cflt={category}">{category}</a></span>'
+                for category in business['categories'])
+            cards.append(f"""<li><div class="container__09f24" data-testid="serp-ia-card">
+  <h3><span>{index + 1}.&nbsp;</span><a href="/biz/{business['id']}" data-analytics-label="biz-name" name="{business['name']}">{business['name']}</a></h3>
+  <div><div class="five-stars" aria-label="{business['rating']} star rating" role="img"></div><span>{business['rating']}</span><span>({business['reviews']} reviews)</span></div>
+  <div class="css-1o9i2f8">{categories}</div>
+  <p class="css-dzq7l1"><span>{business['address']}</span></p>
+</div></li>""")
+
+        pagination = f'<span>{start // self.page_size + 1} of {-(-self.results_per_query // self.page_size)}</span>'
+        if end < self.results_per_query:
+            pagination += f'<a class="next-link" href="/search?start={end}">Next</a>'
+
+        body = f'<main><ul>\n{chr(10).join(cards)}\n</ul><div class="pagination">{pagination}</div></main>'
+        if self.json_state:
+            body += self.search_state(query, start, end)
+        return PAGE.format(title=f"Search results for {params['find_desc'][0]}", body=body)
+
+    def search_state(self, query: str, start: int, end: int) -> str:
+        """Hypernova script with the page's results, as embedded by Yelp"""
+        items, markers = [], []
+        for index in range(start, end):
+            business = self.business(self.business_id(query, index))
+            biz_id = f"biz{business['id']}"
+            items.append({
+                'bizId': biz_id,
+                'searchResultLayoutType': 'iaResult',
+                'searchResultBusiness': {
+                    'name': business['name'],
+                    'alias': f"place-{business['id']}",
+                    'businessUrl': f"/biz/{business['id']}",
+                    'rating': float(business['rating']),
+                    'reviewCount': business['reviews'],
+                    'categories': [{'title': category, 'url': f"/search?cflt={category}"}
+                                   for category in business['categories']],
+                    'phone': business['phone'],
+                    'formattedAddress': business['address'],
+                    'isAd': False
+                }
+            })
+            if business['id'] % 2:
+                # Some listings carry the website, so only the email lookup is left to do
+                site = f"{self.url}/site/{business['id']}/"
+                items[-1]['searchResultBusiness']['website'] = {
+                    'href': f"/biz_redir?url={quote(site, safe='')}&website_link_type=website",
+                    'linkText': f"place{business['id']}.example"
+                }
+            rng = random.Random(business['id'])
+            markers.append({'resourceId': biz_id, 'location': {
+                'latitude': round(40.6 + rng.random() * 0.2, 6),
+                'longitude': round(-74.1 + rng.random() * 0.2, 6)}})
+        items.append({'type': 'pagination', 'props': {
+            'startResult': start + 1, 'resultsPerPage': self.page_size,
+            'totalResults': self.results_per_query}})
+
+        state = {'legacyProps': {'searchAppProps': {'searchPageProps': {
+            'mainContentComponentsListProps': items,
+            'rightRailProps': {'searchMapProps': {'mapState': {'markers': markers}}}}}}}
+        return ('<script type="application/json" data-hypernova-key="yelpfrontend__search">'
+                f'<!--{json.dumps(state)}--></script>')
+
+    def detail_page(self, business_id: str) -> str:
+        business = self.business(int(business_id))
+        body = f"""<main>
+<h1>{business['name']}</h1>
+<section aria-label="Business details">
+  <p>Business website</p><p><a href="{self.url}/site/{business['id']}/" rel="noopener">place{business['id']}.example</a></p>
+  <p>Phone number</p><p>{business['phone']}</p>
+  <p>Get Directions</p><p>{business['address']}</p>
+</section>
+</main>"""
+        return PAGE.format(title=business['name'], body=body)
+
+    def site_page(self, business_id: int, page: str) -> str:
+        """Business website in one of four layouts (see SITE_LAYOUTS)"""
+        business = self.business(business_id)
+        layout = SITE_LAYOUTS[business_id // 7 % len(SITE_LAYOUTS)]
+        root = f"/site/{business_id}"
+        email = business['email']
+        paragraphs = ''.join(f"<p>We have served the neighborhood for {i + 3} years. "
+                             "Stop by for seasonal specials and friendly service.</p>" for i in range(20))
+
+        if page == 'sitemap.xml' and layout == 'sitemap':
+            urls = ''.join(f"<url><loc>{self.url}{root}/{path}</loc></url>"
+                           for path in ('', 'menu', 'about', 'contact-us'))
+            return f'<?xml version="1.0" encoding="UTF-8"?><urlset>{urls}</urlset>'
+        if page in ('contact', 'contact-us'):
+            if (page == 'contact') != (layout == 'nav'):
+                raise KeyError(page)
+            contact = f"<p>Email us: {email}</p>" if email else "<p>Use the form below.</p>"
+            body = f"<main><h1>Contact</h1>{contact}<p>{business['phone']}</p><form><input name='email'></form></main>"
+            return PAGE.format(title=business['name'], body=body)
+        if page in ('about', 'about-our-bread', 'menu'):
+            text = f"<p>Write to the owners at {email}.</p>" if layout == 'about' and page == 'about' and email else ""
+            return PAGE.format(title=business['name'], body=f"<main><h1>{page.title()}</h1>{paragraphs}{text}</main>")
+        if page:
+            raise KeyError(page)
+
+        links = [('', 'Home'), ('about', 'About us'), ('about-our-bread', 'About our bread'), ('menu', 'Menu')]
+        if layout == 'nav':
+            links.append(('contact', 'Contact'))
+        nav = ' '.join(f"<a href='{root}/{path}'>{text}</a>" for path, text in links)
+        footer = f"<footer><a href='mailto:{email}'>{email}</a></footer>" if layout == 'mailto' and email else ""
+        head = f"<link rel='sitemap' href='{root}/sitemap.xml'>" if layout == 'sitemap' else ""
+        body = f"{head}<nav>{nav}</nav><main><h1>{business['name']}</h1>{paragraphs}</main>{footer}"
+        return PAGE.format(title=business['name'], body=body)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fake Yelp and business sites locally")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--results-per-query', type=int, default=50)
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--latency-ms', type=float, default=0, help="Added to every response")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="Uniform +/- jitter on the latency")
+    parser.add_argument('--error-rate', type=float, default=0, help="Fraction of 503 responses")
+    parser.add_argument('--slow-rate', type=float, default=0, help="Fraction of bodies sent slowly")
+    parser.add_argument('--slow-body-ms', type=float, default=500, help="Time to trickle a slow body")
+    parser.add_argument('--no-email-every', type=int, default=4, help="Every n-th business has no email")
+    parser.add_argument('--no-json-state', action='store_true',
+                        help="Leave the JSON state out of search pages (DOM-only parsing)")
+    args = parser.parse_args()
+
+    server = FakeWebServer(args.host, args.port, args.results_per_query, args.page_size,
+                           args.latency_ms, args.jitter_ms, args.error_rate, args.slow_rate,
+                           args.slow_body_ms, args.no_email_every, json_state=not args.no_json_state)
+    # The load test reads the URL from the first line when the port is 0
+    print(server.url, flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"Served {server.stats['requests']} requests ({server.stats['errors']} errors, "
+              f"{server.stats['slow']} slow)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
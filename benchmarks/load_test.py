@@ -0,0 +1,236 @@
+"""
+End-to-end load test for Lead Scraper Bot
+Runs N Yelp tasks through TaskManager, at most C at a time, against the
+local fake-web server (benchmarks/fake_web.py, started in a subprocess so
+its CPU is not counted) and reports leads/sec, task latency percentiles,
+CPU and RSS of the scraping process.
+
+    python benchmarks/load_test.py --tasks 50 --concurrency 10 --latency-ms 40
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+import threading
+import urllib.request
+
+# Add project root to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from config.config import Config
+from src.database import SQLiteManager, DatabaseManager
+from src.scraper import TaskManager
+from src.metrics import metrics
+
+def percentile(values: list, q: float) -> float:
+    """Nearest-rank percentile (q in 0-100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(q / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+def current_rss_mb() -> float:
+    """Resident set size right now (Linux), falling back to the peak"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except OSError:
+        return peak_rss_mb()
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def counter_total(counters: dict, name: str) -> int:
+    """Sum of a counter over all its label sets"""
+    return int(sum(series['value'] for series in counters.get(name, [])))
+
+def start_fake_web(args) -> tuple:
+    """Start benchmarks/fake_web.py on a free port; returns (process, base url)"""
+    command = [
+        sys.executable, os.path.join(os.path.dirname(__file__), 'fake_web.py'),
+        '--port', '0',
+        '--results-per-query', str(args.results_per_task),
+        '--latency-ms', str(args.latency_ms),
+        '--jitter-ms', str(args.jitter_ms),
+        '--error-rate', str(args.error_rate),
+        '--slow-rate', str(args.slow_rate),
+        '--slow-body-ms', str(args.slow_body_ms)
+    ]
+    if args.no_json_state:
+        command.append('--no-json-state')
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    url = process.stdout.readline().strip()
+
+    # Wait until it answers
+    for _ in range(50):
+        try:
+            urllib.request.urlopen(f"{url}/search?find_desc=ping", timeout=1)
+            break
+        except Exception:
+            time.sleep(0.1)
+    return process, url
+
+class LoadRunner:
+    """Feeds tasks to TaskManager keeping `concurrency` of them running"""
+
+    def __init__(self, db_manager, tasks: int, concurrency: int):
+        self.db_manager = db_manager
+        self.task_manager = TaskManager(db_manager)
+        self.concurrency = concurrency
+        self.pending = [(f"load keyword {i}", Config.LOCATIONS[i % len(Config.LOCATIONS)])
+                        for i in range(tasks)]
+        self.started = {}  # task_id -> start time
+        self.latencies = []
+        self.leads = 0
+        self.emails = 0
+        self.failed = 0
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        self.total = tasks
+
+    def run(self, timeout: float) -> float:
+        start = time.perf_counter()
+        for _ in range(min(self.concurrency, len(self.pending))):
+            self._start_next()
+        if not self.done.wait(timeout):
+            print("   Timed out waiting for tasks to finish")
+        return time.perf_counter() - start
+
+    def _start_next(self):
+        with self.lock:
+            if not self.pending:
+                return
+            keyword, location = self.pending.pop()
+        task_id = self.db_manager.create_task(keyword, location)
+        with self.lock:
+            self.started[task_id] = time.perf_counter()
+        self.task_manager.start_task(task_id, keyword, location, "yelp",
+                                     lambda event, data: self._on_event(event, data))
+
+    def _on_event(self, event: str, data: dict):
+        if event not in ("completed", "failed"):
+            return
+
+        with self.lock:
+            self.latencies.append(time.perf_counter() - self.started.pop(data['task_id']))
+            if event == "failed":
+                self.failed += 1
+            results = data.get('results', [])
+            self.leads += len(results)
+            self.emails += sum(1 for result in results if result.get('email'))
+            finished = len(self.latencies) == self.total
+
+        if finished:
+            self.done.set()
+        else:
+            self._start_next()
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the scraping pipeline against a local fake web")
+    parser.add_argument('--tasks', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=5)
+    parser.add_argument('--results-per-task', type=int, default=50)
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--jitter-ms', type=float, default=10)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--slow-rate', type=float, default=0)
+    parser.add_argument('--slow-body-ms', type=float, default=500)
+    parser.add_argument('--delay', type=float, default=0, help="SCRAPING_DELAY between pages, in seconds")
+    parser.add_argument('--detail-workers', type=int, default=Config.YELP_DETAIL_WORKERS)
+    parser.add_argument('--detail-rate', type=float, default=0,
+                        help="YELP_DETAIL_RATE, detail pages per second across all tasks (0 = unlimited)")
+    parser.add_argument('--no-details', action='store_true', help="Skip detail-page enrichment")
+    parser.add_argument('--no-json-state', action='store_true',
+                        help="Serve search pages without embedded JSON, forcing DOM parsing")
+    parser.add_argument('--url', help="Use an already running fake-web server instead of starting one")
+    parser.add_argument('--backend', choices=['sqlite', 'mongodb'], default='sqlite')
+    parser.add_argument('--mongodb-uri', default='mongodb://localhost:27017/')
+    parser.add_argument('--timeout', type=float, default=600)
+    parser.add_argument('--json', help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if not url:
+        server, url = start_fake_web(args)
+
+    # Point the scrapers at the fake web before any task starts
+    Config.YELP_BASE_URL = url.rstrip('/')
+    Config.SCRAPING_DELAY = args.delay
+    Config.MAX_RESULTS_PER_TASK = args.results_per_task
+    Config.YELP_DETAIL_PAGES = not args.no_details
+    Config.YELP_DETAIL_WORKERS = args.detail_workers
+    Config.YELP_DETAIL_RATE = args.detail_rate
+    # The fake business sites all live under /site/ on the server's host, so
+    # the cache would file them as one site and hand out the first one's email
+    Config.DOMAIN_CACHE_ENABLED = False
+
+    if args.backend == 'sqlite':
+        db_manager = SQLiteManager(os.path.join(tempfile.mkdtemp(prefix='lead_scraper_load_'), 'load.db'))
+    else:
+        db_manager = DatabaseManager(args.mongodb_uri, 'lead_scraper_load')
+
+    print(f"Running {args.tasks} tasks, {args.concurrency} at a time, against {url}")
+    runner = LoadRunner(db_manager, args.tasks, args.concurrency)
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    elapsed = runner.run(args.timeout)
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+
+    cpu_seconds = (usage_after.ru_utime - usage_before.ru_utime) + (usage_after.ru_stime - usage_before.ru_stime)
+    counters = metrics.snapshot()['counters']
+    email_requests = counter_total(counters, 'email_lookup_requests_total')
+    report = {
+        'tasks': args.tasks,
+        'concurrency': args.concurrency,
+        'failed_tasks': runner.failed,
+        'leads': runner.leads,
+        'emails': runner.emails,
+        'email_requests': email_requests,
+        'emails_per_request': runner.emails / email_requests if email_requests else 0.0,
+        'retries': counter_total(counters, 'retries_total'),
+        'short_circuits': counter_total(counters, 'circuit_short_circuits_total'),
+        'seconds': elapsed,
+        'leads_per_sec': runner.leads / elapsed if elapsed else 0.0,
+        'task_latency_p50': percentile(runner.latencies, 50),
+        'task_latency_p95': percentile(runner.latencies, 95),
+        'task_latency_p99': percentile(runner.latencies, 99),
+        'cpu_seconds': cpu_seconds,
+        'cpu_percent': cpu_seconds / elapsed * 100 if elapsed else 0.0,
+        'rss_mb': current_rss_mb(),
+        'peak_rss_mb': peak_rss_mb(),
+        'fake_web': {
+            'latency_ms': args.latency_ms,
+            'error_rate': args.error_rate,
+            'slow_rate': args.slow_rate,
+            'json_state': not args.no_json_state
+        },
+        'stages': metrics.snapshot()['histograms'].get('scraper_stage_seconds', [])
+    }
+
+    db_manager.disconnect()
+    if server:
+        server.terminate()
+        server.wait()
+
+    print()
+    for key in ('failed_tasks', 'leads', 'emails', 'email_requests', 'emails_per_request', 'retries',
+                'short_circuits', 'seconds', 'leads_per_sec', 'task_latency_p50', 'task_latency_p95',
+                'task_latency_p99', 'cpu_seconds', 'cpu_percent', 'rss_mb', 'peak_rss_mb'):
+        value = report[key]
+        print(f"{key:<20}{value:>12.2f}" if isinstance(value, float) else f"{key:<20}{value:>12}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+if __name__ == "__main__":
+    main()
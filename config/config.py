@@ -4,16 +4,96 @@ from dotenv import load_dotenv
 load_dotenv()
 
 class Config:
+    # Storage backend: 'mongodb' or 'sqlite'
+    STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'mongodb').lower()
+    SQLITE_PATH = os.getenv('SQLITE_PATH', 'lead_scraper.db')
+    SQLITE_POOL_SIZE = int(os.getenv('SQLITE_POOL_SIZE', '4'))  # idle connections kept open
     MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
     DATABASE_NAME = os.getenv('DATABASE_NAME', 'lead_scraper')
+    MONGODB_MAX_POOL_SIZE = int(os.getenv('MONGODB_MAX_POOL_SIZE', '20'))
+    MONGODB_MIN_POOL_SIZE = int(os.getenv('MONGODB_MIN_POOL_SIZE', '1'))
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGODB_SERVER_SELECTION_TIMEOUT_MS', '5000'))
+    MONGODB_CONNECT_TIMEOUT_MS = int(os.getenv('MONGODB_CONNECT_TIMEOUT_MS', '5000'))
+    MONGODB_SOCKET_TIMEOUT_MS = int(os.getenv('MONGODB_SOCKET_TIMEOUT_MS', '30000'))
     GOOGLE_MAPS_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY', '')
     SELENIUM_HEADLESS = os.getenv('SELENIUM_HEADLESS', 'True').lower() == 'true'
     SCRAPING_DELAY = int(os.getenv('SCRAPING_DELAY', '2'))
     MAX_RESULTS_PER_TASK = int(os.getenv('MAX_RESULTS_PER_TASK', '50'))
+    PROGRESS_INTERVAL = float(os.getenv('PROGRESS_INTERVAL', '0.5'))
+    # HTML parser: 'auto' (fastest installed), 'selectolax', 'lxml' or 'bs4'
+    HTML_PARSER = os.getenv('HTML_PARSER', 'auto').lower()
+    
+    # Yelp site root; point at benchmarks/fake_web.py for offline load tests
+    YELP_BASE_URL = os.getenv('YELP_BASE_URL', 'https://www.yelp.com').rstrip('/')
+    YELP_PAGE_SIZE = int(os.getenv('YELP_PAGE_SIZE', '10'))
+    # Detail pages fill in phone/website; the rate is shared by all Yelp tasks (0 = unlimited)
+    YELP_DETAIL_PAGES = os.getenv('YELP_DETAIL_PAGES', 'True').lower() == 'true'
+    YELP_DETAIL_WORKERS = int(os.getenv('YELP_DETAIL_WORKERS', '4'))
+    YELP_DETAIL_RATE = float(os.getenv('YELP_DETAIL_RATE', '2'))
+    
+    # Email lookup: requests per website (home page and sitemap included) and link depth
+    CRAWL_MAX_PAGES = int(os.getenv('CRAWL_MAX_PAGES', '4'))
+    CRAWL_MAX_DEPTH = int(os.getenv('CRAWL_MAX_DEPTH', '2'))
+    
+    # Retries with jittered exponential backoff; per-domain circuit breaker
+    RETRY_ATTEMPTS = int(os.getenv('RETRY_ATTEMPTS', '3'))
+    RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', '0.5'))
+    RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', '8'))
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', '60'))
+    
+    # Per-host DNS/reachability and per-site email cache shared by tasks and restarts (TTLs in seconds)
+    DOMAIN_CACHE_ENABLED = os.getenv('DOMAIN_CACHE_ENABLED', 'True').lower() == 'true'
+    DOMAIN_CACHE_PATH = os.getenv('DOMAIN_CACHE_PATH', 'domain_cache.db')
+    DOMAIN_CACHE_DNS_TTL = float(os.getenv('DOMAIN_CACHE_DNS_TTL', '3600'))
+    DOMAIN_CACHE_EMAIL_TTL = float(os.getenv('DOMAIN_CACHE_EMAIL_TTL', str(7 * 24 * 3600)))
+    DOMAIN_CACHE_NO_EMAIL_TTL = float(os.getenv('DOMAIN_CACHE_NO_EMAIL_TTL', str(24 * 3600)))
+    DOMAIN_CACHE_UNREACHABLE_TTL = float(os.getenv('DOMAIN_CACHE_UNREACHABLE_TTL', '3600'))
+    DOMAIN_CACHE_MEMORY_ENTRIES = int(os.getenv('DOMAIN_CACHE_MEMORY_ENTRIES', '10000'))  # per table
+    
+    # Result paging / streaming
+    RESULTS_PAGE_SIZE = int(os.getenv('RESULTS_PAGE_SIZE', '200'))
+    RESULTS_BATCH_SIZE = int(os.getenv('RESULTS_BATCH_SIZE', '1000'))
+    VIEWER_CACHE_PAGES = int(os.getenv('VIEWER_CACHE_PAGES', '20'))
+    TASKS_PAGE_SIZE = int(os.getenv('TASKS_PAGE_SIZE', '500'))
+    EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '5000'))
+    
+    # Write-behind buffering of task updates and results
+    WRITE_BATCH_SIZE = int(os.getenv('WRITE_BATCH_SIZE', '500'))
+    WRITE_FLUSH_INTERVAL = float(os.getenv('WRITE_FLUSH_INTERVAL', '1.0'))
+    WRITE_MAX_PENDING = int(os.getenv('WRITE_MAX_PENDING', '10000'))
+    # Attempts at a failing batch before its flush callbacks get the error
+    WRITE_MAX_RETRIES = int(os.getenv('WRITE_MAX_RETRIES', '5'))
+    WRITE_RETRY_DELAY = float(os.getenv('WRITE_RETRY_DELAY', '0.5'))
+    
+    # Metrics: local Prometheus endpoint (port 0 disables it) and JSON snapshot
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
+    METRICS_SNAPSHOT_PATH = os.getenv('METRICS_SNAPSHOT_PATH', 'logs/metrics.json')
+    METRICS_SNAPSHOT_INTERVAL = float(os.getenv('METRICS_SNAPSHOT_INTERVAL', '30'))
+    METRICS_MAX_SERIES = int(os.getenv('METRICS_MAX_SERIES', '500'))
+    
+    # Logging: queued to a background writer; file format 'json' or 'text'
+    LOG_FILE = os.getenv('LOG_FILE', 'lead_scraper.log')
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FILE_FORMAT = os.getenv('LOG_FILE_FORMAT', 'json').lower()
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+    # Per call site: INFO/DEBUG records per second after a burst (0 disables)
+    LOG_RATE_LIMIT = float(os.getenv('LOG_RATE_LIMIT', '5'))
+    LOG_RATE_BURST = int(os.getenv('LOG_RATE_BURST', '20'))
+    
+    # Opt-in per-task profiling: 'cprofile' (deterministic) or 'sampling'
+    PROFILE_MODE = os.getenv('PROFILE_MODE', 'cprofile').lower()
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+    PROFILE_TOP_N = int(os.getenv('PROFILE_TOP_N', '30'))
+    PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', '0.005'))
     
     # UI Configuration
     WINDOW_WIDTH = 1200
     WINDOW_HEIGHT = 800
+    UI_FRAME_INTERVAL_MS = int(os.getenv('UI_FRAME_INTERVAL_MS', '100'))
     
     # Locations for scraping
     LOCATIONS = [
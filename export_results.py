@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Headless results exporter for Lead Scraper Bot
+Streams results from the configured database into CSV, gzipped JSONL,
+Parquet or Excel without starting the UI.
+
+Examples:
+    python export_results.py exports/all.csv
+    python export_results.py exports/leads.parquet --task-id <task id>
+    python export_results.py exports/leads.out --format jsonl.gz
+"""
+
+import sys
+import os
+import argparse
+import logging
+
+# Add src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.database import StorageFactory
+from src.export import ExporterFactory
+
+def main():
+    """Main entry point for the headless exporter"""
+    parser = argparse.ArgumentParser(description="Export scraped results")
+    parser.add_argument('output', help="Output file; the format is taken from the extension unless --format is given")
+    parser.add_argument('--format', choices=ExporterFactory.get_available_formats())
+    parser.add_argument('--task-id', help="Only export results for this task")
+    parser.add_argument('--chunk-size', type=int, help="Rows per chunk read from the database")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    try:
+        format_name = args.format or ExporterFactory.format_for_filename(args.output)
+        exporter = ExporterFactory.create_exporter(format_name, chunk_size=args.chunk_size)
+
+        db = StorageFactory.create_storage()
+        try:
+            count = exporter.export_results(db, args.output, args.task_id)
+        finally:
+            db.disconnect()
+
+        print(f"Exported {count} results to {args.output}")
+    except Exception as e:
+        print(f"Export failed: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,17 @@
 # Database package
-from .db_manager import DatabaseManager
+from .storage import BaseStorage, StorageFactory
+from .write_buffer import BufferedWriter
 
-__all__ = ['DatabaseManager']
+# Backends pull in their drivers (pymongo/bson), so they load on first access
+_LAZY_BACKENDS = {
+    'DatabaseManager': '.db_manager',
+    'SQLiteManager': '.sqlite_manager',
+}
+
+def __getattr__(name: str):
+    if name in _LAZY_BACKENDS:
+        import importlib
+        return getattr(importlib.import_module(_LAZY_BACKENDS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ['BaseStorage', 'StorageFactory', 'DatabaseManager', 'SQLiteManager', 'BufferedWriter']
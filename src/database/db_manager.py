@@ -1,11 +1,28 @@
-from pymongo import MongoClient
+from pymongo import MongoClient, ASCENDING, DESCENDING, TEXT, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+from bson import ObjectId
+from bson.errors import InvalidId
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator, Tuple
 import logging
 from config.config import Config
+from .storage import (BaseStorage, TASK_SUMMARY_FIELDS, SEARCH_FIELDS, SORT_FIELDS,
+                      parse_rating, search_terms)
 
-class DatabaseManager:
-    def __init__(self):
+# Newest-first ordering used by every results listing; `_id` breaks ties so
+# the order is total and can be resumed from a (scraped_at, _id) cursor.
+RESULTS_SORT = [('scraped_at', DESCENDING), ('_id', DESCENDING)]
+TASKS_SORT = [('created_at', DESCENDING), ('_id', DESCENDING)]
+
+DUPLICATE_KEY = 11000
+
+class DatabaseManager(BaseStorage):
+    """MongoDB storage backend"""
+    
+    def __init__(self, uri: str = None, database_name: str = None):
+        super().__init__()
+        self.uri = uri or Config.MONGODB_URI
+        self.database_name = database_name or Config.DATABASE_NAME
         self.client = None
         self.db = None
         self.connect()
@@ -13,16 +30,63 @@ class DatabaseManager:
     def connect(self):
         """Connect to MongoDB"""
         try:
-            self.client = MongoClient(Config.MONGODB_URI)
-            self.db = self.client[Config.DATABASE_NAME]
+            self.client = MongoClient(
+                self.uri,
+                maxPoolSize=Config.MONGODB_MAX_POOL_SIZE,
+                minPoolSize=Config.MONGODB_MIN_POOL_SIZE,
+                serverSelectionTimeoutMS=Config.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+                connectTimeoutMS=Config.MONGODB_CONNECT_TIMEOUT_MS,
+                socketTimeoutMS=Config.MONGODB_SOCKET_TIMEOUT_MS
+            )
+            self.db = self.client[self.database_name]
             # Test connection
             self.client.admin.command('ping')
+            self.ensure_indexes()
+            self._migrate()
             logging.info("Connected to MongoDB successfully")
         except Exception as e:
             logging.error(f"Failed to connect to MongoDB: {e}")
             raise
     
-    def disconnect(self):
+    def ensure_indexes(self):
+        """Create the indexes backing the paginated results queries"""
+        self.db.results.create_index([('scraped_at', DESCENDING), ('_id', DESCENDING)])
+        self.db.results.create_index([('task_id', ASCENDING), ('scraped_at', DESCENDING), ('_id', DESCENDING)])
+        self.db.tasks.create_index([('created_at', DESCENDING), ('_id', DESCENDING)])
+        self.db.tasks.create_index([('status', ASCENDING)])
+        
+        # Search: one text index over the searchable fields, one index per
+        # sort field (walked in either direction), and the filter fields
+        self.db.results.create_index([(field, TEXT) for field in SEARCH_FIELDS], name='results_text')
+        for field in SORT_FIELDS:
+            if field != 'scraped_at':
+                self.db.results.create_index([(field, ASCENDING), ('_id', ASCENDING)])
+        self.db.results.create_index([('email', ASCENDING)])
+        self.db.results.create_index([('phone', ASCENDING)])
+        self.db.tasks.create_index([('location', ASCENDING)])
+    
+    def _migrate(self):
+        """Fill in fields introduced after results were stored
+        
+        Results saved before `rating_value` existed would be skipped by the
+        rating filters and sorted last, so it is computed for them once.
+        """
+        cursor = self.db.results.find({'rating_value': {'$exists': False}}, {'rating': 1},
+                                      batch_size=Config.RESULTS_BATCH_SIZE)
+        updated = 0
+        ops = []
+        for doc in cursor:
+            ops.append(UpdateOne({'_id': doc['_id']},
+                                 {'$set': {'rating_value': parse_rating(doc.get('rating'))}}))
+            if len(ops) >= Config.RESULTS_BATCH_SIZE:
+                updated += self.db.results.bulk_write(ops, ordered=False).modified_count
+                ops = []
+        if ops:
+            updated += self.db.results.bulk_write(ops, ordered=False).modified_count
+        if updated:
+            logging.info(f"Added rating_value to {updated} existing results")
+    
+    def close(self):
         """Disconnect from MongoDB"""
         if self.client:
             self.client.close()
@@ -54,7 +118,7 @@ class DatabaseManager:
             update_data['error_message'] = error_message
         
         self.db.tasks.update_one(
-            {'_id': task_id},
+            self._task_filter(task_id),
             {'$set': update_data}
         )
         logging.info(f"Updated task {task_id} status to {status}")
@@ -66,9 +130,51 @@ class DatabaseManager:
             task['_id'] = str(task['_id'])
         return tasks
     
+    def get_task_summaries(self, after: Dict = None, limit: int = None) -> Tuple[List[Dict], Optional[Dict]]:
+        """Get one page of tasks, newest first, with only the task list columns
+        
+        Returns the page and the cursor to pass as `after` for the next page,
+        or None when there are no more tasks.
+        """
+        limit = limit or Config.TASKS_PAGE_SIZE
+        query = {}
+        
+        if after:
+            last_id = ObjectId(after['_id'])
+            query['$or'] = [
+                {'created_at': {'$lt': after['created_at']}},
+                {'created_at': after['created_at'], '_id': {'$lt': last_id}}
+            ]
+        
+        tasks = list(self.db.tasks.find(query, TASK_SUMMARY_FIELDS).sort(TASKS_SORT).limit(limit))
+        for task in tasks:
+            task['_id'] = str(task['_id'])
+        
+        next_cursor = None
+        if len(tasks) == limit:
+            next_cursor = {'created_at': tasks[-1]['created_at'], '_id': tasks[-1]['_id']}
+        return tasks, next_cursor
+    
+    def get_task_stats(self) -> Dict:
+        """Get task counts per status and the total number of leads in one aggregation"""
+        pipeline = [
+            {'$group': {
+                '_id': '$status',
+                'count': {'$sum': 1},
+                'leads': {'$sum': '$results_count'}
+            }}
+        ]
+        
+        stats = {'total_tasks': 0, 'total_leads': 0, 'by_status': {}}
+        for row in self.db.tasks.aggregate(pipeline):
+            stats['by_status'][row['_id']] = row['count']
+            stats['total_tasks'] += row['count']
+            stats['total_leads'] += row['leads']
+        return stats
+    
     def get_task(self, task_id: str) -> Optional[Dict]:
         """Get a specific task"""
-        task = self.db.tasks.find_one({'_id': task_id})
+        task = self.db.tasks.find_one(self._task_filter(task_id))
         if task:
             task['_id'] = str(task['_id'])
         return task
@@ -78,7 +184,7 @@ class DatabaseManager:
         # Delete task results first
         self.db.results.delete_many({'task_id': task_id})
         # Delete task
-        result = self.db.tasks.delete_one({'_id': task_id})
+        result = self.db.tasks.delete_one(self._task_filter(task_id))
         if result.deleted_count > 0:
             logging.info(f"Deleted task {task_id} and its results")
         return result.deleted_count > 0
@@ -92,13 +198,14 @@ class DatabaseManager:
         for result in results:
             result['task_id'] = task_id
             result['scraped_at'] = datetime.utcnow()
+            result['rating_value'] = parse_rating(result.get('rating'))
         
         # Insert results
         self.db.results.insert_many(results)
         
         # Update task results count
         self.db.tasks.update_one(
-            {'_id': task_id},
+            self._task_filter(task_id),
             {
                 '$set': {
                     'results_count': len(results),
@@ -109,26 +216,185 @@ class DatabaseManager:
         
         logging.info(f"Saved {len(results)} results for task {task_id}")
     
-    def get_task_results(self, task_id: str) -> List[Dict]:
-        """Get results for a specific task"""
-        results = list(self.db.results.find({'task_id': task_id}))
-        for result in results:
+    def apply_write_batch(self, status_updates: Dict[str, Dict], increments: Dict[str, Dict],
+                          inserts: List[Dict]):
+        """Apply a coalesced batch of buffered writes with unordered bulk writes"""
+        if inserts:
+            for doc in inserts:
+                doc['rating_value'] = parse_rating(doc.get('rating'))
+                doc.setdefault('_id', ObjectId())
+            try:
+                self.db.results.bulk_write([InsertOne(doc) for doc in inserts], ordered=False)
+            except BulkWriteError as e:
+                # A retried batch keeps its _ids, so rows saved by the failed attempt are duplicates
+                if any(error.get('code') != DUPLICATE_KEY for error in e.details.get('writeErrors', [])) \
+                        or e.details.get('writeConcernErrors'):
+                    raise
+        
+        task_ops = []
+        for task_id in set(status_updates) | set(increments):
+            update = {}
+            if status_updates.get(task_id):
+                update['$set'] = status_updates[task_id]
+            if increments.get(task_id):
+                update['$inc'] = increments[task_id]
+            task_ops.append(UpdateOne(self._task_filter(task_id), update))
+        
+        if task_ops:
+            self.db.tasks.bulk_write(task_ops, ordered=False)
+    
+    def count_results(self, task_id: str = None) -> int:
+        """Count results, optionally restricted to one task"""
+        return self.db.results.count_documents(self._results_query(task_id))
+    
+    def iter_results(self, task_id: str = None, projection: List[str] = None,
+                     batch_size: int = None) -> Iterator[Dict]:
+        """Stream results newest first without materializing the collection"""
+        cursor = self.db.results.find(
+            self._results_query(task_id),
+            projection,
+            batch_size=batch_size or Config.RESULTS_BATCH_SIZE
+        ).sort(RESULTS_SORT)
+        
+        try:
+            for result in cursor:
+                result['_id'] = str(result['_id'])
+                yield result
+        finally:
+            cursor.close()
+    
+    def get_results_page(self, task_id: str = None, after: Dict = None,
+                         limit: int = None, projection: List[str] = None) -> Tuple[List[Dict], Optional[Dict]]:
+        """Get one page of results using keyset pagination on (scraped_at, _id)
+        
+        Returns the page and the cursor to pass as `after` for the next page,
+        or None when there are no more results.
+        """
+        limit = limit or Config.RESULTS_PAGE_SIZE
+        query = self._results_query(task_id)
+        
+        if after:
+            last_id = ObjectId(after['_id'])
+            query['$or'] = [
+                {'scraped_at': {'$lt': after['scraped_at']}},
+                {'scraped_at': after['scraped_at'], '_id': {'$lt': last_id}}
+            ]
+        
+        # The cursor fields must always come back, whatever the caller projects
+        if projection is not None:
+            projection = list(set(projection) | {'scraped_at'})
+        
+        page = list(self.db.results.find(query, projection).sort(RESULTS_SORT).limit(limit))
+        for result in page:
             result['_id'] = str(result['_id'])
-        return results
+        
+        next_cursor = None
+        if len(page) == limit:
+            next_cursor = {'scraped_at': page[-1]['scraped_at'], '_id': page[-1]['_id']}
+        return page, next_cursor
     
-    def get_all_results(self) -> List[Dict]:
-        """Get all results"""
-        results = list(self.db.results.find().sort('scraped_at', -1))
-        for result in results:
+    def search_results(self, filters: Dict = None, sort: str = None, descending: bool = True,
+                       after: Dict = None, offset: int = 0, limit: int = None,
+                       projection: List[str] = None) -> Tuple[List[Dict], Optional[Dict]]:
+        """Get one page of matching results, resuming from a (sort field, _id) cursor"""
+        sort = sort or 'scraped_at'
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort results by {sort}")
+        
+        limit = limit or Config.RESULTS_PAGE_SIZE
+        direction = DESCENDING if descending else ASCENDING
+        query = self._search_query(filters)
+        
+        use_cursor = after is not None and after.get(sort) is not None
+        if use_cursor:
+            last_id = ObjectId(after['_id'])
+            compare = '$lt' if descending else '$gt'
+            keyset = [
+                {sort: {compare: after[sort]}},
+                {sort: after[sort], '_id': {compare: last_id}}
+            ]
+            if descending:
+                # Missing values sort last when descending
+                keyset.append({sort: None})
+            query['$or'] = keyset
+        
+        # The cursor fields must always come back, whatever the caller projects
+        if projection is not None:
+            projection = list(set(projection) | {sort})
+        
+        cursor = self.db.results.find(query, projection).sort([(sort, direction), ('_id', direction)])
+        if not use_cursor and offset:
+            cursor = cursor.skip(offset)
+        page = list(cursor.limit(limit))
+        for result in page:
             result['_id'] = str(result['_id'])
-        return results
+        
+        next_cursor = None
+        if len(page) == limit:
+            next_cursor = {sort: page[-1].get(sort), '_id': page[-1]['_id']}
+        return page, next_cursor
+    
+    def count_search_results(self, filters: Dict = None) -> int:
+        """Count results matching `filters`"""
+        return self.db.results.count_documents(self._search_query(filters))
+    
+    def _search_query(self, filters: Dict = None) -> Dict:
+        """Translate search filters into an indexed MongoDB query"""
+        filters = filters or {}
+        query = {}
+        conditions = []
+        
+        terms = search_terms(filters.get('text'))
+        if terms:
+            # Quoting every word makes the text search require all of them
+            query['$text'] = {'$search': ' '.join(f'"{term}"' for term in terms)}
+        if filters.get('has_email'):
+            conditions.append({'email': {'$gt': ''}})
+        if filters.get('has_phone'):
+            conditions.append({'phone': {'$gt': ''}})
+        
+        rating = {}
+        if filters.get('min_rating') is not None:
+            rating['$gte'] = float(filters['min_rating'])
+        if filters.get('max_rating') is not None:
+            rating['$lte'] = float(filters['max_rating'])
+        if rating:
+            conditions.append({'rating_value': rating})
+        
+        if filters.get('task_id'):
+            conditions.append({'task_id': filters['task_id']})
+        if filters.get('location'):
+            task_ids = [str(task['_id']) for task in
+                        self.db.tasks.find({'location': filters['location']}, ['_id'])]
+            conditions.append({'task_id': {'$in': task_ids}})
+        
+        if len(conditions) == 1:
+            query.update(conditions[0])
+        elif conditions:
+            query['$and'] = conditions
+        return query
+    
+    def _task_filter(self, task_id: str) -> Dict:
+        """Build the filter matching a task by its string id
+        
+        Tasks are stored with ObjectId keys while the rest of the app passes
+        ids around as strings, so convert before querying.
+        """
+        try:
+            return {'_id': ObjectId(task_id)}
+        except (InvalidId, TypeError):
+            return {'_id': task_id}
+    
+    def _results_query(self, task_id: str = None) -> Dict:
+        """Build the base filter for results queries"""
+        return {'task_id': task_id} if task_id else {}
     
     def clear_task_results(self, task_id: str):
         """Clear results for a specific task"""
         result = self.db.results.delete_many({'task_id': task_id})
         # Reset task results count
         self.db.tasks.update_one(
-            {'_id': task_id},
+            self._task_filter(task_id),
             {
                 '$set': {
                     'results_count': 0,
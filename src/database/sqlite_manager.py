@@ -0,0 +1,525 @@
+import sqlite3
+import json
+import threading
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Optional, Iterator, Tuple
+from config.config import Config
+from .storage import (BaseStorage, TASK_SUMMARY_FIELDS, SEARCH_FIELDS, SORT_FIELDS,
+                      parse_rating, search_terms)
+
+# Result fields stored in their own columns; anything else goes into `extra`
+RESULT_COLUMNS = ['name', 'address', 'phone', 'email', 'website', 'rating', 'category']
+
+# Columns computed from the scraped fields when results are inserted
+DERIVED_COLUMNS = ['rating_value']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    keyword TEXT NOT NULL,
+    location TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    results_count INTEGER NOT NULL DEFAULT 0,
+    error_message TEXT,
+    profile_path TEXT,
+    profile_summary_path TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id TEXT NOT NULL,
+    scraped_at TEXT NOT NULL,
+    name TEXT,
+    address TEXT,
+    phone TEXT,
+    email TEXT,
+    website TEXT,
+    rating TEXT,
+    category TEXT,
+    rating_value REAL,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_scraped ON results (scraped_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_results_task_scraped ON results (task_id, scraped_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+"""
+
+# Search indexes; created after migrations so older files have every column
+SEARCH_SCHEMA = """
+CREATE INDEX IF NOT EXISTS idx_results_name ON results (name, id);
+CREATE INDEX IF NOT EXISTS idx_results_category ON results (category, id);
+CREATE INDEX IF NOT EXISTS idx_results_rating ON results (rating_value, id);
+CREATE INDEX IF NOT EXISTS idx_results_email ON results (email);
+CREATE INDEX IF NOT EXISTS idx_results_phone ON results (phone);
+CREATE INDEX IF NOT EXISTS idx_tasks_location ON tasks (location);
+"""
+
+# Full-text index over the searchable fields, kept in sync by triggers
+FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS results_fts USING fts5(
+    {', '.join(SEARCH_FIELDS)}, content='results', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS results_fts_insert AFTER INSERT ON results BEGIN
+    INSERT INTO results_fts (rowid, {', '.join(SEARCH_FIELDS)})
+    VALUES (new.id, {', '.join('new.' + field for field in SEARCH_FIELDS)});
+END;
+CREATE TRIGGER IF NOT EXISTS results_fts_delete AFTER DELETE ON results BEGIN
+    INSERT INTO results_fts (results_fts, rowid, {', '.join(SEARCH_FIELDS)})
+    VALUES ('delete', old.id, {', '.join('old.' + field for field in SEARCH_FIELDS)});
+END;
+"""
+
+def _format_datetime(dt: datetime) -> str:
+    """Fixed-width ISO format so timestamps sort correctly as text"""
+    return dt.isoformat(timespec='microseconds')
+
+def _parse_datetime(value: str) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+class SQLiteManager(BaseStorage):
+    """Embedded SQLite storage backend running in WAL mode
+
+    Every call checks a connection out of a small pool and returns it when
+    done, so the UI can read while the buffered writer commits batches in
+    the background, and short-lived threads (prefetches, export jobs) don't
+    each leave a connection open. At most `pool_size` idle connections are
+    kept; extra ones are closed when returned.
+    """
+
+    def __init__(self, path: str = None, pool_size: int = None):
+        super().__init__()
+        self.path = path or Config.SQLITE_PATH
+        self.pool_size = pool_size or Config.SQLITE_POOL_SIZE
+        self._idle = []  # connections ready for the next call
+        self._connections = set()  # every open connection, idle or checked out
+        self._connections_lock = threading.Lock()
+        self.has_fts = False
+        self.connect()
+
+    def connect(self):
+        """Open the database file and create the schema"""
+        try:
+            with self._connection() as conn:
+                conn.executescript(SCHEMA)
+                self._migrate(conn)
+                conn.executescript(SEARCH_SCHEMA)
+                self.has_fts = self._create_fts(conn)
+                conn.commit()
+            logging.info(f"Opened SQLite database at {self.path}")
+        except Exception as e:
+            logging.error(f"Failed to open SQLite database: {e}")
+            raise
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """Add columns introduced after a database file was created"""
+        task_columns = {row['name'] for row in conn.execute("PRAGMA table_info(tasks)")}
+        for column in ('profile_path', 'profile_summary_path'):
+            if column not in task_columns:
+                conn.execute(f"ALTER TABLE tasks ADD COLUMN {column} TEXT")
+
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(results)")}
+        if 'rating_value' not in columns:
+            conn.execute("ALTER TABLE results ADD COLUMN rating_value REAL")
+            rows = conn.execute("SELECT id, rating FROM results WHERE rating != ''").fetchall()
+            conn.executemany(
+                "UPDATE results SET rating_value = ? WHERE id = ?",
+                [(parse_rating(row['rating']), row['id']) for row in rows]
+            )
+            logging.info(f"Added rating_value to {len(rows)} existing results")
+
+    def _create_fts(self, conn: sqlite3.Connection) -> bool:
+        """Create the full-text index, returning False if FTS5 is unavailable"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'results_fts'"
+        ).fetchone()
+        try:
+            conn.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            logging.warning(f"SQLite FTS5 unavailable, text search will scan: {e}")
+            return False
+
+        if not exists:
+            # Index results stored before the full-text table existed
+            conn.execute("INSERT INTO results_fts (results_fts) VALUES ('rebuild')")
+        return True
+
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        with self._connections_lock:
+            self._connections.add(conn)
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Check a connection out of the pool for the duration of one call"""
+        with self._connections_lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._open_connection()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def _release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, closing it if the pool is full or closed"""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._connections_lock:
+            if conn in self._connections and len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+            self._connections.discard(conn)
+        conn.close()
+
+    def close(self):
+        """Close every pooled connection; ones in use are closed when returned"""
+        with self._connections_lock:
+            for conn in self._idle:
+                conn.close()
+            self._connections.difference_update(self._idle)
+            self._idle = []
+            self._connections = set()
+        logging.info("Closed SQLite database")
+
+    def create_task(self, keyword: str, location: str) -> str:
+        """Create a new scraping task"""
+        now = _format_datetime(datetime.utcnow())
+        with self._connection() as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO tasks (keyword, location, status, created_at, updated_at) "
+                "VALUES (?, ?, 'Created', ?, ?)",
+                (keyword, location, now, now)
+            )
+        task_id = str(cursor.lastrowid)
+        logging.info(f"Created task {task_id} for keyword '{keyword}' in '{location}'")
+        return task_id
+
+    def update_task_status(self, task_id: str, status: str, error_message: str = None):
+        """Update task status"""
+        self.apply_write_batch({task_id: self._status_fields(status, error_message)}, {}, [])
+        logging.info(f"Updated task {task_id} status to {status}")
+
+    def get_all_tasks(self) -> List[Dict]:
+        """Get all tasks"""
+        with self._connection() as conn:
+            rows = conn.execute("SELECT * FROM tasks ORDER BY created_at DESC, id DESC")
+            return [self._task_from_row(row) for row in rows]
+
+    def get_task_summaries(self, after: Dict = None, limit: int = None) -> Tuple[List[Dict], Optional[Dict]]:
+        """Get one page of tasks, newest first, with only the task list columns"""
+        limit = limit or Config.TASKS_PAGE_SIZE
+        sql = f"SELECT id, {', '.join(TASK_SUMMARY_FIELDS)} FROM tasks"
+        params = []
+
+        if after:
+            sql += " WHERE (created_at, id) < (?, ?)"
+            params += [_format_datetime(after['created_at']), int(after['_id'])]
+
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+
+        with self._connection() as conn:
+            tasks = [self._task_from_row(row) for row in conn.execute(sql, params)]
+
+        next_cursor = None
+        if len(tasks) == limit:
+            next_cursor = {'created_at': tasks[-1]['created_at'], '_id': tasks[-1]['_id']}
+        return tasks, next_cursor
+
+    def get_task_stats(self) -> Dict:
+        """Get task counts per status and the total number of leads in one query"""
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) AS count, COALESCE(SUM(results_count), 0) AS leads "
+                "FROM tasks GROUP BY status"
+            ).fetchall()
+
+        stats = {'total_tasks': 0, 'total_leads': 0, 'by_status': {}}
+        for row in rows:
+            stats['by_status'][row['status']] = row['count']
+            stats['total_tasks'] += row['count']
+            stats['total_leads'] += row['leads']
+        return stats
+
+    def get_task(self, task_id: str) -> Optional[Dict]:
+        """Get a specific task"""
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM tasks WHERE id = ?", (self._task_key(task_id),)
+            ).fetchone()
+        return self._task_from_row(row) if row else None
+
+    def delete_task(self, task_id: str) -> bool:
+        """Delete a task and its associated results"""
+        with self._connection() as conn, conn:
+            conn.execute("DELETE FROM results WHERE task_id = ?", (task_id,))
+            cursor = conn.execute("DELETE FROM tasks WHERE id = ?", (self._task_key(task_id),))
+        if cursor.rowcount > 0:
+            logging.info(f"Deleted task {task_id} and its results")
+        return cursor.rowcount > 0
+
+    def save_results(self, task_id: str, results: List[Dict]):
+        """Save scraping results for a task in a single transaction"""
+        if not results:
+            return
+
+        for result in results:
+            result['task_id'] = task_id
+            result['scraped_at'] = datetime.utcnow()
+
+        with self._connection() as conn, conn:
+            self._insert_results(conn, results)
+            conn.execute(
+                "UPDATE tasks SET results_count = ?, updated_at = ? WHERE id = ?",
+                (len(results), _format_datetime(datetime.utcnow()), self._task_key(task_id))
+            )
+
+        logging.info(f"Saved {len(results)} results for task {task_id}")
+
+    def apply_write_batch(self, status_updates: Dict[str, Dict], increments: Dict[str, Dict],
+                          inserts: List[Dict]):
+        """Apply a coalesced batch of buffered writes in one transaction"""
+        with self._connection() as conn, conn:
+            if inserts:
+                self._insert_results(conn, inserts)
+
+            for task_id in set(status_updates) | set(increments):
+                assignments = []
+                params = []
+                for field, value in (status_updates.get(task_id) or {}).items():
+                    assignments.append(f"{field} = ?")
+                    params.append(_format_datetime(value) if isinstance(value, datetime) else value)
+                for field, amount in (increments.get(task_id) or {}).items():
+                    assignments.append(f"{field} = {field} + ?")
+                    params.append(amount)
+
+                if assignments:
+                    params.append(self._task_key(task_id))
+                    conn.execute(f"UPDATE tasks SET {', '.join(assignments)} WHERE id = ?", params)
+
+    def count_results(self, task_id: str = None) -> int:
+        """Count results, optionally restricted to one task"""
+        where, params = self._results_where(task_id)
+        with self._connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM results{where}", params).fetchone()[0]
+
+    def iter_results(self, task_id: str = None, projection: List[str] = None,
+                     batch_size: int = None) -> Iterator[Dict]:
+        """Stream results newest first without materializing them"""
+        batch_size = batch_size or Config.RESULTS_BATCH_SIZE
+        where, params = self._results_where(task_id)
+        # The connection stays checked out until the caller finishes iterating
+        with self._connection() as conn:
+            cursor = conn.execute(
+                f"SELECT {self._select_columns(projection)} FROM results{where} "
+                "ORDER BY scraped_at DESC, id DESC",
+                params
+            )
+
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield self._result_from_row(row, projection)
+            finally:
+                cursor.close()
+
+    def get_results_page(self, task_id: str = None, after: Dict = None,
+                         limit: int = None, projection: List[str] = None) -> Tuple[List[Dict], Optional[Dict]]:
+        """Get one page of results using keyset pagination on (scraped_at, id)"""
+        limit = limit or Config.RESULTS_PAGE_SIZE
+        where, params = self._results_where(task_id)
+
+        if after:
+            where += (" AND" if where else " WHERE") + " (scraped_at, id) < (?, ?)"
+            params += [_format_datetime(after['scraped_at']), int(after['_id'])]
+
+        with self._connection() as conn:
+            rows = conn.execute(
+                f"SELECT {self._select_columns(projection)} FROM results{where} "
+                "ORDER BY scraped_at DESC, id DESC LIMIT ?",
+                params + [limit]
+            )
+            page = [self._result_from_row(row, projection) for row in rows]
+
+        next_cursor = None
+        if len(page) == limit:
+            next_cursor = {'scraped_at': page[-1]['scraped_at'], '_id': page[-1]['_id']}
+        return page, next_cursor
+
+    def search_results(self, filters: Dict = None, sort: str = None, descending: bool = True,
+                       after: Dict = None, offset: int = 0, limit: int = None,
+                       projection: List[str] = None) -> Tuple[List[Dict], Optional[Dict]]:
+        """Get one page of matching results, resuming from a (sort field, id) cursor"""
+        sort = sort or 'scraped_at'
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort results by {sort}")
+
+        limit = limit or Config.RESULTS_PAGE_SIZE
+        direction = "DESC" if descending else "ASC"
+        conditions, params = self._search_conditions(filters)
+
+        use_cursor = after is not None and after.get(sort) is not None
+        if use_cursor:
+            value = after[sort]
+            if isinstance(value, datetime):
+                value = _format_datetime(value)
+            keyset = f"({sort}, id) {'<' if descending else '>'} (?, ?)"
+            if descending:
+                # NULLs sort last when descending
+                keyset = f"({keyset} OR {sort} IS NULL)"
+            conditions.append(keyset)
+            params += [value, int(after['_id'])]
+
+        if projection is not None:
+            projection = list(dict.fromkeys(projection + [sort]))
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = (f"SELECT {self._select_columns(projection)} FROM results{where} "
+               f"ORDER BY {sort} {direction}, id {direction} LIMIT ?")
+        params.append(limit)
+        if not use_cursor and offset:
+            sql += " OFFSET ?"
+            params.append(offset)
+
+        with self._connection() as conn:
+            page = [self._result_from_row(row, projection) for row in conn.execute(sql, params)]
+
+        next_cursor = None
+        if len(page) == limit:
+            next_cursor = {sort: page[-1].get(sort), '_id': page[-1]['_id']}
+        return page, next_cursor
+
+    def count_search_results(self, filters: Dict = None) -> int:
+        """Count results matching `filters`"""
+        conditions, params = self._search_conditions(filters)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM results{where}", params).fetchone()[0]
+
+    def _search_conditions(self, filters: Dict = None) -> Tuple[List[str], List]:
+        """Translate search filters into WHERE conditions and parameters"""
+        filters = filters or {}
+        conditions = []
+        params = []
+
+        terms = search_terms(filters.get('text'))
+        if terms and self.has_fts:
+            # Every word must match, as a prefix, in one of the indexed fields
+            conditions.append("id IN (SELECT rowid FROM results_fts WHERE results_fts MATCH ?)")
+            params.append(' '.join(f'"{term}"*' for term in terms))
+        elif terms:
+            for term in terms:
+                conditions.append("(" + " OR ".join(f"{field} LIKE ?" for field in SEARCH_FIELDS) + ")")
+                params += [f"%{term}%"] * len(SEARCH_FIELDS)
+
+        if filters.get('has_email'):
+            conditions.append("email > ''")
+        if filters.get('has_phone'):
+            conditions.append("phone > ''")
+        if filters.get('min_rating') is not None:
+            conditions.append("rating_value >= ?")
+            params.append(float(filters['min_rating']))
+        if filters.get('max_rating') is not None:
+            conditions.append("rating_value <= ?")
+            params.append(float(filters['max_rating']))
+        if filters.get('task_id'):
+            conditions.append("task_id = ?")
+            params.append(filters['task_id'])
+        if filters.get('location'):
+            conditions.append("task_id IN (SELECT CAST(id AS TEXT) FROM tasks WHERE location = ?)")
+            params.append(filters['location'])
+        return conditions, params
+
+    def clear_task_results(self, task_id: str) -> int:
+        """Clear results for a specific task"""
+        with self._connection() as conn, conn:
+            cursor = conn.execute("DELETE FROM results WHERE task_id = ?", (task_id,))
+            conn.execute(
+                "UPDATE tasks SET results_count = 0, updated_at = ? WHERE id = ?",
+                (_format_datetime(datetime.utcnow()), self._task_key(task_id))
+            )
+        logging.info(f"Cleared {cursor.rowcount} results for task {task_id}")
+        return cursor.rowcount
+
+    def _insert_results(self, conn: sqlite3.Connection, results: List[Dict]):
+        """Insert result documents with a single executemany"""
+        known = set(RESULT_COLUMNS + DERIVED_COLUMNS) | {'task_id', 'scraped_at', '_id'}
+        rows = []
+        for result in results:
+            extra = {key: value for key, value in result.items() if key not in known}
+            rows.append(
+                [result['task_id'], _format_datetime(result['scraped_at'])]
+                + [result.get(column, '') for column in RESULT_COLUMNS]
+                + [parse_rating(result.get('rating'))]
+                + [json.dumps(extra, default=str) if extra else None]
+            )
+
+        columns = RESULT_COLUMNS + DERIVED_COLUMNS
+        conn.executemany(
+            f"INSERT INTO results (task_id, scraped_at, {', '.join(columns)}, extra) "
+            f"VALUES ({', '.join('?' * (len(columns) + 3))})",
+            rows
+        )
+
+    def _status_fields(self, status: str, error_message: str = None) -> Dict:
+        fields = {'status': status, 'updated_at': datetime.utcnow()}
+        if error_message:
+            fields['error_message'] = error_message
+        return fields
+
+    def _task_key(self, task_id: str) -> int:
+        """Convert a string task id to the integer primary key"""
+        try:
+            return int(task_id)
+        except (TypeError, ValueError):
+            return -1
+
+    def _results_where(self, task_id: str = None) -> Tuple[str, List]:
+        """Build the base WHERE clause for results queries"""
+        if task_id:
+            return " WHERE task_id = ?", [task_id]
+        return "", []
+
+    def _select_columns(self, projection: List[str] = None) -> str:
+        """Map a field projection onto result table columns"""
+        if projection is None:
+            return "*"
+
+        stored = RESULT_COLUMNS + DERIVED_COLUMNS
+        columns = ['id', 'task_id', 'scraped_at']
+        columns += [field for field in projection if field in stored]
+        if any(field not in stored + columns for field in projection):
+            columns.append('extra')
+        return ', '.join(dict.fromkeys(columns))
+
+    def _task_from_row(self, row: sqlite3.Row) -> Dict:
+        task = dict(row)
+        task['_id'] = str(task.pop('id'))
+        for field in ('created_at', 'updated_at'):
+            if field in task:
+                task[field] = _parse_datetime(task[field])
+        return task
+
+    def _result_from_row(self, row: sqlite3.Row, projection: List[str] = None) -> Dict:
+        result = dict(row)
+        result['_id'] = str(result.pop('id'))
+        result['scraped_at'] = _parse_datetime(result['scraped_at'])
+
+        extra = result.pop('extra', None)
+        if extra:
+            for key, value in json.loads(extra).items():
+                if projection is None or key in projection:
+                    result[key] = value
+        return result
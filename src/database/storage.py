@@ -0,0 +1,172 @@
+import re
+from typing import List, Dict, Optional, Iterator, Tuple
+from config.config import Config
+from .write_buffer import BufferedWriter
+
+# Columns shown in the task list; everything else stays in storage
+TASK_SUMMARY_FIELDS = ['keyword', 'location', 'status', 'results_count', 'created_at']
+
+# Result fields matched by free-text search
+SEARCH_FIELDS = ['name', 'category', 'address']
+
+# Fields results can be sorted on; each is backed by an index in every backend.
+# Ratings are scraped as text, so sorting and range filters use the numeric
+# `rating_value` stored next to them.
+SORT_FIELDS = ['scraped_at', 'name', 'category', 'rating_value']
+
+# Filter keys accepted by search_results / count_search_results:
+#   text          words that must all appear in name, category or address
+#   has_email     only results with a non-empty email
+#   has_phone     only results with a non-empty phone
+#   min_rating    lowest rating_value to include
+#   max_rating    highest rating_value to include
+#   task_id       only results of this task
+#   location      only results of tasks created for this location
+SEARCH_FILTERS = ['text', 'has_email', 'has_phone', 'min_rating', 'max_rating', 'task_id', 'location']
+
+def parse_rating(rating) -> Optional[float]:
+    """Extract a numeric 0-5 rating from scraped text such as '4.5' or '4.5(120)'"""
+    if isinstance(rating, (int, float)):
+        return float(rating)
+    match = re.search(r'\d+(?:\.\d+)?', rating or '')
+    if not match:
+        return None
+    value = float(match.group())
+    return value if 0 <= value <= 5 else None
+
+def search_terms(text: str) -> List[str]:
+    """Split search text into words"""
+    return re.findall(r'\w+', text or '')
+
+class BaseStorage:
+    """Base class for storage backends
+
+    Task and result ids are always exposed as strings. Listings are newest
+    first and paginated with opaque cursors returned alongside each page.
+    """
+
+    def __init__(self):
+        self.writer = None
+
+    def connect(self):
+        """Open the underlying connection"""
+        raise NotImplementedError("Subclasses must implement the connect method")
+
+    def close(self):
+        """Close the underlying connection"""
+        raise NotImplementedError("Subclasses must implement the close method")
+
+    def get_writer(self) -> BufferedWriter:
+        """Get the shared write-behind writer, starting it on first use"""
+        if self.writer is None:
+            self.writer = BufferedWriter(self)
+        return self.writer
+
+    def disconnect(self):
+        """Flush buffered writes and close the backend"""
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+        self.close()
+
+    def create_task(self, keyword: str, location: str) -> str:
+        """Create a new scraping task"""
+        raise NotImplementedError
+
+    def update_task_status(self, task_id: str, status: str, error_message: str = None):
+        """Update task status"""
+        raise NotImplementedError
+
+    def get_all_tasks(self) -> List[Dict]:
+        """Get all tasks"""
+        raise NotImplementedError
+
+    def get_task_summaries(self, after: Dict = None, limit: int = None) -> Tuple[List[Dict], Optional[Dict]]:
+        """Get one page of tasks with only the task list columns"""
+        raise NotImplementedError
+
+    def get_task_stats(self) -> Dict:
+        """Get task counts per status and the total number of leads"""
+        raise NotImplementedError
+
+    def get_task(self, task_id: str) -> Optional[Dict]:
+        """Get a specific task"""
+        raise NotImplementedError
+
+    def delete_task(self, task_id: str) -> bool:
+        """Delete a task and its associated results"""
+        raise NotImplementedError
+
+    def save_results(self, task_id: str, results: List[Dict]):
+        """Save scraping results for a task"""
+        raise NotImplementedError
+
+    def apply_write_batch(self, status_updates: Dict[str, Dict], increments: Dict[str, Dict],
+                          inserts: List[Dict]):
+        """Apply a coalesced batch of buffered writes"""
+        raise NotImplementedError
+
+    def get_task_results(self, task_id: str) -> List[Dict]:
+        """Get results for a specific task"""
+        return list(self.iter_results(task_id))
+
+    def get_all_results(self) -> List[Dict]:
+        """Get all results"""
+        return list(self.iter_results())
+
+    def count_results(self, task_id: str = None) -> int:
+        """Count results, optionally restricted to one task"""
+        raise NotImplementedError
+
+    def iter_results(self, task_id: str = None, projection: List[str] = None,
+                     batch_size: int = None) -> Iterator[Dict]:
+        """Stream results newest first without materializing them"""
+        raise NotImplementedError
+
+    def get_results_page(self, task_id: str = None, after: Dict = None,
+                         limit: int = None, projection: List[str] = None) -> Tuple[List[Dict], Optional[Dict]]:
+        """Get one page of results and the cursor for the next one"""
+        raise NotImplementedError
+
+    def search_results(self, filters: Dict = None, sort: str = None, descending: bool = True,
+                       after: Dict = None, offset: int = 0, limit: int = None,
+                       projection: List[str] = None) -> Tuple[List[Dict], Optional[Dict]]:
+        """Get one page of results matching `filters`, ordered by `sort` then id
+        
+        `after` is the cursor returned with the previous page and resumes the
+        listing through the index. Without a cursor, or when the previous row
+        had no value for the sort field, `offset` rows are skipped instead.
+        Returns the page and the cursor for the next one.
+        """
+        raise NotImplementedError
+
+    def count_search_results(self, filters: Dict = None) -> int:
+        """Count results matching `filters`"""
+        raise NotImplementedError
+
+    def clear_task_results(self, task_id: str) -> int:
+        """Clear results for a specific task"""
+        raise NotImplementedError
+
+class StorageFactory:
+    """Factory class to create the configured storage backend"""
+
+    @staticmethod
+    def create_storage(backend: str = None) -> BaseStorage:
+        """Create a storage instance based on type"""
+        backend = backend or Config.STORAGE_BACKEND
+
+        # Backends are imported on demand so unused drivers are never loaded
+        if backend == "mongodb":
+            from .db_manager import DatabaseManager
+            return DatabaseManager()
+        elif backend == "sqlite":
+            from .sqlite_manager import SQLiteManager
+            return SQLiteManager()
+        else:
+            raise ValueError(f"Unknown storage backend: {backend}")
+
+    @staticmethod
+    def get_available_backends() -> List[str]:
+        """Get list of available storage backends"""
+        return ["mongodb", "sqlite"]
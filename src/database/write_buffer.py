@@ -0,0 +1,250 @@
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from config.config import Config
+from src.metrics import metrics
+
+# Upper bound on the backoff between attempts at a failing batch, in seconds
+MAX_RETRY_DELAY = 30.0
+
+class BufferedWriter:
+    """Write-behind buffer for task status updates, result inserts and counters
+
+    Producers on any thread only touch in-memory buffers. A background thread
+    coalesces them (latest status per task, summed counters) and hands each
+    batch to the database manager's `apply_write_batch`, which issues
+    unordered bulk writes. Producers block only when the number of pending
+    result inserts exceeds `max_pending` (back-pressure).
+
+    A failed batch is merged back into the buffers and retried with
+    exponential backoff. Flush callbacks are called with None once their
+    writes are persisted, or with the error if the batch was given up
+    after `max_retries` attempts. Writes queued after the writer stopped
+    are applied synchronously in the caller's thread.
+    """
+
+    def __init__(self, db_manager, batch_size: int = None, flush_interval: float = None,
+                 max_pending: int = None, max_retries: int = None, retry_delay: float = None):
+        self.db_manager = db_manager
+        self.batch_size = batch_size or Config.WRITE_BATCH_SIZE
+        self.flush_interval = flush_interval or Config.WRITE_FLUSH_INTERVAL
+        self.max_pending = max_pending or Config.WRITE_MAX_PENDING
+        self.max_retries = max_retries or Config.WRITE_MAX_RETRIES
+        self.retry_delay = Config.WRITE_RETRY_DELAY if retry_delay is None else retry_delay
+
+        self._condition = threading.Condition()
+        self._status_updates = {}  # task_id -> fields to $set
+        self._increments = {}  # task_id -> {field: amount}
+        self._inserts = []  # result documents
+        self._flush_callbacks = []  # called once everything queued before them is written
+        self._flush_requested = False
+        self._closed = False
+        self._stopped = False  # background thread has exited
+
+        self._thread = threading.Thread(target=self._run, name="BufferedWriter", daemon=True)
+        self._thread.start()
+
+    def update_status(self, task_id: str, status: str, error_message: str = None):
+        """Queue a task status update, replacing any pending one for the task"""
+        update_data = {
+            'status': status,
+            'updated_at': datetime.utcnow()
+        }
+        if error_message:
+            update_data['error_message'] = error_message
+
+        self.update_fields(task_id, update_data)
+
+    def update_fields(self, task_id: str, fields: Dict):
+        """Queue extra task fields to set along with the next status update"""
+        with self._condition:
+            if not self._stopped:
+                self._status_updates.setdefault(task_id, {}).update(fields)
+                self._condition.notify()
+                return
+        self._write_late({task_id: dict(fields)}, {}, [])
+
+    def increment(self, task_id: str, field: str, amount: int = 1):
+        """Queue a counter increment on a task document"""
+        with self._condition:
+            if not self._stopped:
+                counters = self._increments.setdefault(task_id, {})
+                counters[field] = counters.get(field, 0) + amount
+                self._condition.notify()
+                return
+        self._write_late({}, {task_id: {field: amount}}, [])
+
+    def insert_results(self, task_id: str, results: List[Dict]):
+        """Queue results for insertion and bump the task's results count"""
+        if not results:
+            return
+
+        for result in results:
+            result['task_id'] = task_id
+            result['scraped_at'] = datetime.utcnow()
+
+        with self._condition:
+            # Back-pressure: wait for the flusher rather than growing unbounded
+            while len(self._inserts) >= self.max_pending and not self._closed:
+                self._flush_requested = True
+                self._condition.notify()
+                self._condition.wait()
+
+            if not self._stopped:
+                self._inserts.extend(results)
+                counters = self._increments.setdefault(task_id, {})
+                counters['results_count'] = counters.get('results_count', 0) + len(results)
+                self._status_updates.setdefault(task_id, {})['updated_at'] = datetime.utcnow()
+                self._condition.notify()
+                return
+        self._write_late({task_id: {'updated_at': datetime.utcnow()}},
+                         {task_id: {'results_count': len(results)}}, results)
+
+    def flush_async(self, callback: Callable[[Optional[Exception]], None]):
+        """Flush as soon as possible, then call `callback(error)`
+
+        `error` is None once everything queued before the call is persisted,
+        or the exception that made the writer give up on those writes.
+        """
+        with self._condition:
+            if not self._stopped:
+                self._flush_callbacks.append(callback)
+                self._flush_requested = True
+                self._condition.notify()
+                return
+        # Nothing is pending once the writer has stopped
+        self._call_back([callback], None)
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until everything queued so far has been written; False on error or timeout"""
+        done = threading.Event()
+        errors = []
+
+        def finished(error):
+            if error is not None:
+                errors.append(error)
+            done.set()
+
+        self.flush_async(finished)
+        return done.wait(timeout) and not errors
+
+    def close(self, timeout: float = None):
+        """Flush remaining writes and stop the background thread"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+
+        self._thread.join(timeout)
+        logging.info("Buffered writer closed")
+
+    def _pending_count(self) -> int:
+        return len(self._inserts) + len(self._status_updates) + len(self._increments)
+
+    def _run(self):
+        """Background loop: wait for a size/time threshold, then flush"""
+        last_flush = time.monotonic()
+        retry_at = 0.0
+        failures = 0
+
+        while True:
+            with self._condition:
+                while True:
+                    now = time.monotonic()
+                    if now < retry_at:
+                        # Backing off after a failed write; let the buffers fill meanwhile
+                        self._condition.wait(retry_at - now)
+                        continue
+                    if self._closed or self._flush_requested or len(self._inserts) >= self.batch_size:
+                        break
+                    remaining = self.flush_interval - (now - last_flush)
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                status_updates, self._status_updates = self._status_updates, {}
+                increments, self._increments = self._increments, {}
+                inserts, self._inserts = self._inserts, []
+                callbacks, self._flush_callbacks = self._flush_callbacks, []
+                self._flush_requested = False
+                closing = self._closed
+                # Wake producers blocked on back-pressure
+                self._condition.notify_all()
+
+            error = None
+            if status_updates or increments or inserts:
+                error = self._write_batch(status_updates, increments, inserts)
+            last_flush = time.monotonic()
+
+            if error is None:
+                failures = 0
+            else:
+                failures += 1
+                if failures < self.max_retries:
+                    self._requeue(status_updates, increments, inserts, callbacks)
+                    delay = min(self.retry_delay * 2 ** (failures - 1), MAX_RETRY_DELAY)
+                    retry_at = time.monotonic() + delay
+                    metrics.incr('storage_write_retries_total')
+                    logging.warning(f"Retrying buffered write in {delay:.1f}s "
+                                    f"(attempt {failures + 1} of {self.max_retries})")
+                    continue
+                failures = 0
+                metrics.incr('storage_rows_dropped_total', len(inserts))
+                logging.error(f"Giving up on buffered write after {self.max_retries} attempts; "
+                              f"dropped {len(inserts)} results and "
+                              f"{len(set(status_updates) | set(increments))} task updates")
+
+            self._call_back(callbacks, error)
+
+            if closing:
+                with self._condition:
+                    if not self._pending_count() and not self._flush_callbacks:
+                        self._stopped = True
+                        return
+
+    def _requeue(self, status_updates: Dict, increments: Dict, inserts: List[Dict],
+                 callbacks: List[Callable]):
+        """Merge a failed batch back in front of the writes queued since"""
+        with self._condition:
+            for task_id, fields in status_updates.items():
+                # Fields queued after the failed batch are newer and win
+                self._status_updates[task_id] = dict(fields, **self._status_updates.get(task_id, {}))
+            for task_id, counters in increments.items():
+                pending = self._increments.setdefault(task_id, {})
+                for field, amount in counters.items():
+                    pending[field] = pending.get(field, 0) + amount
+            self._inserts[:0] = inserts
+            self._flush_callbacks[:0] = callbacks
+            # Retry as soon as the backoff ends rather than on the next interval
+            self._flush_requested = True
+
+    def _write_late(self, status_updates: Dict, increments: Dict, inserts: List[Dict]):
+        """Apply writes that arrive after close() in the caller's thread"""
+        logging.warning("Buffered writer is closed; writing synchronously")
+        error = self._write_batch(status_updates, increments, inserts)
+        if error is not None:
+            raise error
+
+    def _call_back(self, callbacks: List[Callable], error: Optional[Exception]):
+        for callback in callbacks:
+            try:
+                callback(error)
+            except Exception as e:
+                logging.error(f"Error in buffered writer flush callback: {e}")
+
+    def _write_batch(self, status_updates: Dict, increments: Dict, inserts: List[Dict]) -> Optional[Exception]:
+        """Hand one coalesced batch to the database manager; returns the error, if any"""
+        try:
+            with metrics.timer('storage_write'):
+                self.db_manager.apply_write_batch(status_updates, increments, inserts)
+            metrics.incr('storage_rows_written_total', len(inserts))
+            metrics.incr('storage_task_updates_total', len(set(status_updates) | set(increments)))
+            logging.debug(f"Flushed {len(inserts)} results and {len(status_updates)} task updates")
+            return None
+        except Exception as e:
+            logging.error(f"Buffered write failed ({len(inserts)} results, "
+                          f"{len(status_updates)} task updates): {e}")
+            return e
@@ -0,0 +1,7 @@
+# Export package
+from .exporters import (BaseExporter, CsvExporter, JsonlGzExporter, ParquetExporter,
+                        ExcelExporter, ExporterFactory, EXPORT_COLUMNS)
+from .jobs import ExportJob, ExportJobManager
+
+__all__ = ['BaseExporter', 'CsvExporter', 'JsonlGzExporter', 'ParquetExporter',
+           'ExcelExporter', 'ExporterFactory', 'EXPORT_COLUMNS', 'ExportJob', 'ExportJobManager']
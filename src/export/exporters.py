@@ -0,0 +1,233 @@
+import csv
+import gzip
+import json
+import os
+import threading
+import logging
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List
+from config.config import Config
+from src.utils import export_rows_to_excel, ExportCancelled
+
+# Fixed export schema: lead fields followed by provenance fields
+LEAD_COLUMNS = ['name', 'address', 'phone', 'email', 'website', 'rating', 'category']
+PROVENANCE_COLUMNS = ['task_id', 'source', 'scraped_at']
+EXPORT_COLUMNS = LEAD_COLUMNS + PROVENANCE_COLUMNS
+
+def _chunks(rows: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    """Split an iterable into lists of at most `size` items"""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _text_value(value) -> str:
+    """Render a field for text formats"""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+class BaseExporter:
+    """Base class for all exporters
+
+    Rows are consumed in chunks of `chunk_size` so memory stays bounded by
+    the chunk, not by the number of results.
+    """
+
+    format_name = ''
+    extension = ''
+    description = ''
+
+    def __init__(self, columns: List[str] = None, chunk_size: int = None):
+        self.columns = columns or EXPORT_COLUMNS
+        self.chunk_size = chunk_size or Config.EXPORT_CHUNK_SIZE
+
+    def export(self, rows: Iterable[Dict], filename: str,
+               progress_callback: Callable[[int], None] = None,
+               cancel_event: threading.Event = None) -> int:
+        """Write rows to `filename` and return the number of rows written
+
+        `progress_callback` receives the running row count after each chunk.
+        Setting `cancel_event` stops the export between chunks and raises
+        ExportCancelled. Rows go to a temporary file next to `filename`
+        that replaces it only once complete, so a cancelled or failed export
+        never leaves a partial file behind.
+        """
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_filename = f"{filename}.part"
+        try:
+            written = self.write_file(rows, temp_filename, progress_callback, cancel_event)
+            os.replace(temp_filename, filename)
+        except BaseException:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+
+        logging.info(f"Exported {written} rows to {filename} as {self.format_name}")
+        return written
+
+    def write_file(self, rows: Iterable[Dict], filename: str,
+                   progress_callback: Callable[[int], None] = None,
+                   cancel_event: threading.Event = None) -> int:
+        """Write every row to `filename` in chunks; returns the number of rows written"""
+        written = 0
+        self.open(filename)
+        try:
+            for chunk in _chunks(rows, self.chunk_size):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ExportCancelled(f"Export to {filename} cancelled")
+                self.write_chunk(chunk)
+                written += len(chunk)
+                if progress_callback:
+                    progress_callback(written)
+        finally:
+            self.close()
+        return written
+
+    def export_results(self, db_manager, filename: str, task_id: str = None,
+                       progress_callback: Callable[[int], None] = None,
+                       cancel_event: threading.Event = None) -> int:
+        """Stream results from the database into `filename`"""
+        rows = db_manager.iter_results(task_id, projection=self.columns, batch_size=self.chunk_size)
+        return self.export(rows, filename, progress_callback, cancel_event)
+
+    def open(self, filename: str):
+        """Prepare the output file"""
+        raise NotImplementedError("Subclasses must implement the open method")
+
+    def write_chunk(self, chunk: List[Dict]):
+        """Write one chunk of rows"""
+        raise NotImplementedError("Subclasses must implement the write_chunk method")
+
+    def close(self):
+        """Finish and close the output file"""
+        raise NotImplementedError("Subclasses must implement the close method")
+
+class CsvExporter(BaseExporter):
+    """Streaming CSV exporter"""
+
+    format_name = 'csv'
+    extension = '.csv'
+    description = 'CSV files'
+
+    def open(self, filename: str):
+        self._file = open(filename, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    def write_chunk(self, chunk: List[Dict]):
+        self._writer.writerows(
+            [_text_value(row.get(column)) for column in self.columns] for row in chunk
+        )
+
+    def close(self):
+        self._file.close()
+
+class JsonlGzExporter(BaseExporter):
+    """Streaming gzip-compressed JSON Lines exporter"""
+
+    format_name = 'jsonl.gz'
+    extension = '.jsonl.gz'
+    description = 'Gzipped JSON Lines'
+
+    def open(self, filename: str):
+        self._file = gzip.open(filename, 'wt', encoding='utf-8')
+
+    def write_chunk(self, chunk: List[Dict]):
+        self._file.write(''.join(
+            json.dumps({column: row.get(column) for column in self.columns},
+                       default=_text_value, ensure_ascii=False) + '\n'
+            for row in chunk
+        ))
+
+    def close(self):
+        self._file.close()
+
+class ParquetExporter(BaseExporter):
+    """Columnar Parquet exporter writing one row group per chunk (requires pyarrow)"""
+
+    format_name = 'parquet'
+    extension = '.parquet'
+    description = 'Parquet files'
+
+    def open(self, filename: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+
+        self._pa = pa
+        self._schema = pa.schema([
+            (column, pa.timestamp('us') if column == 'scraped_at' else pa.string())
+            for column in self.columns
+        ])
+        self._writer = pq.ParquetWriter(filename, self._schema, compression='snappy')
+
+    def write_chunk(self, chunk: List[Dict]):
+        arrays = {}
+        for column in self.columns:
+            if column == 'scraped_at':
+                arrays[column] = [row.get(column) for row in chunk]
+            else:
+                arrays[column] = [_text_value(row.get(column)) for row in chunk]
+        self._writer.write_table(self._pa.Table.from_pydict(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+class ExcelExporter(BaseExporter):
+    """Streaming write-only Excel exporter"""
+
+    format_name = 'xlsx'
+    extension = '.xlsx'
+    description = 'Excel files'
+
+    def write_file(self, rows: Iterable[Dict], filename: str,
+                   progress_callback: Callable[[int], None] = None,
+                   cancel_event: threading.Event = None) -> int:
+        return export_rows_to_excel(rows, filename, self.columns,
+                                    progress_callback=progress_callback,
+                                    cancel_event=cancel_event,
+                                    progress_interval=self.chunk_size)
+
+class ExporterFactory:
+    """Factory class to create exporters by format"""
+
+    EXPORTERS = {
+        'xlsx': ExcelExporter,
+        'csv': CsvExporter,
+        'jsonl.gz': JsonlGzExporter,
+        'parquet': ParquetExporter
+    }
+
+    @staticmethod
+    def create_exporter(format_name: str, columns: List[str] = None, chunk_size: int = None) -> BaseExporter:
+        """Create an exporter instance based on format"""
+        if format_name not in ExporterFactory.EXPORTERS:
+            raise ValueError(f"Unknown export format: {format_name}")
+        return ExporterFactory.EXPORTERS[format_name](columns, chunk_size)
+
+    @staticmethod
+    def get_available_formats() -> List[str]:
+        """Get list of available export formats"""
+        return list(ExporterFactory.EXPORTERS)
+
+    @staticmethod
+    def format_for_filename(filename: str) -> str:
+        """Pick the export format matching a filename's extension"""
+        lowered = filename.lower()
+        # Longest extensions first so '.jsonl.gz' wins over shorter matches
+        for format_name, exporter in sorted(ExporterFactory.EXPORTERS.items(),
+                                            key=lambda item: -len(item[1].extension)):
+            if lowered.endswith(exporter.extension):
+                return format_name
+        raise ValueError(f"Unsupported export file type: {filename}")
@@ -0,0 +1,114 @@
+import threading
+import itertools
+import logging
+from typing import Dict, List
+from src.utils import ExportCancelled
+from .exporters import ExporterFactory
+
+class ExportJob:
+    """State of one background export"""
+
+    def __init__(self, job_id: int, format_name: str, filename: str, task_id: str = None):
+        self.job_id = job_id
+        self.format_name = format_name
+        self.filename = filename
+        self.task_id = task_id
+        self.status = 'Pending'  # Pending -> Running -> Completed | Failed | Cancelled
+        self.total = 0
+        self.written = 0
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.thread = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('Completed', 'Failed', 'Cancelled')
+
+class ExportJobManager:
+    """Runs exports on background threads so the UI thread never blocks
+
+    Jobs only update plain attributes from their worker threads; the UI polls
+    `get_jobs` from its own event loop to render progress.
+    """
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.jobs = {}  # job_id -> ExportJob
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def start_export(self, filename: str, task_id: str = None, format_name: str = None) -> ExportJob:
+        """Start exporting results to `filename` in a background thread"""
+        format_name = format_name or ExporterFactory.format_for_filename(filename)
+        exporter = ExporterFactory.create_exporter(format_name)
+
+        job = ExportJob(next(self._ids), format_name, filename, task_id)
+        with self._lock:
+            self.jobs[job.job_id] = job
+
+        job.thread = threading.Thread(target=self._run_job, args=(job, exporter), daemon=True)
+        job.thread.start()
+        logging.info(f"Started export job {job.job_id} to {filename}")
+        return job
+
+    def _run_job(self, job: ExportJob, exporter):
+        """Execute an export job"""
+        def on_progress(written: int):
+            job.written = written
+
+        try:
+            job.status = 'Running'
+            job.total = self.db_manager.count_results(job.task_id)
+            exporter.export_results(self.db_manager, job.filename, job.task_id,
+                                    on_progress, job.cancel_event)
+            job.status = 'Completed'
+            logging.info(f"Export job {job.job_id} completed: {job.written} rows")
+        except ExportCancelled:
+            job.status = 'Cancelled'
+            logging.info(f"Export job {job.job_id} cancelled")
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'Failed'
+            logging.error(f"Export job {job.job_id} failed: {e}")
+
+    def cancel(self, job_id: int) -> bool:
+        """Request cancellation of a running job"""
+        job = self.jobs.get(job_id)
+        if job and not job.finished:
+            job.cancel_event.set()
+            return True
+        return False
+
+    def cancel_all(self):
+        """Request cancellation of every running job"""
+        for job_id in list(self.jobs):
+            self.cancel(job_id)
+
+    def get_jobs(self) -> List[ExportJob]:
+        """Get all tracked jobs"""
+        with self._lock:
+            return list(self.jobs.values())
+
+    def get_active_jobs(self) -> List[ExportJob]:
+        """Get jobs that have not finished yet"""
+        return [job for job in self.get_jobs() if not job.finished]
+
+    def pop_finished_jobs(self) -> List[ExportJob]:
+        """Remove and return finished jobs"""
+        with self._lock:
+            finished = [job for job in self.jobs.values() if job.finished]
+            for job in finished:
+                del self.jobs[job.job_id]
+        return finished
+
+    def get_progress(self) -> Dict:
+        """Aggregate progress across active jobs"""
+        active = self.get_active_jobs()
+        total = sum(job.total for job in active)
+        written = sum(job.written for job in active)
+        return {
+            'active': len(active),
+            'total': total,
+            'written': written,
+            'percent': (written / total * 100) if total else 0.0
+        }
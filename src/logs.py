@@ -0,0 +1,188 @@
+"""
+Logging pipeline for the Lead Scraper Bot
+
+Worker threads only put records on a queue; a background listener formats
+them and writes to a size-rotated file (JSON lines) and the console. Records
+carry the id of the task whose thread logged them, and INFO/DEBUG messages
+are rate-limited per call site so per-lead lines cannot flood the log.
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from config.config import Config
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Task whose worker thread is logging; '' outside tasks
+current_task_id: ContextVar[str] = ContextVar('task_id', default='')
+
+@contextmanager
+def task_logging(task_id: str):
+    """Tag every record logged inside the block with `task_id`"""
+    token = current_task_id.set(task_id)
+    try:
+        yield
+    finally:
+        current_task_id.reset(token)
+
+class TaskContextFilter(logging.Filter):
+    """Adds `task_id` to records (unless passed explicitly via `extra`)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, 'task_id'):
+            record.task_id = current_task_id.get()
+        return True
+
+class RateLimitFilter(logging.Filter):
+    """Rate limit per call site for records below WARNING
+
+    Each call site may log `burst` records at once and `rate` per second
+    after that. The next record let through reports how many were dropped.
+    Each site keeps only the time its budget is next clear (the GCRA form
+    of a token bucket), so a check is one comparison and no refill math;
+    the message is never built for a dropped record.
+    """
+
+    def __init__(self, rate: float = None, burst: int = None):
+        super().__init__()
+        self.rate = Config.LOG_RATE_LIMIT if rate is None else rate
+        self.burst = burst or Config.LOG_RATE_BURST
+        self._interval = 1 / self.rate if self.rate > 0 else 0.0
+        # A record passes while the site's clear time is less than this far ahead
+        self._allowance = (self.burst - 1) * self._interval
+        self._lock = threading.Lock()
+        self._sites = {}  # (path, line) -> [time the budget is clear, suppressed]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate <= 0:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                site = self._sites[key] = [now, 0]
+            elif site[0] - now > self._allowance:
+                site[1] += 1
+                return False
+            site[0] = max(site[0], now) + self._interval
+            suppressed, site[1] = site[1], 0
+
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'task_id': getattr(record, 'task_id', '') or None,
+            'message': record.getMessage()
+        }
+        if getattr(record, 'suppressed', 0):
+            entry['suppressed'] = record.suppressed
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class TextFormatter(logging.Formatter):
+    """The classic console format, noting suppressed duplicates"""
+
+    def __init__(self):
+        super().__init__(TEXT_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        if getattr(record, 'suppressed', 0):
+            text += f" [{record.suppressed} similar messages suppressed]"
+        return text
+
+class FastQueueHandler(QueueHandler):
+    """QueueHandler that leaves all formatting to the listener thread
+
+    The stock handler formats the message in the logging thread; here the
+    producer only resolves %-args so the record is safe to hand over.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+_listener = None
+
+def setup_logging(log_file: str = None, level: str = None, file_format: str = None,
+                  console: bool = True) -> QueueListener:
+    """Route the root logger through a queue to the file and console handlers
+
+    Safe to call again; the previous pipeline is stopped first.
+    """
+    global _listener
+    stop_logging()
+
+    log_file = log_file or Config.LOG_FILE
+    file_format = file_format or Config.LOG_FILE_FORMAT
+    directory = os.path.dirname(log_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    file_handler = RotatingFileHandler(log_file, maxBytes=Config.LOG_MAX_BYTES,
+                                       backupCount=Config.LOG_BACKUP_COUNT, encoding='utf-8')
+    file_handler.setFormatter(JsonFormatter() if file_format == 'json' else TextFormatter())
+    handlers = [file_handler]
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(TextFormatter())
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = FastQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter())
+    queue_handler.addFilter(TaskContextFilter())
+
+    # Process fields are never logged; skip collecting them for every record
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(queue_handler)
+    root.setLevel((level or Config.LOG_LEVEL).upper())
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def stop_logging():
+    """Flush queued records and close the handlers"""
+    global _listener
+    if _listener is None:
+        return
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, FastQueueHandler):
+            root.removeHandler(handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+atexit.register(stop_logging)
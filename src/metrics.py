@@ -0,0 +1,298 @@
+"""
+Metrics for the Lead Scraper Bot
+
+Counters and latency histograms keyed by metric name and labels, exposed in
+Prometheus text format over a local HTTP endpoint and as a JSON snapshot file.
+"""
+
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from config.config import Config
+
+# Upper bounds in seconds; covers DOM lookups through slow page loads
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Label value used once a metric has reached its series limit
+OVERFLOW_LABEL = 'other'
+
+@lru_cache(maxsize=4096)
+def domain_of(url: str) -> str:
+    """Host part of a URL, used as the `domain` label"""
+    if not url:
+        return ''
+    if '://' not in url:
+        url = 'https://' + url
+    return (urlparse(url).hostname or '').lower()
+
+class Histogram:
+    """Cumulative-bucket latency histogram"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th observation"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'max': self.max
+        }
+
+class Timer:
+    """Context manager recording elapsed time into a histogram
+
+    `<name>_seconds` gets every duration; `<name>_errors_total` is also
+    incremented when the block raises.
+    """
+
+    __slots__ = ('registry', 'name', 'labels', 'start')
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, labels: Dict):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(f"{self.name}_seconds", time.perf_counter() - self.start, **self.labels)
+        if exc_type is not None:
+            self.registry.incr(f"{self.name}_errors_total", **self.labels)
+        return False
+
+class NullTimer:
+    """Timer used while metrics are disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+NULL_TIMER = NullTimer()
+
+class MetricsRegistry:
+    """Thread-safe store of counters and histograms
+
+    Recording is a dict lookup and an add under one lock, so it is cheap
+    enough for per-lead hot paths. Each metric keeps at most `max_series`
+    label sets; further `domain` values are folded into 'other' so that
+    per-website labels cannot grow without bound.
+    """
+
+    def __init__(self, namespace: str = 'lead_scraper', enabled: bool = None,
+                 max_series: int = None):
+        self.namespace = namespace
+        self.enabled = Config.METRICS_ENABLED if enabled is None else enabled
+        self.max_series = max_series or Config.METRICS_MAX_SERIES
+        self._lock = threading.Lock()
+        self._counters = {}  # name -> {label tuple: value}
+        self._histograms = {}  # name -> {label tuple: Histogram}
+
+    def _key(self, series: Dict, labels: Dict) -> tuple:
+        key = tuple(sorted(labels.items()))
+        if key not in series and len(series) >= self.max_series and 'domain' in labels:
+            key = tuple(sorted(dict(labels, domain=OVERFLOW_LABEL).items()))
+        return key
+
+    def incr(self, name: str, amount: float = 1, **labels):
+        """Add to a counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            key = self._key(series, labels)
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Record one duration in a histogram"""
+        if not self.enabled:
+            return
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            key = self._key(series, labels)
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(seconds)
+
+    def timer(self, name: str, **labels):
+        """Time a block: `with metrics.timer('stage', stage='page_load'): ...`"""
+        if not self.enabled:
+            return NULL_TIMER
+        return Timer(self, name, labels)
+
+    def reset(self):
+        """Drop every recorded value"""
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+
+    def snapshot(self) -> Dict:
+        """Counters and histogram summaries as plain JSON-serializable data"""
+        with self._lock:
+            counters = {
+                name: [dict(labels, value=value) for labels, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [dict(labels, **histogram.summary()) for labels, histogram in series.items()]
+                for name, series in self._histograms.items()
+            }
+        return {'timestamp': time.time(), 'counters': counters, 'histograms': histograms}
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full_name = f"{self.namespace}_{name}"
+                lines.append(f"# TYPE {full_name} counter")
+                for labels, value in series.items():
+                    lines.append(f"{full_name}{self._format_labels(labels)} {value}")
+
+            for name, series in sorted(self._histograms.items()):
+                full_name = f"{self.namespace}_{name}"
+                lines.append(f"# TYPE {full_name} histogram")
+                for labels, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                        cumulative += count
+                        bucket_labels = labels + (('le', str(bound)),)
+                        lines.append(f"{full_name}_bucket{self._format_labels(bucket_labels)} {cumulative}")
+                    lines.append(f"{full_name}_sum{self._format_labels(labels)} {histogram.sum}")
+                    lines.append(f"{full_name}_count{self._format_labels(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def _format_labels(self, labels: tuple) -> str:
+        if not labels:
+            return ''
+        pairs = []
+        for key, value in labels:
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            pairs.append(f'{key}="{value}"')
+        return '{' + ','.join(pairs) + '}'
+
+    def write_snapshot(self, path: str):
+        """Atomically write the JSON snapshot to `path`"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(temp_path, path)
+
+# Process-wide registry used by the scrapers, storage and task manager
+metrics = MetricsRegistry()
+
+class MetricsServer:
+    """Serves /metrics (Prometheus) and /metrics.json on localhost and
+    periodically writes the JSON snapshot file"""
+
+    def __init__(self, registry: MetricsRegistry = None, host: str = None, port: int = None,
+                 snapshot_path: str = None, snapshot_interval: float = None):
+        self.registry = registry or metrics
+        self.host = host or Config.METRICS_HOST
+        self.port = Config.METRICS_PORT if port is None else port
+        self.snapshot_path = snapshot_path or Config.METRICS_SNAPSHOT_PATH
+        self.snapshot_interval = snapshot_interval or Config.METRICS_SNAPSHOT_INTERVAL
+        self.httpd = None
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        """Start the HTTP endpoint (unless the port is 0) and the snapshot writer"""
+        if self.port:
+            # http.server costs ~25ms at import; only the endpoint needs it
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+            registry = self.registry
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path == '/metrics':
+                        body = registry.render_prometheus().encode()
+                        content_type = 'text/plain; version=0.0.4'
+                    elif self.path == '/metrics.json':
+                        body = json.dumps(registry.snapshot()).encode()
+                        content_type = 'application/json'
+                    else:
+                        self.send_error(404)
+                        return
+                    self.send_response(200)
+                    self.send_header('Content-Type', content_type)
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass  # keep scrapes out of the application log
+
+            try:
+                self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+                self.httpd.daemon_threads = True
+                self._spawn(self.httpd.serve_forever, "MetricsHTTP")
+                logging.info(f"Metrics endpoint at http://{self.host}:{self.port}/metrics")
+            except OSError as e:
+                logging.warning(f"Could not start metrics endpoint on port {self.port}: {e}")
+
+        self._spawn(self._snapshot_loop, "MetricsSnapshot")
+
+    def _spawn(self, target, name: str):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _snapshot_loop(self):
+        while not self._stop.wait(self.snapshot_interval):
+            self._write_snapshot()
+
+    def _write_snapshot(self):
+        try:
+            self.registry.write_snapshot(self.snapshot_path)
+        except OSError as e:
+            logging.warning(f"Could not write metrics snapshot: {e}")
+
+    def stop(self):
+        """Stop serving and write a final snapshot"""
+        self._stop.set()
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+        self._write_snapshot()
@@ -1,5 +1,18 @@
 # Scraper package
-from .scrapers import BaseScraper, GoogleMapsScraper, YelpScraper, ScraperFactory
+from .scrapers import BaseScraper, ScraperFactory
 from .task_manager import TaskManager
+from .progress import ProgressTracker, format_progress
 
-__all__ = ['BaseScraper', 'GoogleMapsScraper', 'YelpScraper', 'ScraperFactory', 'TaskManager']
+# Scraper backends pull in selenium/requests/bs4, so they load on first access
+_LAZY_SCRAPERS = {
+    'GoogleMapsScraper': '.google_maps',
+    'YelpScraper': '.yelp',
+}
+
+def __getattr__(name: str):
+    if name in _LAZY_SCRAPERS:
+        import importlib
+        return getattr(importlib.import_module(_LAZY_SCRAPERS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ['BaseScraper', 'GoogleMapsScraper', 'YelpScraper', 'ScraperFactory', 'TaskManager', 'ProgressTracker', 'format_progress']
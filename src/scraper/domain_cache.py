@@ -0,0 +1,236 @@
+import time
+import json
+import socket
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from config.config import Config
+from src.metrics import metrics, domain_of
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS domains (
+    domain TEXT PRIMARY KEY,
+    addresses TEXT,
+    dns_ok INTEGER,
+    resolved_at REAL,
+    reachable INTEGER,
+    checked_at REAL,
+    outcome TEXT
+);
+CREATE TABLE IF NOT EXISTS sites (
+    site TEXT PRIMARY KEY,
+    email TEXT,
+    email_at REAL,
+    outcome TEXT
+);
+"""
+
+TABLES = {
+    'domains': ('domain', ('addresses', 'dns_ok', 'resolved_at', 'reachable', 'checked_at', 'outcome')),
+    'sites': ('site', ('email', 'email_at', 'outcome')),
+}
+
+# Hosts serving many unrelated businesses' pages; their emails are never cached
+SHARED_HOSTS = ('facebook.com', 'instagram.com', 'twitter.com', 'x.com', 'linkedin.com',
+                'tiktok.com', 'youtube.com', 'yelp.com', 'google.com', 'linktr.ee')
+
+def site_of(url: str) -> str:
+    """Key emails are cached under: host plus first path segment, '' on shared hosts"""
+    host = domain_of(url)
+    if host.startswith('www.'):
+        host = host[4:]
+    if not host or any(host == shared or host.endswith('.' + shared) for shared in SHARED_HOSTS):
+        return ''
+    if '://' not in url:
+        url = 'https://' + url
+    segment = urlparse(url).path.strip('/').split('/', 1)[0].lower()
+    return f"{host}/{segment}" if segment else host
+
+class DomainCache:
+    """What we already know about business websites, persisted in SQLite
+
+    Per host it keeps the DNS resolution, whether the host was reachable
+    and the outcome of the last fetch. Emails are kept per site (see
+    `site_of`), so pages of different businesses on one host don't share
+    an answer; '' means the site had none. Each fact expires on its own
+    TTL, read from Config when checked, so chain stores and dead hosts
+    seen in earlier tasks or runs need no network I/O. The most recently
+    used `max_entries` records per table are kept in memory; every update
+    is written through to the file.
+    """
+
+    KINDS = ('email', 'dns')
+
+    def __init__(self, path: str = None, max_entries: int = None):
+        self.path = path or Config.DOMAIN_CACHE_PATH
+        self.max_entries = max_entries or Config.DOMAIN_CACHE_MEMORY_ENTRIES
+        self._conn = None
+        self._records: Dict[str, OrderedDict] = {table: OrderedDict() for table in TABLES}
+        self._lock = threading.Lock()
+        self._hits = {kind: 0 for kind in self.KINDS}
+        self._misses = {kind: 0 for kind in self.KINDS}
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened on first use, so creating a scraper never touches the disk
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # Losing the last few updates on a crash is fine for a cache
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _record(self, table: str, key: str) -> Dict:
+        """Cached record for a host or site (caller holds the lock)"""
+        records = self._records[table]
+        record = records.get(key)
+        if record is not None:
+            records.move_to_end(key)
+            return record
+        key_column, fields = TABLES[table]
+        row = self._connection().execute(
+            f"SELECT {', '.join(fields)} FROM {table} WHERE {key_column} = ?", (key,)
+        ).fetchone()
+        record = dict(zip(fields, row)) if row else dict.fromkeys(fields)
+        records[key] = record
+        if len(records) > self.max_entries:
+            records.popitem(last=False)
+        return record
+
+    def _save(self, table: str, key: str, record: Dict):
+        """Write a record through to the file (caller holds the lock)"""
+        key_column, fields = TABLES[table]
+        conn = self._connection()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {table} ({key_column}, {', '.join(fields)}) "
+            f"VALUES (?, {', '.join('?' * len(fields))})",
+            (key, *(record[field] for field in fields))
+        )
+        conn.commit()
+
+    def _count(self, kind: str, hit: bool):
+        (self._hits if hit else self._misses)[kind] += 1
+        metrics.incr('domain_cache_lookups_total', kind=kind, result='hit' if hit else 'miss')
+
+    @staticmethod
+    def _fresh(timestamp: Optional[float], ttl: float, now: float) -> bool:
+        return timestamp is not None and now - timestamp < ttl
+
+    def cached_email(self, url: str) -> Optional[str]:
+        """Email known for a website, '' if it is known to have none or be down, None if unknown"""
+        now = time.time()
+        site = site_of(url)
+        with self._lock:
+            if site:
+                record = self._record('sites', site)
+                if record['email'] is not None:
+                    ttl = Config.DOMAIN_CACHE_EMAIL_TTL if record['email'] else Config.DOMAIN_CACHE_NO_EMAIL_TTL
+                    if self._fresh(record['email_at'], ttl, now):
+                        self._count('email', True)
+                        return record['email']
+            host = self._record('domains', domain_of(url))
+            if host['reachable'] == 0 and self._fresh(host['checked_at'],
+                                                      Config.DOMAIN_CACHE_UNREACHABLE_TTL, now):
+                self._count('email', True)
+                return ""
+            self._count('email', False)
+            return None
+
+    def resolves(self, domain: str) -> bool:
+        """Whether a domain has DNS records, resolving it only when the cached answer expired"""
+        now = time.time()
+        with self._lock:
+            record = self._record('domains', domain)
+            if self._fresh(record['resolved_at'], Config.DOMAIN_CACHE_DNS_TTL, now):
+                self._count('dns', True)
+                return bool(record['dns_ok'])
+            self._count('dns', False)
+
+        # Resolve outside the lock; lookups can take seconds
+        try:
+            addresses = sorted({info[4][0] for info in socket.getaddrinfo(domain, None)})
+            dns_ok = True
+        except socket.gaierror as e:
+            if e.errno == socket.EAI_AGAIN:
+                # Temporary resolver failure: let the fetch find out, cache nothing
+                return True
+            addresses, dns_ok = [], False
+        except (OSError, UnicodeError):
+            return True
+
+        with self._lock:
+            record = self._record('domains', domain)
+            record.update(addresses=json.dumps(addresses), dns_ok=int(dns_ok), resolved_at=time.time())
+            if not dns_ok:
+                record.update(reachable=0, checked_at=record['resolved_at'], outcome='dns failure')
+            self._save('domains', domain, record)
+        return dns_ok
+
+    def record_email(self, url: str, email: str, outcome: str):
+        """Store the result of a completed lookup; '' means no email was found"""
+        now = time.time()
+        site = site_of(url)
+        with self._lock:
+            domain = domain_of(url)
+            host = self._record('domains', domain)
+            host.update(reachable=1, checked_at=now, outcome=outcome)
+            self._save('domains', domain, host)
+            if site:
+                record = self._record('sites', site)
+                record.update(email=email or '', email_at=now, outcome=outcome)
+                self._save('sites', site, record)
+
+    def record_unreachable(self, domain: str, outcome: str):
+        """Remember that a domain could not be fetched"""
+        now = time.time()
+        with self._lock:
+            record = self._record('domains', domain)
+            record.update(reachable=0, checked_at=now, outcome=outcome)
+            self._save('domains', domain, record)
+
+    def stats(self) -> Dict:
+        """Hits, misses and hit rate per kind of lookup since startup"""
+        with self._lock:
+            stats = {}
+            for kind in self.KINDS:
+                total = self._hits[kind] + self._misses[kind]
+                stats[kind] = {
+                    'hits': self._hits[kind],
+                    'misses': self._misses[kind],
+                    'hit_rate': self._hits[kind] / total if total else 0.0
+                }
+            stats['domains'] = len(self._records['domains'])
+            stats['sites'] = len(self._records['sites'])
+            return stats
+
+    def clear(self):
+        """Forget every domain and site, in memory and on disk"""
+        with self._lock:
+            conn = self._connection()
+            for table in TABLES:
+                self._records[table].clear()
+                conn.execute(f"DELETE FROM {table}")
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+_cache: Optional[DomainCache] = None
+_cache_lock = threading.Lock()
+
+def get_domain_cache() -> Optional[DomainCache]:
+    """Process-wide domain cache shared by all tasks, or None when disabled"""
+    global _cache
+    if not Config.DOMAIN_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = DomainCache()
+            logging.info(f"Using domain cache at {_cache.path}")
+        return _cache
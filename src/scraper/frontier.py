@@ -0,0 +1,89 @@
+import re
+import heapq
+from typing import List, Optional, Tuple
+from urllib.parse import urljoin, urlparse, urldefrag
+from config.config import Config
+
+# Candidate scores; mailto: links are read straight off the page and never queued
+CONTACT_SCORE = 3.0
+ABOUT_SCORE = 2.0
+# Pages only listed in the sitemap rank just below linked ones of the same kind
+SITEMAP_PENALTY = 0.5
+# An email on a page scoring at least this ends the crawl
+HIGH_CONFIDENCE_SCORE = CONTACT_SCORE - SITEMAP_PENALTY
+
+CONTACT_PATTERN = re.compile(r'contact|kontakt|get[-_ ]in[-_ ]touch|reach[-_ ]us', re.I)
+ABOUT_PATTERN = re.compile(r'about|team|impressum', re.I)
+SITEMAP_LOC_PATTERN = re.compile(r'<loc>\s*([^<\s]+)\s*</loc>', re.I)
+SKIPPED_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.zip', '.doc', '.docx', '.mp4')
+
+def score_link(url: str, text: str = '') -> float:
+    """How likely a link leads to contact details; 0 means not worth a fetch"""
+    path = urlparse(url).path
+    if CONTACT_PATTERN.search(path) or CONTACT_PATTERN.search(text):
+        return CONTACT_SCORE
+    if ABOUT_PATTERN.search(path) or ABOUT_PATTERN.search(text):
+        return ABOUT_SCORE
+    return 0.0
+
+def sitemap_urls(xml: str) -> List[str]:
+    """Page URLs listed in a sitemap document"""
+    return SITEMAP_LOC_PATTERN.findall(xml)
+
+def _site(host: str) -> str:
+    host = (host or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+class CrawlFrontier:
+    """Priority queue of candidate pages on one business website
+
+    Candidates are kept only if they are on the site's own host, score
+    above zero and are within `max_depth` links of the start page; the
+    best-scoring candidate is fetched next until `max_pages` requests
+    (the start page and sitemap included) have been spent.
+    """
+
+    def __init__(self, root_url: str, max_pages: int = None, max_depth: int = None):
+        self.root_url = root_url
+        self.site = _site(urlparse(root_url).hostname)
+        self.max_pages = max_pages or Config.CRAWL_MAX_PAGES
+        self.max_depth = Config.CRAWL_MAX_DEPTH if max_depth is None else max_depth
+        self.fetched = 0
+        self._heap = []  # (-score, order, url, depth)
+        self._seen = {urldefrag(root_url)[0]}
+        self._order = 0
+
+    def push(self, href: str, score: float, depth: int, base_url: str = None) -> bool:
+        """Queue a candidate; returns False if it was rejected or already seen"""
+        if score <= 0 or depth > self.max_depth:
+            return False
+        url = urldefrag(urljoin(base_url or self.root_url, href.strip()))[0]
+        parsed = urlparse(url)
+        if (parsed.scheme not in ('http', 'https') or _site(parsed.hostname) != self.site
+                or parsed.path.lower().endswith(SKIPPED_EXTENSIONS) or url in self._seen):
+            return False
+        self._seen.add(url)
+        self._order += 1
+        heapq.heappush(self._heap, (-score, self._order, url, depth))
+        return True
+
+    def pop(self) -> Optional[Tuple[str, float, int]]:
+        """Best candidate as (url, score, depth), or None when empty or out of budget"""
+        if not self._heap or not self.has_budget():
+            return None
+        score, _, url, depth = heapq.heappop(self._heap)
+        return url, -score, depth
+
+    def best_score(self) -> float:
+        """Score of the next candidate, 0 if there is none"""
+        return -self._heap[0][0] if self._heap else 0.0
+
+    def has_budget(self) -> bool:
+        return self.fetched < self.max_pages
+
+    def record_fetch(self):
+        """Count one request against the page budget"""
+        self.fetched += 1
+
+    def __len__(self) -> int:
+        return len(self._heap)
@@ -0,0 +1,172 @@
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+import time
+import logging
+from typing import List, Dict
+from config.config import Config
+from src.metrics import domain_of
+from .scrapers import BaseScraper
+from .resilience import call_with_retry
+
+class GoogleMapsScraper(BaseScraper):
+    """Scraper for Google Maps using Selenium"""
+    
+    name = "google_maps"
+    base_url = "https://www.google.com/maps"
+    
+    def __init__(self):
+        super().__init__()
+        self.driver = None
+        self.setup_driver()
+    
+    def setup_driver(self):
+        """Setup Chrome driver with options"""
+        try:
+            chrome_options = Options()
+            if Config.SELENIUM_HEADLESS:
+                chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument("--disable-gpu")
+            chrome_options.add_argument("--window-size=1920,1080")
+            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+            
+            self.driver = webdriver.Chrome(options=chrome_options)
+            logging.info("Chrome driver setup successfully")
+        except Exception as e:
+            logging.error(f"Failed to setup Chrome driver: {e}")
+            raise
+    
+    def scrape(self, keyword: str, location: str) -> List[Dict]:
+        """Scrape Google Maps for businesses"""
+        results = []
+        
+        try:
+            # Construct search URL
+            search_query = f"{keyword} in {location}"
+            url = f"https://www.google.com/maps/search/{search_query.replace(' ', '+')}"
+            
+            logging.info(f"Scraping Google Maps for: {search_query}")
+            with self.timed('page_load'):
+                # Navigation errors and load timeouts are retried with backoff
+                call_with_retry(lambda: self.load_page(url), domain_of(url), operation='navigation',
+                                retry_on=(WebDriverException,))
+            
+            time.sleep(3)  # Additional wait for content to load
+            
+            # Find business listings
+            business_elements = self.driver.find_elements(By.CSS_SELECTOR, '[data-result-index]')
+            business_elements = business_elements[:self.max_results]
+            self.report_progress('harvested', len(business_elements))
+            self.report_expected(len(business_elements))
+            
+            for i, element in enumerate(business_elements):
+                try:
+                    # Click on the business to get more details
+                    with self.timed('click'):
+                        element.click()
+                    time.sleep(self.delay)
+                    
+                    # Extract business information
+                    with self.timed('extract'):
+                        business_info = self.extract_business_info()
+                    if business_info:
+                        # Try to get email from website if available
+                        if business_info.get('website'):
+                            website = business_info['website']
+                            with self.timed('email_lookup', website):
+                                business_info['email'] = self.scrape_email_from_website(website)
+                            self.report_progress('enriched')
+                        
+                        results.append(business_info)
+                        self.report_progress('extracted')
+                        logging.info(f"Scraped business: {business_info.get('name', 'Unknown')}")
+                    
+                except Exception as e:
+                    logging.warning(f"Error scraping business {i}: {e}")
+                    continue
+            
+            logging.info(f"Scraped {len(results)} businesses from Google Maps")
+            
+        except Exception as e:
+            logging.error(f"Error during Google Maps scraping: {e}")
+            raise
+        
+        return results
+    
+    def load_page(self, url: str):
+        """Open a URL and wait for the results pane"""
+        self.driver.get(url)
+        WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, '[role="main"]'))
+        )
+    
+    def extract_business_info(self) -> Dict:
+        """Extract business information from the current page"""
+        try:
+            business_info = {}
+            
+            # Business name
+            try:
+                name_element = self.driver.find_element(By.CSS_SELECTOR, 'h1[data-attrid="title"]')
+                business_info['name'] = self.clean_text(name_element.text)
+            except:
+                try:
+                    name_element = self.driver.find_element(By.CSS_SELECTOR, '[data-section-id="overview"] h1')
+                    business_info['name'] = self.clean_text(name_element.text)
+                except:
+                    business_info['name'] = "Unknown"
+            
+            # Address
+            try:
+                address_element = self.driver.find_element(By.CSS_SELECTOR, '[data-item-id="address"]')
+                business_info['address'] = self.clean_text(address_element.text)
+            except:
+                business_info['address'] = ""
+            
+            # Phone number
+            try:
+                phone_element = self.driver.find_element(By.CSS_SELECTOR, '[data-item-id="phone:tel:"]')
+                business_info['phone'] = self.clean_text(phone_element.text)
+            except:
+                business_info['phone'] = ""
+            
+            # Website
+            try:
+                website_element = self.driver.find_element(By.CSS_SELECTOR, '[data-item-id="authority"]')
+                business_info['website'] = self.clean_text(website_element.get_attribute('href'))
+            except:
+                business_info['website'] = ""
+            
+            # Filled in from the website by the caller
+            business_info['email'] = ""
+            
+            # Rating
+            try:
+                rating_element = self.driver.find_element(By.CSS_SELECTOR, '[data-value="Formatted rating"]')
+                business_info['rating'] = self.clean_text(rating_element.text)
+            except:
+                business_info['rating'] = ""
+            
+            # Category
+            try:
+                category_element = self.driver.find_element(By.CSS_SELECTOR, '[data-section-id="overview"] button[jsaction*="category"]')
+                business_info['category'] = self.clean_text(category_element.text)
+            except:
+                business_info['category'] = ""
+            
+            return business_info
+            
+        except Exception as e:
+            logging.error(f"Error extracting business info: {e}")
+            return {}
+    
+    def close(self):
+        """Close the browser driver"""
+        if self.driver:
+            self.driver.quit()
+            logging.info("Browser driver closed")
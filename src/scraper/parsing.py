@@ -0,0 +1,142 @@
+import logging
+from typing import Any, Dict, List, Optional
+from config.config import Config
+
+class BaseParser:
+    """HTML parser backend used by the scrapers
+
+    Scrapers only parse documents and run CSS selectors against them, so
+    backends are interchangeable; nodes are the backend's own objects and
+    are passed back to `text`/`attr`. Selectors are compiled once per
+    parser and reused for every page.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self._compiled: Dict[str, Any] = {}
+
+    def parse(self, markup) -> Any:
+        """Parse a page (str or bytes) into a document node"""
+        raise NotImplementedError
+
+    def compile(self, selector: str) -> Any:
+        """Backend form of a CSS selector"""
+        return selector
+
+    def _selector(self, selector: str) -> Any:
+        compiled = self._compiled.get(selector)
+        if compiled is None:
+            compiled = self._compiled[selector] = self.compile(selector)
+        return compiled
+
+    def select(self, node, selector: str) -> List:
+        """All descendants of `node` matching `selector`, in document order"""
+        raise NotImplementedError
+
+    def select_one(self, node, selector: str) -> Optional[Any]:
+        """First descendant matching `selector`, or None"""
+        matches = self.select(node, selector)
+        return matches[0] if matches else None
+
+    def text(self, node) -> str:
+        """Text content of a node and its descendants"""
+        raise NotImplementedError
+
+    def attr(self, node, name: str) -> Optional[str]:
+        """Attribute value, or None if absent"""
+        raise NotImplementedError
+
+class SoupParser(BaseParser):
+    """BeautifulSoup with a configurable tree builder and precompiled soupsieve selectors"""
+
+    def __init__(self, features: str = 'html.parser'):
+        super().__init__()
+        from bs4 import BeautifulSoup
+        import soupsieve
+        self._soup = BeautifulSoup
+        self._soupsieve = soupsieve
+        self.features = features
+        self.name = 'bs4' if features == 'html.parser' else f'bs4-{features}'
+
+    def parse(self, markup):
+        return self._soup(markup, self.features)
+
+    def compile(self, selector: str):
+        return self._soupsieve.compile(selector)
+
+    def select(self, node, selector: str) -> List:
+        return self._selector(selector).select(node)
+
+    def select_one(self, node, selector: str):
+        return self._selector(selector).select_one(node)
+
+    def text(self, node) -> str:
+        return node.get_text()
+
+    def attr(self, node, name: str) -> Optional[str]:
+        value = node.get(name)
+        # Multi-valued attributes such as class come back as lists
+        return ' '.join(value) if isinstance(value, list) else value
+
+class SelectolaxParser(BaseParser):
+    """selectolax (lexbor): C parser and selector engine, much faster than bs4"""
+
+    name = "selectolax"
+
+    def __init__(self):
+        super().__init__()
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def parse(self, markup):
+        return self._parser(markup)
+
+    def select(self, node, selector: str) -> List:
+        return node.css(selector)
+
+    def select_one(self, node, selector: str):
+        return node.css_first(selector)
+
+    def text(self, node) -> str:
+        return node.text(deep=True)
+
+    def attr(self, node, name: str) -> Optional[str]:
+        return node.attributes.get(name)
+
+class ParserFactory:
+    """Factory class to create the configured HTML parser"""
+
+    @staticmethod
+    def create_parser(parser_type: str = None) -> BaseParser:
+        """Create a parser; 'auto' picks the fastest installed backend"""
+        parser_type = (parser_type or Config.HTML_PARSER).lower()
+
+        if parser_type == "auto":
+            for candidate in ("selectolax", "lxml"):
+                try:
+                    return ParserFactory.create_parser(candidate)
+                except ImportError:
+                    continue
+            return SoupParser()
+        elif parser_type == "selectolax":
+            return SelectolaxParser()
+        elif parser_type == "lxml":
+            import lxml  # fail here rather than on the first page
+            return SoupParser('lxml')
+        elif parser_type in ("bs4", "html.parser"):
+            return SoupParser()
+        else:
+            raise ValueError(f"Unknown HTML parser: {parser_type}")
+
+    @staticmethod
+    def get_available_parsers() -> List[str]:
+        """Parser types whose libraries are installed"""
+        available = []
+        for parser_type in ("selectolax", "lxml", "bs4"):
+            try:
+                ParserFactory.create_parser(parser_type)
+                available.append(parser_type)
+            except ImportError:
+                logging.debug(f"HTML parser {parser_type} is not installed")
+        return available
@@ -0,0 +1,190 @@
+import os
+import io
+import sys
+import time
+import pstats
+import cProfile
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Tuple
+from config.config import Config
+
+# Source path fragments used to attribute profile time to a code area
+PROFILE_CATEGORIES = [
+    ('parsing', ('bs4', 'html/parser', 'lxml', 'soupsieve', 'html5lib')),
+    ('regex', ('/re/', '/re.py', 'sre_', '_sre', 're.Pattern', 're.Match')),
+    ('selenium', ('selenium',)),
+    ('database', ('pymongo', 'bson', 'sqlite3', 'src/database')),
+    ('network', ('requests', 'urllib3', 'http/client', 'socket', 'ssl')),
+    ('json', ('json',)),
+]
+
+# Threads doing work on a task's behalf, by name prefix; they are shared with any
+# other task running at the same time
+WORKER_THREAD_PREFIXES = ('BufferedWriter', 'YelpDetail')
+# A worker whose innermost frame is here is waiting for work, not doing any
+IDLE_FRAME_FILES = ('threading.py', 'concurrent/futures/thread.py', 'queue.py')
+
+def categorize(location: str) -> str:
+    """Map a source file (plus function name, for builtins) to a PROFILE_CATEGORIES entry"""
+    location = location.replace('\\', '/')
+    for category, fragments in PROFILE_CATEGORIES:
+        if any(fragment in location for fragment in fragments):
+            return category
+    return 'other'
+
+class TaskProfiler:
+    """Profiles one task and saves the artifacts
+
+    'cprofile' mode is deterministic: every call in the task's thread is
+    counted and a pstats `.prof` file is written; the storage writer and
+    detail page pool threads are not covered. 'sampling' mode samples the
+    stacks of the task's thread and of those worker threads (when busy)
+    every `sample_interval` seconds from a helper thread, adding almost no
+    overhead to the task, and writes collapsed stacks (`.folded`, the flame
+    graph input format) rooted at the thread name. Both write a `.txt`
+    summary with time per code area and the top-N functions.
+    """
+
+    MODES = ['cprofile', 'sampling']
+
+    def __init__(self, task_id: str, mode: str = None, output_dir: str = None,
+                 top_n: int = None, sample_interval: float = None):
+        self.task_id = task_id
+        self.mode = mode or Config.PROFILE_MODE
+        if self.mode not in self.MODES:
+            raise ValueError(f"Unknown profile mode: {self.mode}")
+        self.output_dir = output_dir or Config.PROFILE_DIR
+        self.top_n = top_n or Config.PROFILE_TOP_N
+        self.sample_interval = sample_interval or Config.PROFILE_SAMPLE_INTERVAL
+
+        self.profile = None
+        self.samples = Counter()  # collapsed stack -> samples
+        self._thread_id = None
+        self._sampler = None
+        self._stop = threading.Event()
+        self.started_at = None
+        self.elapsed = 0.0
+
+    def start(self):
+        """Start profiling the calling thread"""
+        self.started_at = time.perf_counter()
+        self._thread_id = threading.get_ident()
+        if self.mode == 'cprofile':
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            self._sampler = threading.Thread(target=self._sample, name=f"Profiler-{self.task_id}",
+                                             daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        """Stop profiling"""
+        self.elapsed = time.perf_counter() - self.started_at
+        if self.profile:
+            self.profile.disable()
+        if self._sampler:
+            self._stop.set()
+            self._sampler.join()
+
+    def _sample(self):
+        while not self._stop.wait(self.sample_interval):
+            workers = {thread.ident: thread.name.split('_')[0] for thread in threading.enumerate()
+                       if thread.name.startswith(WORKER_THREAD_PREFIXES)}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self._thread_id:
+                    root = 'task'
+                elif thread_id in workers:
+                    if frame.f_code.co_filename.replace('\\', '/').endswith(IDLE_FRAME_FILES):
+                        continue
+                    root = workers[thread_id]
+                else:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(root)
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def save(self) -> Tuple[str, str]:
+        """Write the profile artifact and summary; returns their paths"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base = os.path.join(self.output_dir, f"task_{self.task_id}_{timestamp}")
+
+        if self.mode == 'cprofile':
+            profile_path = f"{base}.prof"
+            self.profile.dump_stats(profile_path)
+            summary = self._cprofile_summary()
+        else:
+            profile_path = f"{base}.folded"
+            with open(profile_path, 'w') as f:
+                for stack, count in self.samples.most_common():
+                    f.write(f"{stack} {count}\n")
+            summary = self._sampling_summary()
+
+        summary_path = f"{base}.txt"
+        with open(summary_path, 'w') as f:
+            f.write(summary)
+
+        logging.info(f"Saved {self.mode} profile of task {self.task_id} to {profile_path}")
+        return profile_path, summary_path
+
+    def _header(self, unit: str, categories: Dict[str, float]) -> List[str]:
+        total = sum(categories.values()) or 1
+        lines = [
+            f"Task {self.task_id} - {self.mode} profile",
+            f"Wall time: {self.elapsed:.2f}s",
+            "Threads: task thread only" if self.mode == 'cprofile' else
+            f"Threads: task thread and busy {', '.join(WORKER_THREAD_PREFIXES)} threads "
+            "(shared with tasks running at the same time)",
+            "",
+            f"Time by area ({unit}, own time):"
+        ]
+        for category, value in sorted(categories.items(), key=lambda item: -item[1]):
+            lines.append(f"  {category:<10} {value:>10.3f}  {value / total:6.1%}")
+        lines.append("")
+        return lines
+
+    def _cprofile_summary(self) -> str:
+        stats = pstats.Stats(self.profile)
+        categories = Counter()
+        for (filename, _, function), (_, _, tottime, _, _) in stats.stats.items():
+            categories[categorize(f"{filename}:{function}")] += tottime
+
+        output = io.StringIO()
+        stats.stream = output
+        stats.sort_stats('cumulative').print_stats(self.top_n)
+        stats.sort_stats('tottime').print_stats(self.top_n)
+        return '\n'.join(self._header('seconds', categories)) + output.getvalue()
+
+    def _sampling_summary(self) -> str:
+        own = Counter()
+        inclusive = Counter()
+        categories = Counter()
+        threads = Counter()
+        for stack, count in self.samples.items():
+            frames = stack.split(';')
+            threads[frames[0]] += count
+            own[frames[-1]] += count
+            categories[categorize(frames[-1])] += count * self.sample_interval
+            for frame in set(frames[1:]):
+                inclusive[frame] += count
+
+        lines = self._header('seconds, estimated', categories)
+        total = sum(self.samples.values()) or 1
+        lines.append("Samples by thread:")
+        for thread, count in threads.most_common():
+            lines.append(f"  {count:>7} {count / total:6.1%}  {thread}")
+        lines.append("")
+        for title, counter in (("Top functions by own samples:", own),
+                               ("Top functions by inclusive samples:", inclusive)):
+            lines.append(title)
+            for frame, count in counter.most_common(self.top_n):
+                lines.append(f"  {count:>7} {count / total:6.1%}  {frame}")
+            lines.append("")
+        return '\n'.join(lines)
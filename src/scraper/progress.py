@@ -0,0 +1,91 @@
+import time
+import threading
+from typing import Callable, Dict
+from config.config import Config
+
+class ProgressTracker:
+    """Per-task progress counters, cheap enough to update once per lead
+
+    `incr` is a counter add and a clock read; a snapshot is only built and
+    emitted when at least `min_interval` seconds have passed since the last
+    one, so the event rate is bounded no matter how fast leads arrive.
+    """
+
+    STAGES = ('harvested', 'extracted', 'enriched', 'persisted')
+
+    def __init__(self, task_id: str, emit: Callable[[Dict], None] = None,
+                 min_interval: float = None):
+        self.task_id = task_id
+        self.emit = emit
+        self.min_interval = Config.PROGRESS_INTERVAL if min_interval is None else min_interval
+        self.counts = dict.fromkeys(self.STAGES, 0)
+        self.expected = 0
+        self.started_at = time.monotonic()
+        self._last_emit = 0.0
+        self._lock = threading.Lock()  # enrichment workers count concurrently
+
+    def set_expected(self, total: int):
+        """Record how many leads the task expects to extract"""
+        self.expected = total
+        self.emit_now()
+
+    def incr(self, stage: str, amount: int = 1):
+        """Count progress for a stage and emit if the interval has elapsed"""
+        with self._lock:
+            self.counts[stage] += amount
+        if self.emit and time.monotonic() - self._last_emit >= self.min_interval:
+            self.emit_now()
+
+    def finish(self, stage: str, amount: int = 0):
+        """Count the final step for a stage and always emit the last snapshot"""
+        with self._lock:
+            self.counts[stage] += amount
+        self.emit_now()
+
+    def emit_now(self):
+        """Emit a snapshot immediately"""
+        self._last_emit = time.monotonic()
+        if self.emit:
+            self.emit(self.snapshot())
+
+    def snapshot(self) -> Dict:
+        """Current counts plus throughput and ETA"""
+        elapsed = time.monotonic() - self.started_at
+        extracted = self.counts['extracted']
+        rate = extracted / elapsed * 60 if elapsed > 0 else 0.0
+
+        eta = None
+        if self.expected and rate > 0:
+            eta = max(self.expected - extracted, 0) / rate * 60
+
+        snapshot = dict(self.counts)
+        snapshot.update({
+            'expected': self.expected,
+            'elapsed_seconds': elapsed,
+            'leads_per_min': rate,
+            'eta_seconds': eta
+        })
+        return snapshot
+
+# How each stage is named in the task list
+STAGE_LABELS = {'harvested': 'harvested', 'extracted': 'extracted',
+                'enriched': 'enriched', 'persisted': 'saved'}
+
+def format_progress(progress: Dict) -> str:
+    """Short human-readable progress text for the task list"""
+    if not progress:
+        return ''
+
+    parts = []
+    for stage in ProgressTracker.STAGES:
+        text = f"{STAGE_LABELS[stage]} {progress.get(stage, 0)}"
+        if stage == 'extracted' and progress.get('expected'):
+            text += f"/{progress['expected']}"
+        parts.append(text)
+    parts.append(f"{progress['leads_per_min']:.1f}/min")
+
+    eta = progress.get('eta_seconds')
+    if eta is not None:
+        minutes, seconds = divmod(int(eta), 60)
+        parts.append(f"ETA {minutes}m{seconds:02d}s")
+    return ' · '.join(parts)
@@ -0,0 +1,44 @@
+import time
+import threading
+from typing import Dict
+
+class RateLimiter:
+    """Blocking token bucket shared by every thread that calls `acquire`
+
+    Allows `burst` calls at once and `rate` calls per second on average;
+    a rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait until a call is allowed"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            # Sleep outside the lock so other threads can refill and check
+            time.sleep(wait)
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(name: str, rate: float, burst: int = 1) -> RateLimiter:
+    """Process-wide limiter for `name` (e.g. a domain), so concurrent tasks share it"""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None or limiter.rate != rate or limiter.burst != max(1, burst):
+            limiter = _limiters[name] = RateLimiter(rate, burst)
+        return limiter
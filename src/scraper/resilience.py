@@ -0,0 +1,133 @@
+import time
+import random
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+from config.config import Config
+from src.metrics import metrics
+
+# Responses worth another attempt: throttling and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a domain whose circuit breaker is open"""
+
+    def __init__(self, domain: str, retry_in: float):
+        super().__init__(f"Circuit open for {domain}; retrying in {retry_in:.0f}s")
+        self.domain = domain
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    """Per-domain breaker: fail fast once a host keeps failing
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls are refused for `reset_timeout` seconds. Then a single trial call
+    is let through (half-open); its success closes the circuit, its failure
+    opens it again. A trial that reports neither frees its slot after
+    another `reset_timeout`.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, domain: str, failure_threshold: int = None, reset_timeout: float = None):
+        self.domain = domain
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = Config.CIRCUIT_RESET_TIMEOUT if reset_timeout is None else reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Raise CircuitOpenError unless a call may go ahead"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            now = time.monotonic()
+            retry_in = self._opened_at + self.reset_timeout - now
+            if retry_in <= 0:
+                # Let one trial call through per period; everyone else keeps failing fast
+                self.state = self.HALF_OPEN
+                self._opened_at = now
+                return
+        metrics.incr('circuit_short_circuits_total', domain=self.domain)
+        raise CircuitOpenError(self.domain, max(0.0, retry_in))
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED
+                                                and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                tripped = True
+            else:
+                tripped = False
+        if tripped:
+            metrics.incr('circuit_opened_total', domain=self.domain)
+            logging.warning(f"Circuit opened for {self.domain} after {self.failures} failures")
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(domain: str) -> CircuitBreaker:
+    """Process-wide breaker for `domain`, shared by all tasks"""
+    with _breakers_lock:
+        breaker = _breakers.get(domain)
+        if breaker is None:
+            breaker = _breakers[domain] = CircuitBreaker(domain)
+        return breaker
+
+def reset_circuit_breakers():
+    """Forget every breaker's state"""
+    with _breakers_lock:
+        _breakers.clear()
+
+def backoff_delay(attempt: int, base_delay: float = None, max_delay: float = None) -> float:
+    """Full-jitter exponential backoff before retry number `attempt` (1-based)"""
+    base_delay = Config.RETRY_BASE_DELAY if base_delay is None else base_delay
+    max_delay = Config.RETRY_MAX_DELAY if max_delay is None else max_delay
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+def call_with_retry(func: Callable[[], Any], domain: str, operation: str = 'http',
+                    retry_on: Tuple[Type[BaseException], ...] = (),
+                    retry_result: Optional[Callable[[Any], bool]] = None,
+                    attempts: int = None) -> Any:
+    """Call `func` behind `domain`'s circuit breaker, retrying transient failures
+
+    Exceptions in `retry_on`, and results for which `retry_result` is true,
+    count as failures and are retried with jittered exponential backoff up
+    to `attempts` calls in total. The last failing result is returned, or
+    the last exception re-raised; other exceptions propagate at once.
+    Raises CircuitOpenError without calling `func` while the circuit is open.
+    """
+    attempts = max(1, attempts or Config.RETRY_ATTEMPTS)
+    breaker = get_circuit_breaker(domain)
+
+    for attempt in range(1, attempts + 1):
+        breaker.allow()
+        try:
+            result = func()
+        except retry_on as e:
+            breaker.record_failure()
+            if attempt == attempts:
+                metrics.incr('retries_exhausted_total', operation=operation, domain=domain)
+                raise
+            logging.debug(f"Retrying {operation} on {domain} after {type(e).__name__}: {e}")
+        else:
+            if retry_result is None or not retry_result(result):
+                breaker.record_success()
+                return result
+            breaker.record_failure()
+            if attempt == attempts:
+                metrics.incr('retries_exhausted_total', operation=operation, domain=domain)
+                return result
+            logging.debug(f"Retrying {operation} on {domain} after an unsuccessful response")
+
+        metrics.incr('retries_total', operation=operation, domain=domain)
+        time.sleep(backoff_delay(attempt))
@@ -1,25 +1,43 @@
-import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-import time
 import re
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urljoin, unquote
 from config.config import Config
-import googlemaps
+from src.metrics import metrics, domain_of
+from .parsing import ParserFactory
+from .resilience import RETRY_STATUSES, CircuitOpenError, call_with_retry
+from .domain_cache import get_domain_cache
+from .frontier import CrawlFrontier, HIGH_CONFIDENCE_SCORE, SITEMAP_PENALTY, score_link, sitemap_urls
 
 class BaseScraper:
     """Base class for all scrapers"""
     
+    name = "base"
+    base_url = ""
+    
     def __init__(self):
         self.results = []
         self.delay = Config.SCRAPING_DELAY
         self.max_results = Config.MAX_RESULTS_PER_TASK
+        self.progress = None  # ProgressTracker attached by the TaskManager
+        self.session = None  # optional requests.Session for connection reuse
+        self.parser = ParserFactory.create_parser()
+        self.domain_cache = get_domain_cache()  # shared by all scrapers; None when disabled
+    
+    def report_progress(self, stage: str, amount: int = 1):
+        """Count progress for a stage if a tracker is attached"""
+        if self.progress:
+            self.progress.incr(stage, amount)
+    
+    def report_expected(self, total: int):
+        """Report how many leads this scrape expects to extract"""
+        if self.progress:
+            self.progress.set_expected(total)
+    
+    def timed(self, stage: str, url: str = None):
+        """Time a scraping stage, labelled with this scraper and the target domain"""
+        return metrics.timer('scraper_stage', stage=stage, scraper=self.name,
+                             domain=domain_of(url or self.base_url))
     
     def clean_text(self, text: str) -> str:
         """Clean and normalize text"""
@@ -36,275 +54,142 @@ class BaseScraper:
         emails = re.findall(email_pattern, text)
         return emails[0] if emails else ""
     
-    def scrape(self, keyword: str, location: str) -> List[Dict]:
-        """Abstract method to be implemented by subclasses"""
-        raise NotImplementedError("Subclasses must implement the scrape method")
-
-class GoogleMapsScraper(BaseScraper):
-    """Scraper for Google Maps using Selenium"""
-    
-    def __init__(self):
-        super().__init__()
-        self.driver = None
-        self.setup_driver()
-    
-    def setup_driver(self):
-        """Setup Chrome driver with options"""
-        try:
-            chrome_options = Options()
-            if Config.SELENIUM_HEADLESS:
-                chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-            
-            self.driver = webdriver.Chrome(options=chrome_options)
-            logging.info("Chrome driver setup successfully")
-        except Exception as e:
-            logging.error(f"Failed to setup Chrome driver: {e}")
-            raise
+    def fetch(self, url: str, timeout: float = 10, **kwargs):
+        """GET a URL with retries on transient errors, behind its domain's circuit breaker
+        
+        Raises CircuitOpenError when the domain is failing fast, and the
+        requests exception once retries are exhausted.
+        """
+        # Imported here so that importing the scraper base stays cheap
+        import requests
+        http = self.session or requests
+        return call_with_retry(lambda: http.get(url, timeout=timeout, **kwargs), domain_of(url),
+                               retry_on=(requests.ConnectionError, requests.Timeout),
+                               retry_result=lambda response: response.status_code in RETRY_STATUSES)
     
-    def scrape(self, keyword: str, location: str) -> List[Dict]:
-        """Scrape Google Maps for businesses"""
-        results = []
+    def scrape_email_from_website(self, website_url: str) -> str:
+        """Try to scrape email from business website, consulting the domain cache first"""
+        import requests
         
-        try:
-            # Construct search URL
-            search_query = f"{keyword} in {location}"
-            url = f"https://www.google.com/maps/search/{search_query.replace(' ', '+')}"
-            
-            logging.info(f"Scraping Google Maps for: {search_query}")
-            self.driver.get(url)
-            
-            # Wait for results to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '[role="main"]'))
-            )
-            
-            time.sleep(3)  # Additional wait for content to load
-            
-            # Find business listings
-            business_elements = self.driver.find_elements(By.CSS_SELECTOR, '[data-result-index]')
-            
-            for i, element in enumerate(business_elements[:self.max_results]):
-                try:
-                    # Click on the business to get more details
-                    element.click()
-                    time.sleep(self.delay)
-                    
-                    # Extract business information
-                    business_info = self.extract_business_info()
-                    if business_info:
-                        results.append(business_info)
-                        logging.info(f"Scraped business: {business_info.get('name', 'Unknown')}")
-                    
-                except Exception as e:
-                    logging.warning(f"Error scraping business {i}: {e}")
-                    continue
-            
-            logging.info(f"Scraped {len(results)} businesses from Google Maps")
-            
-        except Exception as e:
-            logging.error(f"Error during Google Maps scraping: {e}")
-            raise
+        if not website_url.startswith(('http://', 'https://')):
+            website_url = 'https://' + website_url
+        domain = domain_of(website_url)
+        
+        # Known emails, sites without one and dead hosts need no network I/O
+        cache = self.domain_cache
+        if cache:
+            email = cache.cached_email(website_url)
+            if email is not None:
+                return email
+            if not cache.resolves(domain):
+                return ""
         
-        return results
-    
-    def extract_business_info(self) -> Dict:
-        """Extract business information from the current page"""
         try:
-            business_info = {}
-            
-            # Business name
-            try:
-                name_element = self.driver.find_element(By.CSS_SELECTOR, 'h1[data-attrid="title"]')
-                business_info['name'] = self.clean_text(name_element.text)
-            except:
-                try:
-                    name_element = self.driver.find_element(By.CSS_SELECTOR, '[data-section-id="overview"] h1')
-                    business_info['name'] = self.clean_text(name_element.text)
-                except:
-                    business_info['name'] = "Unknown"
-            
-            # Address
-            try:
-                address_element = self.driver.find_element(By.CSS_SELECTOR, '[data-item-id="address"]')
-                business_info['address'] = self.clean_text(address_element.text)
-            except:
-                business_info['address'] = ""
-            
-            # Phone number
-            try:
-                phone_element = self.driver.find_element(By.CSS_SELECTOR, '[data-item-id="phone:tel:"]')
-                business_info['phone'] = self.clean_text(phone_element.text)
-            except:
-                business_info['phone'] = ""
-            
-            # Website
-            try:
-                website_element = self.driver.find_element(By.CSS_SELECTOR, '[data-item-id="authority"]')
-                business_info['website'] = self.clean_text(website_element.get_attribute('href'))
-            except:
-                business_info['website'] = ""
-            
-            # Try to get email from website if available
-            business_info['email'] = ""
-            if business_info.get('website'):
-                business_info['email'] = self.scrape_email_from_website(business_info['website'])
-            
-            # Rating
-            try:
-                rating_element = self.driver.find_element(By.CSS_SELECTOR, '[data-value="Formatted rating"]')
-                business_info['rating'] = self.clean_text(rating_element.text)
-            except:
-                business_info['rating'] = ""
-            
-            # Category
-            try:
-                category_element = self.driver.find_element(By.CSS_SELECTOR, '[data-section-id="overview"] button[jsaction*="category"]')
-                business_info['category'] = self.clean_text(category_element.text)
-            except:
-                business_info['category'] = ""
-            
-            return business_info
-            
+            email, outcome = self.find_email_on_website(website_url)
+        except CircuitOpenError as e:
+            logging.debug(f"Skipping email lookup on {website_url}: {e}")
+            return ""
         except Exception as e:
-            logging.error(f"Error extracting business info: {e}")
-            return {}
+            logging.warning(f"Could not scrape email from {website_url}: {e}")
+            if cache and isinstance(e, (requests.ConnectionError, requests.Timeout)):
+                cache.record_unreachable(domain, type(e).__name__)
+            return ""
+        
+        # "No email" is only known once the home page loaded; a bot wall or a
+        # 5xx left after retries says nothing about the site, so cache nothing
+        if cache and (email or outcome == 'HTTP 200'):
+            cache.record_email(website_url, email, outcome)
+        return email
     
-    def scrape_email_from_website(self, website_url: str) -> str:
-        """Try to scrape email from business website"""
+    def find_email_on_website(self, website_url: str) -> Tuple[str, str]:
+        """Crawl a business website for an email; returns (email or '', fetch outcome)"""
+        frontier = CrawlFrontier(website_url)
+        frontier.record_fetch()
         try:
-            if not website_url.startswith(('http://', 'https://')):
-                website_url = 'https://' + website_url
-            
-            response = requests.get(website_url, timeout=10, headers={
+            response = self.fetch(website_url, timeout=10, headers={
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             })
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Look for email in contact pages
-                contact_links = soup.find_all('a', href=re.compile(r'contact|about', re.I))
-                for link in contact_links[:3]:  # Check first 3 contact links
-                    try:
-                        contact_url = requests.compat.urljoin(website_url, link.get('href'))
-                        contact_response = requests.get(contact_url, timeout=5)
-                        if contact_response.status_code == 200:
-                            email = self.extract_email(contact_response.text)
-                            if email:
-                                return email
-                    except:
-                        continue
-                
-                # Look for email in main page
-                return self.extract_email(response.text)
-            
-        except Exception as e:
-            logging.warning(f"Could not scrape email from {website_url}: {e}")
-        
-        return ""
-    
-    def close(self):
-        """Close the browser driver"""
-        if self.driver:
-            self.driver.quit()
-            logging.info("Browser driver closed")
-
-class YelpScraper(BaseScraper):
-    """Scraper for Yelp using requests and BeautifulSoup"""
+            outcome = f"HTTP {response.status_code}"
+            email = self.crawl_for_email(frontier, website_url, response) if response.status_code == 200 else ""
+        finally:
+            metrics.incr('email_lookup_requests_total', frontier.fetched, scraper=self.name)
+        metrics.incr('email_lookups_total', scraper=self.name, result='found' if email else 'none')
+        return email, outcome
     
-    def scrape(self, keyword: str, location: str) -> List[Dict]:
-        """Scrape Yelp for businesses"""
-        results = []
+    def crawl_for_email(self, frontier: CrawlFrontier, page_url: str, response) -> str:
+        """Visit the site's most promising pages, starting from its fetched home page
         
-        try:
-            # Construct search URL
-            search_query = keyword.replace(' ', '+')
-            location_query = location.replace(' ', '+')
-            url = f"https://www.yelp.com/search?find_desc={search_query}&find_loc={location_query}"
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            logging.info(f"Scraping Yelp for: {keyword} in {location}")
-            response = requests.get(url, headers=headers)
-            
+        A mailto: link, or an email on a contact page, ends the crawl at
+        once. An email seen elsewhere (home or about page) is returned as
+        soon as no contact page is left to try.
+        """
+        fallback = ""
+        score, depth = 0.0, 0
+        while True:
+            document = self.parser.parse(response.content)
+            for link in self.parser.select(document, 'a[href]'):
+                href = self.parser.attr(link, 'href').strip()
+                if href[:7].lower() == 'mailto:':
+                    email = self.extract_email(unquote(href[7:]))
+                    if email:
+                        return email
+                elif depth < frontier.max_depth:
+                    frontier.push(href, score_link(href, self.parser.text(link)), depth + 1, page_url)
+            
+            email = self.extract_email(response.text)
+            if email and score >= HIGH_CONFIDENCE_SCORE:
+                return email
+            fallback = fallback or email
+            
+            # Contact pages that are not linked from the home page are often in the sitemap
+            if depth == 0 and frontier.best_score() < HIGH_CONFIDENCE_SCORE and frontier.has_budget():
+                self.add_sitemap_candidates(frontier, document, page_url)
+            if fallback and frontier.best_score() < HIGH_CONFIDENCE_SCORE:
+                return fallback
+            
+            page = self.fetch_next_page(frontier)
+            if page is None:
+                return fallback
+            page_url, score, depth, response = page
+    
+    def fetch_next_page(self, frontier: CrawlFrontier) -> Optional[tuple]:
+        """Fetch the best candidate that loads; returns (url, score, depth, response) or None"""
+        while True:
+            candidate = frontier.pop()
+            if candidate is None:
+                return None
+            url, score, depth = candidate
+            frontier.record_fetch()
+            try:
+                response = self.fetch(url, timeout=5)
+            except CircuitOpenError:
+                return None
+            except Exception as e:
+                logging.debug(f"Could not fetch {url}: {e}")
+                continue
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find business listings
-                business_elements = soup.find_all('div', {'data-testid': 'serp-ia-card'})
-                
-                for element in business_elements[:self.max_results]:
-                    try:
-                        business_info = self.extract_yelp_business_info(element)
-                        if business_info:
-                            results.append(business_info)
-                            logging.info(f"Scraped Yelp business: {business_info.get('name', 'Unknown')}")
-                    
-                    except Exception as e:
-                        logging.warning(f"Error scraping Yelp business: {e}")
-                        continue
-                
-                logging.info(f"Scraped {len(results)} businesses from Yelp")
-            
-            else:
-                logging.error(f"Failed to fetch Yelp page: {response.status_code}")
-        
-        except Exception as e:
-            logging.error(f"Error during Yelp scraping: {e}")
-        
-        return results
+                return url, score, depth, response
     
-    def extract_yelp_business_info(self, element) -> Dict:
-        """Extract business information from Yelp element"""
+    def add_sitemap_candidates(self, frontier: CrawlFrontier, document, page_url: str):
+        """Queue the contact and about pages listed in the site's sitemap"""
+        link = self.parser.select_one(document, 'link[rel="sitemap"][href]')
+        sitemap_url = urljoin(page_url, self.parser.attr(link, 'href') if link else '/sitemap.xml')
+        frontier.record_fetch()
         try:
-            business_info = {}
-            
-            # Business name
-            name_element = element.find('a', {'data-analytics-label': 'biz-name'})
-            business_info['name'] = self.clean_text(name_element.text) if name_element else "Unknown"
-            
-            # Address
-            address_element = element.find('p', string=re.compile(r'.*\d.*'))
-            business_info['address'] = self.clean_text(address_element.text) if address_element else ""
-            
-            # Phone (not usually available in search results)
-            business_info['phone'] = ""
-            
-            # Website (not usually available in search results)
-            business_info['website'] = ""
-            
-            # Email (not available in search results)
-            business_info['email'] = ""
-            
-            # Rating
-            rating_element = element.find('div', {'role': 'img'})
-            if rating_element and 'aria-label' in rating_element.attrs:
-                rating_text = rating_element['aria-label']
-                rating_match = re.search(r'(\d+\.?\d*)\s*star', rating_text)
-                business_info['rating'] = rating_match.group(1) if rating_match else ""
-            else:
-                business_info['rating'] = ""
-            
-            # Category
-            category_elements = element.find_all('span', class_=re.compile(r'category'))
-            if category_elements:
-                categories = [self.clean_text(cat.text) for cat in category_elements]
-                business_info['category'] = ', '.join(categories)
-            else:
-                business_info['category'] = ""
-            
-            return business_info
-            
+            response = self.fetch(sitemap_url, timeout=5)
         except Exception as e:
-            logging.error(f"Error extracting Yelp business info: {e}")
-            return {}
+            logging.debug(f"Could not fetch sitemap {sitemap_url}: {e}")
+            return
+        if response.status_code != 200:
+            return
+        for url in sitemap_urls(response.text):
+            score = score_link(url)
+            if score:
+                frontier.push(url, score - SITEMAP_PENALTY, 1, sitemap_url)
+    
+    def scrape(self, keyword: str, location: str) -> List[Dict]:
+        """Abstract method to be implemented by subclasses"""
+        raise NotImplementedError("Subclasses must implement the scrape method")
 
 class ScraperFactory:
     """Factory class to create appropriate scrapers"""
@@ -312,9 +197,12 @@ class ScraperFactory:
     @staticmethod
     def create_scraper(scraper_type: str = "google_maps") -> BaseScraper:
         """Create a scraper instance based on type"""
+        # Backends are imported on demand so selenium/requests load only when used
         if scraper_type == "google_maps":
+            from .google_maps import GoogleMapsScraper
             return GoogleMapsScraper()
         elif scraper_type == "yelp":
+            from .yelp import YelpScraper
             return YelpScraper()
         else:
             raise ValueError(f"Unknown scraper type: {scraper_type}")
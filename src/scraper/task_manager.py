@@ -1,21 +1,31 @@
 import threading
+import time
 import logging
-from typing import Callable, Dict, List
-from src.database import DatabaseManager
+from typing import Callable, Dict, List, Optional
+from src.database import BaseStorage
+from src.metrics import metrics
 from .scrapers import ScraperFactory
+from .progress import ProgressTracker
+from .profiling import TaskProfiler
+from src.logs import task_logging
 
 class TaskManager:
     """Manages scraping tasks and their execution"""
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: BaseStorage):
         self.db_manager = db_manager
+        self.writer = db_manager.get_writer()
         self.running_tasks = {}  # task_id -> thread
         self.task_callbacks = {}  # task_id -> callback function
     
     def start_task(self, task_id: str, keyword: str, location: str, 
                    scraper_type: str = "google_maps", 
-                   callback: Callable = None):
-        """Start a scraping task in a separate thread"""
+                   callback: Callable = None, profile: bool = False):
+        """Start a scraping task in a separate thread
+        
+        With `profile` set the task runs under a TaskProfiler; the artifact
+        paths are stored on the task and sent as a "profile_saved" event.
+        """
         
         if task_id in self.running_tasks:
             logging.warning(f"Task {task_id} is already running")
@@ -27,8 +37,8 @@ class TaskManager:
         
         # Create and start thread
         thread = threading.Thread(
-            target=self._execute_task,
-            args=(task_id, keyword, location, scraper_type),
+            target=self._run_task,
+            args=(task_id, keyword, location, scraper_type, profile),
             daemon=True
         )
         
@@ -38,37 +48,104 @@ class TaskManager:
         logging.info(f"Started task {task_id} for '{keyword}' in '{location}'")
         return True
     
+    def _run_task(self, task_id: str, keyword: str, location: str, scraper_type: str,
+                  profile: bool):
+        """Thread entry point; log records from this thread carry the task id"""
+        with task_logging(task_id):
+            if profile:
+                self._profile_task(task_id, keyword, location, scraper_type)
+            else:
+                self._execute_task(task_id, keyword, location, scraper_type)
+    
+    def _profile_task(self, task_id: str, keyword: str, location: str, scraper_type: str):
+        """Execute a task under the profiler and record where the artifacts went"""
+        # _execute_task drops the callback when it finishes
+        callback = self.task_callbacks.get(task_id)
+        try:
+            profiler = TaskProfiler(task_id)
+            profiler.start()
+        except Exception as e:
+            # e.g. another profiler is already active; the task still has to run and clean up
+            logging.error(f"Could not start profiler for task {task_id}, running it unprofiled: {e}")
+            profiler = None
+        
+        try:
+            self._execute_task(task_id, keyword, location, scraper_type)
+        finally:
+            if profiler:
+                profiler.stop()
+        
+        if profiler is None:
+            return
+        
+        try:
+            profile_path, summary_path = profiler.save()
+        except Exception as e:
+            logging.error(f"Failed to save profile for task {task_id}: {e}")
+            return
+        
+        self.writer.update_fields(task_id, {
+            'profile_path': profile_path,
+            'profile_summary_path': summary_path
+        })
+        if callback:
+            data = {'profile_path': profile_path, 'profile_summary_path': summary_path,
+                    'task_id': task_id}
+            self.writer.flush_async(lambda error: error is None and callback("profile_saved", data))
+    
     def _execute_task(self, task_id: str, keyword: str, location: str, scraper_type: str):
         """Execute a scraping task"""
         scraper = None
+        status = "Failed"
+        started = time.perf_counter()
         
         try:
             # Update task status to running
-            self.db_manager.update_task_status(task_id, "Running")
+            self.writer.update_status(task_id, "Running")
             self._notify_callback(task_id, "status_changed", {"status": "Running"})
             
+            # Progress snapshots go to the callback as rate-limited events; the
+            # callback is captured now because the final "persisted" snapshot is
+            # sent from a flush callback, after the task's callback was removed
+            callback = self.task_callbacks.get(task_id)
+            progress = ProgressTracker(
+                task_id, lambda snapshot: self._send_event(callback, task_id, "progress", snapshot)
+            )
+            
             # Create and run scraper
             scraper = ScraperFactory.create_scraper(scraper_type)
+            scraper.progress = progress
             results = scraper.scrape(keyword, location)
             
-            # Save results to database
+            # Queue results for the write-behind writer; listeners are told
+            # once the batch is persisted so a refresh sees the new data
             if results:
-                self.db_manager.save_results(task_id, results)
-                self.db_manager.update_task_status(task_id, "Completed")
-                self._notify_callback(task_id, "completed", {"results": results})
+                # Record provenance alongside each lead
+                for result in results:
+                    result['source'] = scraper_type
+                self.writer.insert_results(task_id, results)
+                self.writer.flush_async(
+                    lambda error: error is None and progress.finish('persisted', len(results)))
+                self.writer.update_status(task_id, "Completed")
+                self._notify_when_persisted(task_id, "completed", {"results": results})
+                metrics.incr('leads_total', len(results), scraper=scraper_type)
                 logging.info(f"Task {task_id} completed successfully with {len(results)} results")
             else:
-                self.db_manager.update_task_status(task_id, "Completed", "No results found")
-                self._notify_callback(task_id, "completed", {"results": []})
+                self.writer.update_status(task_id, "Completed", "No results found")
+                self._notify_when_persisted(task_id, "completed", {"results": []})
                 logging.info(f"Task {task_id} completed with no results")
+            status = "Completed"
         
         except Exception as e:
             error_message = str(e)
-            self.db_manager.update_task_status(task_id, "Failed", error_message)
-            self._notify_callback(task_id, "failed", {"error": error_message})
+            self.writer.update_status(task_id, "Failed", error_message)
+            self._notify_when_persisted(task_id, "failed", {"error": error_message})
             logging.error(f"Task {task_id} failed: {error_message}")
         
         finally:
+            metrics.observe('task_seconds', time.perf_counter() - started, scraper=scraper_type)
+            metrics.incr('tasks_total', scraper=scraper_type, status=status)
+            
             # Clean up
             if scraper and hasattr(scraper, 'close'):
                 scraper.close()
@@ -83,18 +160,44 @@ class TaskManager:
     
     def _notify_callback(self, task_id: str, event: str, data: Dict):
         """Notify callback function about task events"""
-        if task_id in self.task_callbacks:
-            try:
-                self.task_callbacks[task_id](event, data)
-            except Exception as e:
-                logging.error(f"Error in task callback for {task_id}: {e}")
+        self._send_event(self.task_callbacks.get(task_id), task_id, event, data)
+    
+    def _send_event(self, callback: Optional[Callable], task_id: str, event: str, data: Dict):
+        """Call a task callback captured earlier, logging its errors"""
+        if not callback:
+            return
+        try:
+            callback(event, dict(data, task_id=task_id))
+        except Exception as e:
+            logging.error(f"Error in task callback for {task_id}: {e}")
+    
+    def _notify_when_persisted(self, task_id: str, event: str, data: Dict):
+        """Notify the task's callback after pending writes have been flushed
+        
+        If the writer gave up on those writes the task is marked Failed
+        (queued again, so it lands once storage recovers) and the callback
+        gets a "failed" event instead.
+        """
+        callback = self.task_callbacks.get(task_id)
+        
+        def notify(error):
+            if error is None:
+                notify_event, notify_data = event, data
+            else:
+                error_message = f"Could not save task data: {error}"
+                logging.error(f"Task {task_id}: {error_message}")
+                self.writer.update_status(task_id, "Failed", error_message)
+                notify_event, notify_data = "failed", {"error": error_message}
+            self._send_event(callback, task_id, notify_event, notify_data)
+        
+        self.writer.flush_async(notify)
     
     def stop_task(self, task_id: str):
         """Stop a running task (Note: This is not immediately effective due to thread limitations)"""
         if task_id in self.running_tasks:
             # Mark task as cancelled in database
-            self.db_manager.update_task_status(task_id, "Cancelled")
-            self._notify_callback(task_id, "cancelled", {})
+            self.writer.update_status(task_id, "Cancelled")
+            self._notify_when_persisted(task_id, "cancelled", {})
             
             # Remove from running tasks
             del self.running_tasks[task_id]
@@ -0,0 +1,330 @@
+import json
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urljoin, urlparse, parse_qs
+import time
+import re
+import logging
+from typing import List, Dict, Optional, Tuple
+from config.config import Config
+from src.metrics import metrics, domain_of
+from .scrapers import BaseScraper
+from .rate_limit import get_rate_limiter
+
+# CSS selectors, compiled once per parser
+SERP_CARD = 'div[data-testid="serp-ia-card"]'
+BIZ_NAME = 'a[data-analytics-label="biz-name"]'
+RATING = 'div[role="img"]'
+CATEGORY = 'span[class*="category"]'
+NEXT_LINK = 'a.next-link'
+TEL_LINK = 'a[href^="tel:"]'
+
+DIGIT_PATTERN = re.compile(r'\d')
+RATING_PATTERN = re.compile(r'(\d+\.?\d*)\s*star')
+DETAIL_LABELS = ('Business website', 'Phone number')
+
+# Server-rendered state; Yelp wraps the JSON in an HTML comment
+STATE_SCRIPT_PATTERN = re.compile(
+    r'<script[^>]*data-hypernova-key="[^"]*"[^>]*>\s*(?:<!--)?(.*?)(?:-->)?\s*</script>', re.S)
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+class YelpScraper(BaseScraper):
+    """Scraper for Yelp using requests and the configured HTML parser
+    
+    Search pages are read from their embedded JSON state (which includes
+    phone and coordinates) or, failing that, the rendered cards. Each lead
+    is then enriched on a small worker pool while the next search page
+    loads: the detail page fills in a missing phone or website, and any
+    website goes through the same email lookup as Google Maps. Detail requests share one rate
+    limit per Yelp host across all running tasks.
+    """
+    
+    name = "yelp"
+    
+    def __init__(self):
+        super().__init__()
+        self.detail_workers = max(1, Config.YELP_DETAIL_WORKERS)
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=self.detail_workers + 1,
+                              pool_maxsize=self.detail_workers + 1)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    @property
+    def base_url(self) -> str:
+        return Config.YELP_BASE_URL
+    
+    def scrape(self, keyword: str, location: str) -> List[Dict]:
+        """Scrape Yelp for businesses, following result pages until max_results"""
+        results = []
+        executor = None
+        pending = []
+        
+        try:
+            # Construct search URL
+            search_query = keyword.replace(' ', '+')
+            location_query = location.replace(' ', '+')
+            url = f"{Config.YELP_BASE_URL}/search?find_desc={search_query}&find_loc={location_query}"
+            
+            executor = ThreadPoolExecutor(max_workers=self.detail_workers,
+                                          thread_name_prefix="YelpDetail")
+            
+            logging.info(f"Scraping Yelp for: {keyword} in {location}")
+            harvested = 0
+            start = 0
+            
+            while harvested < self.max_results:
+                page_url = f"{url}&start={start}" if start else url
+                with self.timed('page_load', page_url):
+                    response = self.fetch(page_url, timeout=30)
+                
+                if response.status_code != 200:
+                    logging.error(f"Failed to fetch Yelp page: {response.status_code}")
+                    break
+                
+                with self.timed('parse_page', page_url):
+                    businesses, has_next_page = self.parse_search_page(response.text, page_url)
+                businesses = businesses[:self.max_results - harvested]
+                if not businesses:
+                    break
+                
+                harvested += len(businesses)
+                self.report_progress('harvested', len(businesses))
+                self.report_expected(harvested)
+                
+                for business_info, detail_url in businesses:
+                    results.append(business_info)
+                    self.report_progress('extracted')
+                    logging.info(f"Scraped Yelp business: {business_info.get('name', 'Unknown')}")
+                    
+                    # Detail pages only add phone and website; any website still gets the email lookup
+                    needs_details = (Config.YELP_DETAIL_PAGES and detail_url
+                                     and not (business_info['phone'] and business_info['website']))
+                    if needs_details or business_info['website']:
+                        pending.append(executor.submit(self.enrich_business, business_info,
+                                                       detail_url if needs_details else None))
+                
+                # Stop when there is no next page
+                if not has_next_page:
+                    break
+                start += Config.YELP_PAGE_SIZE
+                time.sleep(self.delay)
+            
+            # Detail fetches overlap the search pages; wait for the stragglers
+            wait(pending)
+            logging.info(f"Scraped {len(results)} businesses from Yelp")
+        
+        except Exception as e:
+            logging.error(f"Error during Yelp scraping: {e}")
+        
+        finally:
+            if executor:
+                executor.shutdown(wait=True)
+        
+        return results
+    
+    def parse_search_page(self, markup: str, page_url: str) -> Tuple[List[Tuple[Dict, Optional[str]]], bool]:
+        """Leads and their detail URLs from a search page, plus whether a next page exists
+        
+        The embedded JSON state is used when present; it is decoded once
+        and carries phone and coordinates that the rendered cards lack.
+        Pages without it go through the DOM selectors.
+        """
+        state = self.extract_search_state(markup)
+        if state:
+            businesses = self.map_search_state(state, page_url)
+            if businesses:
+                metrics.incr('yelp_pages_total', path='json')
+                return businesses, self.state_has_next_page(state)
+        
+        metrics.incr('yelp_pages_total', path='dom')
+        document = self.parser.parse(markup)
+        businesses = []
+        for element in self.parser.select(document, SERP_CARD):
+            try:
+                business_info = self.extract_yelp_business_info(element)
+                if business_info:
+                    businesses.append((business_info, self.extract_detail_url(element, page_url)))
+            except Exception as e:
+                logging.warning(f"Error scraping Yelp business: {e}")
+        return businesses, self.parser.select_one(document, NEXT_LINK) is not None
+    
+    def extract_search_state(self, markup: str) -> Optional[Dict]:
+        """Decode the search page props from the embedded hypernova scripts"""
+        for match in STATE_SCRIPT_PATTERN.finditer(markup):
+            payload = match.group(1)
+            if 'searchPageProps' not in payload:
+                continue
+            try:
+                state = json.loads(payload)
+            except ValueError as e:
+                logging.warning(f"Could not decode Yelp page state: {e}")
+                continue
+            props = state.get('legacyProps', {}).get('searchAppProps', {}).get('searchPageProps')
+            if props:
+                return props
+        return None
+    
+    def map_search_state(self, state: Dict, page_url: str) -> List[Tuple[Dict, Optional[str]]]:
+        """Lead records from decoded search page props, skipping ads"""
+        markers = state.get('rightRailProps', {}).get('searchMapProps', {}).get('mapState', {}).get('markers', [])
+        locations = {marker.get('resourceId'): marker.get('location') or {} for marker in markers}
+        
+        businesses = []
+        for item in state.get('mainContentComponentsListProps', []):
+            business = item.get('searchResultBusiness')
+            if not business or business.get('isAd'):
+                continue
+            
+            rating = business.get('rating')
+            location = locations.get(item.get('bizId'), {})
+            website = business.get('website') or {}
+            business_info = {
+                'name': self.clean_text(business.get('name', '')) or "Unknown",
+                'address': self.clean_text(business.get('formattedAddress', '')),
+                'phone': self.clean_text(business.get('phone', '')),
+                'website': self.resolve_website(website['href']) if website.get('href') else "",
+                'email': "",
+                'rating': f"{rating:.1f}" if isinstance(rating, (int, float)) else "",
+                'category': ', '.join(self.clean_text(category.get('title', ''))
+                                      for category in business.get('categories', [])),
+                'review_count': business.get('reviewCount'),
+                'latitude': location.get('latitude'),
+                'longitude': location.get('longitude')
+            }
+            
+            business_url = business.get('businessUrl')
+            detail_url = urljoin(page_url, business_url) if business_url and '/biz/' in business_url else None
+            businesses.append((business_info, detail_url))
+        return businesses
+    
+    def state_has_next_page(self, state: Dict) -> bool:
+        """Whether the pagination props point past this page"""
+        for item in state.get('mainContentComponentsListProps', []):
+            if item.get('type') == 'pagination':
+                props = item.get('props', {})
+                return props.get('startResult', 1) - 1 + props.get('resultsPerPage', 0) < props.get('totalResults', 0)
+        return False
+    
+    def extract_detail_url(self, element, page_url: str) -> Optional[str]:
+        """Absolute /biz/ URL of a search result card"""
+        link = self.parser.select_one(element, BIZ_NAME)
+        href = self.parser.attr(link, 'href') if link else None
+        if not href or '/biz/' not in href:
+            return None
+        return urljoin(page_url, href)
+    
+    def enrich_business(self, business_info: Dict, detail_url: Optional[str]):
+        """Fill in phone and website from the detail page (when given), then the email from the website"""
+        try:
+            if detail_url:
+                self.enrich_from_detail_page(business_info, detail_url)
+            
+            website = business_info.get('website')
+            if website:
+                with self.timed('email_lookup', website):
+                    business_info['email'] = self.scrape_email_from_website(website)
+            self.report_progress('enriched')
+        
+        except Exception as e:
+            logging.warning(f"Error enriching Yelp business {business_info.get('name', 'Unknown')}: {e}")
+    
+    def enrich_from_detail_page(self, business_info: Dict, detail_url: str):
+        """Fill in missing phone and website from the business's detail page"""
+        get_rate_limiter(domain_of(detail_url), Config.YELP_DETAIL_RATE).acquire()
+        with self.timed('detail_page', detail_url):
+            response = self.fetch(detail_url, timeout=30)
+        if response.status_code != 200:
+            logging.warning(f"Failed to fetch Yelp detail page {detail_url}: {response.status_code}")
+            return
+        
+        with self.timed('extract_detail', detail_url):
+            details = self.extract_yelp_detail_info(self.parser.parse(response.content))
+        for field, value in details.items():
+            if value and not business_info.get(field):
+                business_info[field] = value
+    
+    def extract_yelp_detail_info(self, document) -> Dict:
+        """Extract phone and website from a parsed Yelp business detail page"""
+        details = {'phone': '', 'website': ''}
+        
+        # The sidebar pairs a label paragraph with the value paragraph after it
+        paragraphs = self.parser.select(document, 'p')
+        for label, value in zip(paragraphs, paragraphs[1:]):
+            label_text = self.clean_text(self.parser.text(label))
+            if label_text not in DETAIL_LABELS:
+                continue
+            if label_text == 'Business website':
+                link = self.parser.select_one(value, 'a[href]')
+                if link:
+                    details['website'] = self.resolve_website(self.parser.attr(link, 'href'))
+            else:
+                details['phone'] = self.clean_text(self.parser.text(value))
+        
+        if not details['phone']:
+            tel_link = self.parser.select_one(document, TEL_LINK)
+            if tel_link:
+                details['phone'] = self.clean_text(self.parser.attr(tel_link, 'href')[4:])
+        return details
+    
+    def resolve_website(self, href: str) -> str:
+        """Unwrap Yelp's /biz_redir?url=... links to the business's own URL"""
+        if '/biz_redir' in href:
+            target = parse_qs(urlparse(href).query).get('url')
+            if target:
+                return target[0]
+        return href
+    
+    def extract_yelp_business_info(self, element) -> Dict:
+        """Extract business information from a Yelp search result card"""
+        try:
+            business_info = {}
+            
+            # Business name
+            name_element = self.parser.select_one(element, BIZ_NAME)
+            business_info['name'] = self.clean_text(self.parser.text(name_element)) if name_element else "Unknown"
+            
+            # Address: the first paragraph with a number in it
+            business_info['address'] = ""
+            for paragraph in self.parser.select(element, 'p'):
+                text = self.parser.text(paragraph)
+                if DIGIT_PATTERN.search(text):
+                    business_info['address'] = self.clean_text(text)
+                    break
+            
+            # Phone and website come from the detail page, email from the website
+            business_info['phone'] = ""
+            business_info['website'] = ""
+            business_info['email'] = ""
+            
+            # Rating
+            rating_element = self.parser.select_one(element, RATING)
+            rating_text = self.parser.attr(rating_element, 'aria-label') if rating_element else None
+            if rating_text:
+                rating_match = RATING_PATTERN.search(rating_text)
+                business_info['rating'] = rating_match.group(1) if rating_match else ""
+            else:
+                business_info['rating'] = ""
+            
+            # Category
+            category_elements = self.parser.select(element, CATEGORY)
+            if category_elements:
+                categories = [self.clean_text(self.parser.text(cat)) for cat in category_elements]
+                business_info['category'] = ', '.join(categories)
+            else:
+                business_info['category'] = ""
+            
+            return business_info
+        
+        except Exception as e:
+            logging.error(f"Error extracting Yelp business info: {e}")
+            return {}
+    
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
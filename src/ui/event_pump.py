@@ -0,0 +1,107 @@
+import threading
+import time
+import logging
+from typing import Callable, Dict, List, Tuple
+from config.config import Config
+
+class UIEventPump:
+    """Thread-safe queue of task events drained by the Tk loop at a fixed frame rate
+
+    Worker threads call `post`, which only touches a dict under a lock. Events
+    for the same task that arrive within one frame are merged so that only the
+    latest state is dispatched, and each frame hands the whole batch to the
+    handler in a single call on the Tk thread.
+    """
+    
+    TERMINAL_EVENTS = ('completed', 'failed', 'cancelled')
+
+    def __init__(self, root, handler: Callable[[List[Tuple[str, str, Dict]]], None],
+                 interval_ms: int = None):
+        self.root = root
+        self.handler = handler
+        self.interval_ms = interval_ms or Config.UI_FRAME_INTERVAL_MS
+
+        self._lock = threading.Lock()
+        self._pending = {}  # task_id -> (event, data, first posted at)
+        self._after_id = None
+        self.stats = {
+            'posted': 0,
+            'merged': 0,
+            'dispatched': 0,
+            'frames': 0,
+            'max_batch': 0,
+            'max_latency_ms': 0.0
+        }
+
+    def post(self, task_id: str, event: str, data: Dict):
+        """Queue an event from any thread"""
+        with self._lock:
+            self.stats['posted'] += 1
+            previous = self._pending.get(task_id)
+            if previous is not None:
+                self.stats['merged'] += 1
+                # A terminal event must not be hidden by a later informational one
+                if previous[0] in self.TERMINAL_EVENTS and event not in self.TERMINAL_EVENTS:
+                    event = previous[0]
+                # Keep the latest state but remember how long the task has waited
+                self._pending[task_id] = (event, self._merge(previous[1], data), previous[2])
+            else:
+                self._pending[task_id] = (event, data, time.monotonic())
+
+    def _merge(self, older: Dict, newer: Dict) -> Dict:
+        """Combine payloads so fields from earlier events are not lost"""
+        merged = dict(older)
+        merged.update(newer)
+        return merged
+
+    def start(self):
+        """Start draining on the Tk event loop"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        """Stop draining and dispatch anything still queued"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._dispatch()
+        logging.info(f"UI event pump stats: {self.get_stats()}")
+
+    def _drain(self):
+        """Dispatch one frame's worth of events and schedule the next frame"""
+        try:
+            self._dispatch()
+        finally:
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def _dispatch(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if not pending:
+            return
+
+        now = time.monotonic()
+        batch = []
+        latency = 0.0
+        for task_id, (event, data, posted_at) in pending.items():
+            batch.append((task_id, event, data))
+            latency = max(latency, now - posted_at)
+
+        with self._lock:
+            self.stats['frames'] += 1
+            self.stats['dispatched'] += len(batch)
+            self.stats['max_batch'] = max(self.stats['max_batch'], len(batch))
+            self.stats['max_latency_ms'] = max(self.stats['max_latency_ms'], latency * 1000)
+
+        try:
+            self.handler(batch)
+        except Exception as e:
+            logging.error(f"Error handling UI events: {e}")
+
+    def get_stats(self) -> Dict:
+        """Counters for verifying the UI keeps up: posted = merged + dispatched + queued"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['queued'] = len(self._pending)
+        return stats
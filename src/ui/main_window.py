@@ -1,11 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import threading
 import logging
 from datetime import datetime
 from typing import Dict, List
-from src.database import DatabaseManager
+from src.database import StorageFactory
 from src.scraper import TaskManager
-from .widgets import TaskForm, ResultsViewer, StatusBar
+from src.export import ExportJobManager
+from src.metrics import MetricsServer
+from src.logs import setup_logging, stop_logging
+from .widgets import TaskForm, ResultsViewer, StatusBar, TaskTreeModel
+from .event_pump import UIEventPump
 from config.config import Config
 
 class MainApplication:
@@ -15,34 +20,79 @@ class MainApplication:
         self.root = tk.Tk()
         self.db_manager = None
         self.task_manager = None
+        self.tasks_cursor = None
+        self.db_thread = None
+        self.db_error = None
+        self.export_jobs = None
+        self.task_progress = {}  # task_id -> latest progress snapshot of running tasks
+        
+        self.metrics_server = None
         
         self.setup_logging()
-        self.setup_database()
+        self.setup_metrics()
         self.setup_ui()
-        self.load_tasks()
+        self.setup_database()
+    
+    def setup_metrics(self):
+        """Expose stage timings on the local metrics endpoint"""
+        if Config.METRICS_ENABLED:
+            self.metrics_server = MetricsServer()
+            self.metrics_server.start()
     
     def setup_logging(self):
         """Setup logging configuration"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('lead_scraper.log'),
-                logging.StreamHandler()
-            ]
-        )
+        # Records are queued and written by a background listener
+        setup_logging()
     
     def setup_database(self):
-        """Setup database connection"""
+        """Connect to the database in the background so the window shows immediately"""
+        if self.db_thread and self.db_thread.is_alive():
+            return
+        
+        self.db_error = None
+        self.status_bar.set_connection_state('connecting')
+        self.status_bar.set_status("Connecting to database...")
+        
+        self.db_thread = threading.Thread(target=self._connect_database, daemon=True)
+        self.db_thread.start()
+        self.root.after(100, self._check_database_ready)
+    
+    def _connect_database(self):
+        """Create the storage backend (runs on a worker thread)"""
         try:
-            self.db_manager = DatabaseManager()
-            self.task_manager = TaskManager(self.db_manager)
+            db_manager = StorageFactory.create_storage()
+            self.task_manager = TaskManager(db_manager)
+            self.export_jobs = ExportJobManager(db_manager)
+            self.db_manager = db_manager
             logging.info("Database connection established")
         except Exception as e:
+            self.db_error = e
+    
+    def _check_database_ready(self):
+        """Poll the connection thread from the Tk thread and finish startup"""
+        if self.db_thread.is_alive():
+            self.root.after(100, self._check_database_ready)
+            return
+        
+        if self.db_error is not None:
+            self.status_bar.set_connection_state('failed')
+            self.status_bar.set_status("Database unavailable - press Refresh to retry")
             messagebox.showerror("Database Error", 
-                               f"Failed to connect to database:\n{str(e)}\n\n"
-                               "Please ensure MongoDB is running.")
-            self.root.quit()
+                               f"Failed to connect to database:\n{str(self.db_error)}\n\n"
+                               "Please ensure MongoDB is running or set STORAGE_BACKEND=sqlite.")
+            return
+        
+        self.status_bar.set_connection_state('connected')
+        self.load_tasks()
+    
+    def is_database_ready(self, warn: bool = True) -> bool:
+        """Check that the background connection has completed"""
+        if self.db_manager is not None:
+            return True
+        
+        if warn:
+            messagebox.showwarning("Warning", "The database connection is not ready yet")
+        return False
     
     def setup_ui(self):
         """Setup the main user interface"""
@@ -71,6 +121,10 @@ class MainApplication:
         self.status_bar = StatusBar(self.root)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
         
+        # Task events are coalesced and applied once per frame
+        self.event_pump = UIEventPump(self.root, self._handle_task_events)
+        self.event_pump.start()
+        
         # Bind window close event
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
     
@@ -85,7 +139,11 @@ class MainApplication:
         
         # Refresh button
         ttk.Button(toolbar, text="Refresh", 
-                  command=self.load_tasks).pack(side=tk.LEFT, padx=5)
+                  command=self.refresh).pack(side=tk.LEFT, padx=5)
+        
+        # Load more tasks button
+        ttk.Button(toolbar, text="Load More", 
+                  command=self.load_more_tasks).pack(side=tk.LEFT, padx=5)
         
         # Delete task button
         ttk.Button(toolbar, text="Delete Task", 
@@ -113,7 +171,7 @@ class MainApplication:
         tasks_frame.grid_columnconfigure(0, weight=1)
         
         # Treeview for tasks
-        columns = ('keyword', 'location', 'status', 'results_count', 'created_at')
+        columns = ('keyword', 'location', 'status', 'results_count', 'progress', 'created_at')
         self.tasks_tree = ttk.Treeview(tasks_frame, columns=columns, show='headings')
         
         # Define headings
@@ -121,6 +179,7 @@ class MainApplication:
         self.tasks_tree.heading('location', text='Location')
         self.tasks_tree.heading('status', text='Status')
         self.tasks_tree.heading('results_count', text='Results')
+        self.tasks_tree.heading('progress', text='Progress')
         self.tasks_tree.heading('created_at', text='Created')
         
         # Configure column widths
@@ -128,8 +187,11 @@ class MainApplication:
         self.tasks_tree.column('location', width=200)
         self.tasks_tree.column('status', width=100)
         self.tasks_tree.column('results_count', width=80)
+        self.tasks_tree.column('progress', width=360)
         self.tasks_tree.column('created_at', width=150)
         
+        self.task_model = TaskTreeModel(self.tasks_tree)
+        
         # Scrollbars
         v_scrollbar = ttk.Scrollbar(tasks_frame, orient=tk.VERTICAL, command=self.tasks_tree.yview)
         h_scrollbar = ttk.Scrollbar(tasks_frame, orient=tk.HORIZONTAL, command=self.tasks_tree.xview)
@@ -168,6 +230,9 @@ class MainApplication:
     
     def create_new_task(self):
         """Create a new scraping task"""
+        if not self.is_database_ready():
+            return
+        
         def on_task_created(task_data):
             try:
                 # Create task in database
@@ -182,11 +247,19 @@ class MainApplication:
                     task_data['keyword'],
                     task_data['location'],
                     task_data['scraper_type'],
-                    self.on_task_event
+                    self.on_task_event,
+                    profile=task_data.get('profile', False)
                 )
                 
-                # Refresh tasks list
-                self.load_tasks()
+                # Add the new row at the top of the list
+                self.task_model.upsert({
+                    '_id': task_id,
+                    'keyword': task_data['keyword'],
+                    'location': task_data['location'],
+                    'status': 'Running',
+                    'results_count': 0,
+                    'created_at': datetime.utcnow()
+                }, index=0)
                 self.status_bar.set_status(f"Started task: {task_data['keyword']} in {task_data['location']}")
                 
             except Exception as e:
@@ -225,7 +298,7 @@ class MainApplication:
                 self.on_task_event
             )
             
-            self.load_tasks()
+            self.task_model.update(task_id, status='Running', results_count=0)
             self.status_bar.set_status(f"Started task: {task_data['keyword']}")
             
         except Exception as e:
@@ -245,7 +318,7 @@ class MainApplication:
         
         if messagebox.askyesno("Confirm", "Are you sure you want to stop this task?"):
             self.task_manager.stop_task(task_id)
-            self.load_tasks()
+            self.task_model.update(task_id, status='Cancelled')
             self.status_bar.set_status(f"Stopped task: {task_data['keyword']}")
     
     def delete_task(self):
@@ -265,7 +338,9 @@ class MainApplication:
                              "This will also delete all associated results."):
             try:
                 self.db_manager.delete_task(task_id)
-                self.load_tasks()
+                self.task_model.remove(task_id)
+                self.task_progress.pop(task_id, None)
+                self.update_task_stats()
                 self.status_bar.set_status(f"Deleted task: {task_data['keyword']}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to delete task:\n{str(e)}")
@@ -279,31 +354,68 @@ class MainApplication:
         task_id, task_data = selected
         
         try:
-            results = self.db_manager.get_task_results(task_id)
-            if not results:
+            if not self.db_manager.count_results(task_id):
                 messagebox.showinfo("Info", "No results available for this task")
                 return
             
-            ResultsViewer(self.root, results, task_data)
+            ResultsViewer(self.root, self.db_manager, task_data, task_id, self.start_export)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load results:\n{str(e)}")
     
     def export_all_results(self):
         """Export all results to Excel"""
+        if not self.is_database_ready():
+            return
+        
         try:
-            results = self.db_manager.get_all_results()
-            if not results:
+            if not self.db_manager.count_results():
                 messagebox.showinfo("Info", "No results to export")
                 return
             
-            ResultsViewer(self.root, results, {'keyword': 'All Results', 'location': 'All'})
+            ResultsViewer(self.root, self.db_manager, {'keyword': 'All Results', 'location': 'All'},
+                          on_export=self.start_export)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load results:\n{str(e)}")
     
+    def start_export(self, filename: str, task_id: str = None):
+        """Start a background export job and begin tracking its progress"""
+        was_idle = not self.export_jobs.get_active_jobs()
+        self.export_jobs.start_export(filename, task_id)
+        self.status_bar.set_status(f"Exporting to {filename}...")
+        
+        if was_idle:
+            self.root.after(200, self.poll_export_jobs)
+    
+    def poll_export_jobs(self):
+        """Render aggregate export progress and report finished jobs"""
+        for job in self.export_jobs.pop_finished_jobs():
+            if job.status == 'Completed':
+                self.status_bar.set_status(f"Exported {job.written} results to {job.filename}")
+            elif job.status == 'Cancelled':
+                self.status_bar.set_status(f"Export to {job.filename} cancelled")
+            else:
+                self.status_bar.set_status(f"Export to {job.filename} failed")
+                messagebox.showerror("Export Failed", f"Failed to export results:\n{job.error}")
+        
+        progress = self.export_jobs.get_progress()
+        if progress['active']:
+            self.status_bar.set_progress(progress['percent'], self.cancel_exports)
+            self.root.after(200, self.poll_export_jobs)
+        else:
+            self.status_bar.hide_progress()
+    
+    def cancel_exports(self):
+        """Cancel all running export jobs"""
+        if messagebox.askyesno("Confirm", "Cancel all running exports?"):
+            self.export_jobs.cancel_all()
+    
     def get_selected_task(self):
         """Get selected task from tree"""
+        if not self.is_database_ready():
+            return None
+        
         selection = self.tasks_tree.selection()
         if not selection:
             messagebox.showwarning("Warning", "Please select a task")
@@ -324,72 +436,112 @@ class MainApplication:
         
         return task_id, task_data
     
+    def refresh(self):
+        """Reload tasks, or retry the connection if it is not established"""
+        if self.db_manager is None:
+            self.setup_database()
+        else:
+            self.load_tasks()
+    
     def load_tasks(self):
-        """Load tasks from database into tree"""
-        # Clear existing items
-        for item in self.tasks_tree.get_children():
-            self.tasks_tree.delete(item)
+        """Load the first page of tasks from database into tree"""
+        if not self.is_database_ready(warn=False):
+            return
+        
+        self.task_model.clear()
+        self.tasks_cursor = None
+        
+        self.load_more_tasks()
+    
+    def load_more_tasks(self):
+        """Append the next page of task summaries to the tree"""
+        if not self.is_database_ready():
+            return
+        if self.tasks_cursor is None and len(self.task_model):
+            return
         
         try:
-            tasks = self.db_manager.get_all_tasks()
+            tasks, self.tasks_cursor = self.db_manager.get_task_summaries(after=self.tasks_cursor)
             
             for task in tasks:
-                # Format created date
-                created_at = task['created_at'].strftime('%Y-%m-%d %H:%M')
-                
-                # Determine status color
-                status = task['status']
                 if self.task_manager.is_task_running(task['_id']):
-                    status = 'Running'
-                
-                values = (
-                    task['keyword'],
-                    task['location'],
-                    status,
-                    task['results_count'],
-                    created_at
-                )
-                
-                # Add item with task_id as tag
-                item = self.tasks_tree.insert('', tk.END, values=values, tags=(task['_id'],))
-                
-                # Set status-based styling
-                if status == 'Running':
-                    self.tasks_tree.set(item, 'status', '🔄 Running')
-                elif status == 'Completed':
-                    self.tasks_tree.set(item, 'status', '✅ Completed')
-                elif status == 'Failed':
-                    self.tasks_tree.set(item, 'status', '❌ Failed')
-                elif status == 'Cancelled':
-                    self.tasks_tree.set(item, 'status', '⏹️ Cancelled')
-                else:
-                    self.tasks_tree.set(item, 'status', '⏸️ Created')
+                    task['status'] = 'Running'
+                self.task_model.upsert(task)
             
-            self.status_bar.set_status(f"Loaded {len(tasks)} tasks")
+            self.update_task_stats()
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load tasks:\n{str(e)}")
     
+    def update_task_stats(self):
+        """Show aggregated task counts in the status bar"""
+        stats = self.db_manager.get_task_stats()
+        by_status = stats['by_status']
+        loaded = len(self.task_model)
+        
+        self.status_bar.set_status(
+            f"Showing {loaded} of {stats['total_tasks']} tasks | "
+            f"Running: {by_status.get('Running', 0)} | "
+            f"Completed: {by_status.get('Completed', 0)} | "
+            f"Failed: {by_status.get('Failed', 0)} | "
+            f"Leads: {stats['total_leads']}"
+        )
+    
     def on_task_event(self, event: str, data: Dict):
-        """Handle task events"""
-        self.root.after(0, lambda: self._handle_task_event(event, data))
+        """Handle task events (called from worker threads)"""
+        self.event_pump.post(data.get('task_id'), event, data)
     
-    def _handle_task_event(self, event: str, data: Dict):
-        """Handle task events on main thread"""
-        if event == "status_changed":
-            self.load_tasks()
-        elif event == "completed":
-            self.load_tasks()
+    def _handle_task_events(self, batch: List):
+        """Apply one frame of coalesced task events on the main thread"""
+        terminal = []
+        profile_summary = None
+        for task_id, event, data in batch:
+            self.task_model.apply_event(task_id, event, data)
+            if event in ("completed", "failed", "cancelled"):
+                terminal.append((event, data))
+                self.task_progress.pop(task_id, None)
+            elif 'leads_per_min' in data:
+                self.task_progress[task_id] = data
+            profile_summary = data.get('profile_summary_path', profile_summary)
+        
+        self.update_activity()
+        
+        if profile_summary:
+            self.status_bar.set_status(f"Profile saved to {profile_summary}")
+        
+        if not terminal:
+            return
+        
+        # One aggregation per frame, however many tasks finished in it
+        self.update_task_stats()
+        
+        failures = [data.get('error', 'Unknown error') for event, data in terminal if event == "failed"]
+        event, data = terminal[-1]
+        if event == "completed":
             results_count = len(data.get('results', []))
-            self.status_bar.set_status(f"Task completed with {results_count} results")
-        elif event == "failed":
-            self.load_tasks()
-            error = data.get('error', 'Unknown error')
-            self.status_bar.set_status(f"Task failed: {error}")
-            messagebox.showerror("Task Failed", f"Task failed with error:\n{error}")
+            message = f"Task completed with {results_count} results"
+            if data.get('profile_summary_path'):
+                message += f"; profile saved to {data['profile_summary_path']}"
+            self.status_bar.set_status(message)
         elif event == "cancelled":
-            self.load_tasks()
             self.status_bar.set_status("Task cancelled")
+        
+        if failures:
+            self.status_bar.set_status(f"Task failed: {failures[-1]}")
+            messagebox.showerror("Task Failed", 
+                               f"{len(failures)} task(s) failed with error:\n" + "\n".join(failures))
+    
+    def update_activity(self):
+        """Show aggregate throughput of the running tasks in the status bar"""
+        if not self.task_progress:
+            self.status_bar.set_activity("")
+            return
+        
+        leads = sum(progress['extracted'] for progress in self.task_progress.values())
+        rate = sum(progress['leads_per_min'] for progress in self.task_progress.values())
+        self.status_bar.set_activity(
+            f"{len(self.task_progress)} running · {leads} leads · {rate:.1f} leads/min"
+        )
     
     def on_closing(self):
         """Handle application closing"""
@@ -403,9 +555,28 @@ class MainApplication:
                 else:
                     return
         
+        if self.export_jobs:
+            active_exports = self.export_jobs.get_active_jobs()
+            if active_exports:
+                if messagebox.askyesno("Confirm Exit", 
+                                     f"There are {len(active_exports)} exports in progress. "
+                                     "Do you want to cancel them and exit?"):
+                    self.export_jobs.cancel_all()
+                    for job in active_exports:
+                        job.thread.join(timeout=5)
+                else:
+                    return
+        
+        self.event_pump.stop()
+        
         if self.db_manager:
             self.db_manager.disconnect()
         
+        # After the final flush so the snapshot includes the last writes
+        if self.metrics_server:
+            self.metrics_server.stop()
+        
+        stop_logging()
         self.root.destroy()
     
     def run(self):
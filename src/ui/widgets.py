@@ -1,10 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd
 from datetime import datetime
 import os
-from typing import List, Dict
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional
 from config.config import Config
+from src.export import ExporterFactory
+from src.scraper.progress import format_progress
 
 class TaskForm(tk.Toplevel):
     """Form for creating new tasks"""
@@ -51,9 +55,14 @@ class TaskForm(tk.Toplevel):
         scraper_combo.grid(row=2, column=1, pady=5, padx=(10, 0))
         scraper_combo.set("google_maps")  # Default selection
         
+        # Profiling
+        self.profile_var = tk.BooleanVar()
+        ttk.Checkbutton(main_frame, text=f"Profile this task ({Config.PROFILE_MODE})",
+                        variable=self.profile_var).grid(row=3, column=1, sticky=tk.W, pady=5, padx=(10, 0))
+        
         # Buttons
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=3, column=0, columnspan=2, pady=20)
+        button_frame.grid(row=4, column=0, columnspan=2, pady=20)
         
         ttk.Button(button_frame, text="Create Task", 
                   command=self.create_task).pack(side=tk.LEFT, padx=5)
@@ -88,7 +97,8 @@ class TaskForm(tk.Toplevel):
         self.result = {
             'keyword': keyword,
             'location': location,
-            'scraper_type': scraper_type
+            'scraper_type': scraper_type,
+            'profile': self.profile_var.get()
         }
         
         if self.callback:
@@ -101,18 +111,233 @@ class TaskForm(tk.Toplevel):
         self.result = None
         self.destroy()
 
+RESULT_COLUMNS = ['name', 'address', 'phone', 'email', 'website', 'rating', 'category']
+
+TASK_STATUS_LABELS = {
+    'Running': '🔄 Running',
+    'Completed': '✅ Completed',
+    'Failed': '❌ Failed',
+    'Cancelled': '⏹️ Cancelled'
+}
+
+class TaskTreeModel:
+    """Task list model keyed by task id that applies row-level diffs to a Treeview
+    
+    Rows use the task id as their item id, so updates touch a single row,
+    unchanged rows are never rewritten and the selection survives updates.
+    """
+    
+    EVENT_STATUSES = {
+        'completed': 'Completed',
+        'failed': 'Failed',
+        'cancelled': 'Cancelled'
+    }
+    
+    def __init__(self, tree: ttk.Treeview):
+        self.tree = tree
+        self.tasks = {}  # task_id -> task summary
+        self.rendered = {}  # task_id -> values currently shown
+    
+    def __len__(self) -> int:
+        return len(self.tasks)
+    
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self.tasks
+    
+    def clear(self):
+        """Remove every row"""
+        self.tree.delete(*self.tree.get_children())
+        self.tasks.clear()
+        self.rendered.clear()
+    
+    def upsert(self, task: Dict, index=tk.END):
+        """Insert a task row, or update it in place if it already exists"""
+        task_id = task['_id']
+        if task_id in self.tasks:
+            self.update(task_id, **task)
+            return
+        
+        self.tasks[task_id] = dict(task)
+        values = self._render(self.tasks[task_id])
+        self.tree.insert('', index, iid=task_id, values=values, tags=(task_id,))
+        self.rendered[task_id] = values
+    
+    def update(self, task_id: str, **fields) -> bool:
+        """Merge fields into a task and redraw its row only if it changed"""
+        task = self.tasks.get(task_id)
+        if task is None:
+            return False
+        
+        task.update(fields)
+        values = self._render(task)
+        if values != self.rendered[task_id]:
+            self.tree.item(task_id, values=values)
+            self.rendered[task_id] = values
+        return True
+    
+    def remove(self, task_id: str):
+        """Remove a task row"""
+        if self.tasks.pop(task_id, None) is not None:
+            self.rendered.pop(task_id, None)
+            self.tree.delete(task_id)
+    
+    def apply_event(self, task_id: str, event: str, data: Dict) -> bool:
+        """Apply a TaskManager event to the affected row"""
+        fields = {}
+        if event == 'status_changed':
+            fields['status'] = data.get('status', 'Running')
+        elif event in self.EVENT_STATUSES:
+            fields['status'] = self.EVENT_STATUSES[event]
+            if 'results' in data:
+                fields['results_count'] = len(data['results'])
+        
+        # Progress snapshots may arrive on their own or merged into another event
+        if 'leads_per_min' in data:
+            fields['progress'] = {key: value for key, value in data.items()
+                                  if key not in ('results', 'error', 'task_id')}
+        
+        # Finished tasks keep their final counts but no ETA
+        progress = fields.get('progress') or self.tasks.get(task_id, {}).get('progress')
+        if progress and fields.get('status') in self.EVENT_STATUSES.values():
+            fields['progress'] = dict(progress, eta_seconds=None)
+        
+        if not fields:
+            return False
+        return self.update(task_id, **fields)
+    
+    def _render(self, task: Dict) -> tuple:
+        created_at = task['created_at']
+        if isinstance(created_at, datetime):
+            created_at = created_at.strftime('%Y-%m-%d %H:%M')
+        
+        return (
+            task['keyword'],
+            task['location'],
+            TASK_STATUS_LABELS.get(task['status'], '⏸️ Created'),
+            task.get('results_count', 0),
+            format_progress(task.get('progress')),
+            created_at
+        )
+
+class ResultsPageCache:
+    """LRU cache of fixed-size pages of a results query fetched on demand
+    
+    A page that directly follows a cached one is fetched with a keyset
+    cursor; jumps to arbitrary positions fall back to an offset query.
+    """
+    
+    def __init__(self, db_manager, filters: Dict = None, sort: str = None,
+                 descending: bool = True, page_size: int = None,
+                 max_pages: int = None, projection: List[str] = None):
+        self.db_manager = db_manager
+        self.filters = filters or {}
+        self.sort = sort or 'scraped_at'
+        self.descending = descending
+        self.page_size = page_size or Config.RESULTS_PAGE_SIZE
+        self.max_pages = max_pages or Config.VIEWER_CACHE_PAGES
+        self.projection = projection
+        self.pages = OrderedDict()  # page index -> list of results
+    
+    def get_page(self, index: int) -> List[Dict]:
+        """Get a page, fetching it if it is not cached"""
+        if index in self.pages:
+            self.pages.move_to_end(index)
+            return self.pages[index]
+        
+        page = self.fetch_page(index, self.cursor(index))
+        self.put_page(index, page)
+        return page
+    
+    def cursor(self, index: int) -> Optional[Dict]:
+        """Keyset cursor for a page, if the page before it is cached"""
+        previous = self.pages.get(index - 1)
+        if previous:
+            return {self.sort: previous[-1].get(self.sort), '_id': previous[-1]['_id']}
+        return None
+    
+    def fetch_page(self, index: int, after: Dict = None) -> List[Dict]:
+        """Query one page from storage; touches no cache state, so any thread may call it"""
+        page, _ = self.db_manager.search_results(
+            self.filters, sort=self.sort, descending=self.descending, after=after,
+            offset=index * self.page_size, limit=self.page_size, projection=self.projection
+        )
+        return page
+    
+    def put_page(self, index: int, page: List[Dict]):
+        """Cache a fetched page, evicting the least recently used ones"""
+        self.pages[index] = page
+        while len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+    
+    def get_rows(self, offset: int, count: int) -> List[Dict]:
+        """Get `count` rows starting at `offset`"""
+        rows = []
+        index = offset // self.page_size
+        skip = offset % self.page_size
+        
+        while len(rows) < count:
+            page = self.get_page(index)
+            rows.extend(page[skip:skip + count - len(rows)])
+            if len(page) < self.page_size:
+                break
+            index += 1
+            skip = 0
+        return rows
+    
+
 class ResultsViewer(tk.Toplevel):
-    """Window for viewing and previewing results"""
+    """Window for viewing and previewing results
     
-    def __init__(self, parent, results: List[Dict], task_info: Dict = None):
+    The tree is virtualized: it only ever holds the visible rows, which are
+    filled from a page cache as the user scrolls, so open time and memory
+    are constant regardless of how many leads exist.
+    """
+    
+    ROW_HEIGHT = 20
+    PREFETCH_POLL_MS = 50
+    
+    HEADINGS = {
+        'name': 'Business Name',
+        'address': 'Address',
+        'phone': 'Phone',
+        'email': 'Email',
+        'website': 'Website',
+        'rating': 'Rating',
+        'category': 'Category'
+    }
+    
+    # Column -> indexed storage field it sorts on
+    SORT_COLUMNS = {
+        'name': 'name',
+        'category': 'category',
+        'rating': 'rating_value'
+    }
+    
+    def __init__(self, parent, db_manager, task_info: Dict = None, task_id: str = None,
+                 on_export: Callable = None):
         super().__init__(parent)
-        self.results = results
+        self.db_manager = db_manager
+        self.on_export = on_export
+        self.task_id = task_id
         self.task_info = task_info
+        self.filters = {'task_id': task_id} if task_id else {}
+        self.sort = 'scraped_at'
+        self.descending = True
+        self.total_results = db_manager.count_search_results(self.filters)
+        self.cache = ResultsPageCache(db_manager, self.filters, projection=RESULT_COLUMNS)
+        self.offset = 0
+        self.visible_rows = 15
+        self.row_items = []
+        
+        # Background page prefetch: queries run on one worker thread owned by
+        # the window and pages are handed back to the Tk thread by polling with after()
+        self._prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ResultsPrefetch")
+        self._prefetch = None  # (cache, index, future) while a fetch is running
+        self._prefetch_after_id = None
         
         self.title("Results Preview")
         self.geometry("900x600")
         self.transient(parent)
-        self.grab_set()
         
         self.setup_ui()
         self.center_window()
@@ -126,7 +351,7 @@ class ResultsViewer(tk.Toplevel):
         # Configure grid weights
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
-        main_frame.grid_rowconfigure(1, weight=1)
+        main_frame.grid_rowconfigure(2, weight=1)
         main_frame.grid_columnconfigure(0, weight=1)
         
         # Info frame
@@ -136,27 +361,31 @@ class ResultsViewer(tk.Toplevel):
         if self.task_info:
             info_text = f"Keyword: {self.task_info.get('keyword', 'N/A')} | " \
                        f"Location: {self.task_info.get('location', 'N/A')} | " \
-                       f"Results: {len(self.results)}"
+                       f"Results: {self.total_results}"
             ttk.Label(info_frame, text=info_text).grid(row=0, column=0, sticky=tk.W)
         
+        self.range_var = tk.StringVar()
+        ttk.Label(info_frame, textvariable=self.range_var).grid(row=1, column=0, sticky=tk.W)
+        
+        self.setup_query_bar(main_frame)
+        
         # Results frame
         results_frame = ttk.LabelFrame(main_frame, text="Results", padding="10")
-        results_frame.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        results_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         results_frame.grid_rowconfigure(0, weight=1)
         results_frame.grid_columnconfigure(0, weight=1)
         
         # Treeview for results
-        columns = ('name', 'address', 'phone', 'email', 'website', 'rating', 'category')
-        self.tree = ttk.Treeview(results_frame, columns=columns, show='headings', height=15)
-        
-        # Define headings
-        self.tree.heading('name', text='Business Name')
-        self.tree.heading('address', text='Address')
-        self.tree.heading('phone', text='Phone')
-        self.tree.heading('email', text='Email')
-        self.tree.heading('website', text='Website')
-        self.tree.heading('rating', text='Rating')
-        self.tree.heading('category', text='Category')
+        ttk.Style(self).configure('Results.Treeview', rowheight=self.ROW_HEIGHT)
+        columns = tuple(RESULT_COLUMNS)
+        self.tree = ttk.Treeview(results_frame, columns=columns, show='headings',
+                                 height=self.visible_rows, style='Results.Treeview')
+        
+        # Define headings; sortable columns sort on the server when clicked
+        for column in columns:
+            self.tree.heading(column, text=self.HEADINGS[column])
+            if column in self.SORT_COLUMNS:
+                self.tree.heading(column, command=lambda c=column: self.sort_by(c))
         
         # Configure column widths
         self.tree.column('name', width=150)
@@ -167,25 +396,68 @@ class ResultsViewer(tk.Toplevel):
         self.tree.column('rating', width=70)
         self.tree.column('category', width=100)
         
-        # Scrollbars
-        v_scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        # Scrollbars; the vertical one drives the virtual offset, not the tree
+        self.v_scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.on_scroll)
         h_scrollbar = ttk.Scrollbar(results_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=v_scrollbar.set, xscrollcommand=h_scrollbar.set)
+        self.tree.configure(xscrollcommand=h_scrollbar.set)
         
         # Grid layout
         self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        v_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.v_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         h_scrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
         
+        # Mouse wheel (Windows/macOS and X11) and resize handling
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll_by(-1 if e.delta > 0 else 1) or 'break')
+        self.tree.bind('<Button-4>', lambda e: self.scroll_by(-1) or 'break')
+        self.tree.bind('<Button-5>', lambda e: self.scroll_by(1) or 'break')
+        self.tree.bind('<Prior>', lambda e: self.scroll_by(-self.visible_rows) or 'break')
+        self.tree.bind('<Next>', lambda e: self.scroll_by(self.visible_rows) or 'break')
+        self.tree.bind('<Configure>', self.on_resize)
+        
         # Buttons frame
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=2, column=0, pady=(10, 0))
+        button_frame.grid(row=3, column=0, pady=(10, 0))
         
-        ttk.Button(button_frame, text="Export to Excel", 
-                  command=self.export_to_excel).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Export...", 
+                  command=self.export_results).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Close", 
                   command=self.destroy).pack(side=tk.LEFT, padx=5)
     
+    def setup_query_bar(self, parent):
+        """Filter controls; every filter runs as an indexed query in storage"""
+        query_frame = ttk.LabelFrame(parent, text="Search", padding="10")
+        query_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        
+        self.text_var = tk.StringVar()
+        self.has_email_var = tk.BooleanVar()
+        self.has_phone_var = tk.BooleanVar()
+        self.min_rating_var = tk.StringVar()
+        self.max_rating_var = tk.StringVar()
+        self.location_var = tk.StringVar()
+        
+        ttk.Label(query_frame, text="Text:").pack(side=tk.LEFT)
+        text_entry = ttk.Entry(query_frame, textvariable=self.text_var, width=25)
+        text_entry.pack(side=tk.LEFT, padx=(5, 10))
+        text_entry.bind('<Return>', lambda e: self.apply_filters())
+        
+        ttk.Checkbutton(query_frame, text="Has email", variable=self.has_email_var).pack(side=tk.LEFT)
+        ttk.Checkbutton(query_frame, text="Has phone", variable=self.has_phone_var).pack(side=tk.LEFT, padx=(5, 10))
+        
+        ttk.Label(query_frame, text="Rating:").pack(side=tk.LEFT)
+        ttk.Entry(query_frame, textvariable=self.min_rating_var, width=4).pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Label(query_frame, text="-").pack(side=tk.LEFT)
+        ttk.Entry(query_frame, textvariable=self.max_rating_var, width=4).pack(side=tk.LEFT, padx=(0, 10))
+        
+        # Results of a single task all share its location
+        if not self.task_id:
+            ttk.Label(query_frame, text="Location:").pack(side=tk.LEFT)
+            location_combo = ttk.Combobox(query_frame, textvariable=self.location_var,
+                                          values=Config.LOCATIONS, width=18, state="readonly")
+            location_combo.pack(side=tk.LEFT, padx=(5, 10))
+        
+        ttk.Button(query_frame, text="Search", command=self.apply_filters).pack(side=tk.LEFT, padx=5)
+        ttk.Button(query_frame, text="Clear", command=self.clear_filters).pack(side=tk.LEFT)
+    
     def center_window(self):
         """Center the window on screen"""
         self.update_idletasks()
@@ -193,23 +465,166 @@ class ResultsViewer(tk.Toplevel):
         y = (self.winfo_screenheight() - self.winfo_height()) // 2
         self.geometry(f"+{x}+{y}")
     
+    def apply_filters(self):
+        """Read the query bar and re-run the query"""
+        filters = {'task_id': self.task_id} if self.task_id else {}
+        
+        if self.text_var.get().strip():
+            filters['text'] = self.text_var.get().strip()
+        if self.has_email_var.get():
+            filters['has_email'] = True
+        if self.has_phone_var.get():
+            filters['has_phone'] = True
+        if self.location_var.get().strip():
+            filters['location'] = self.location_var.get().strip()
+        
+        try:
+            for key, var in (('min_rating', self.min_rating_var), ('max_rating', self.max_rating_var)):
+                if var.get().strip():
+                    value = float(var.get())
+                    if not 0 <= value <= 5:
+                        raise ValueError(f"Rating out of range: {value}")
+                    filters[key] = value
+        except ValueError:
+            messagebox.showwarning("Warning", "Rating must be a number between 0 and 5")
+            return
+        
+        self.filters = filters
+        self.refresh()
+    
+    def clear_filters(self):
+        """Reset the query bar and show everything again"""
+        for var in (self.text_var, self.min_rating_var, self.max_rating_var, self.location_var):
+            var.set("")
+        self.has_email_var.set(False)
+        self.has_phone_var.set(False)
+        self.apply_filters()
+    
+    def sort_by(self, column: str):
+        """Sort on a column; clicking it again flips the direction, a third time restores newest first"""
+        field = self.SORT_COLUMNS[column]
+        if self.sort == field and self.descending == (field == 'rating_value'):
+            self.descending = not self.descending
+        elif self.sort == field:
+            self.sort = 'scraped_at'
+            self.descending = True
+        else:
+            self.sort = field
+            self.descending = field == 'rating_value'
+        
+        for name in self.HEADINGS:
+            text = self.HEADINGS[name]
+            if self.SORT_COLUMNS.get(name) == self.sort:
+                text += ' ▼' if self.descending else ' ▲'
+            self.tree.heading(name, text=text)
+        self.refresh()
+    
+    def refresh(self):
+        """Re-count and re-page the results for the current query"""
+        self.total_results = self.db_manager.count_search_results(self.filters)
+        self.cache = ResultsPageCache(self.db_manager, self.filters, sort=self.sort,
+                                      descending=self.descending, projection=RESULT_COLUMNS)
+        self.offset = 0
+        self.render()
+    
     def load_results(self):
-        """Load results into the treeview"""
-        for result in self.results:
-            values = (
-                result.get('name', ''),
-                result.get('address', ''),
-                result.get('phone', ''),
-                result.get('email', ''),
-                result.get('website', ''),
-                result.get('rating', ''),
-                result.get('category', '')
-            )
-            self.tree.insert('', tk.END, values=values)
-    
-    def export_to_excel(self):
-        """Export results to Excel file"""
-        if not self.results:
+        """Show the first window of results"""
+        self.render()
+    
+    def on_resize(self, event):
+        """Adapt the number of visible rows to the tree's height"""
+        # Leave room for the heading row
+        rows = max(1, event.height // self.ROW_HEIGHT - 1)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.render()
+    
+    def on_scroll(self, action: str, amount: str, unit: str = None):
+        """Scrollbar command: translate moveto/scroll requests into an offset"""
+        if action == 'moveto':
+            self.set_offset(int(float(amount) * self.total_results))
+        elif unit == 'pages':
+            self.scroll_by(int(amount) * self.visible_rows)
+        else:
+            self.scroll_by(int(amount))
+    
+    def scroll_by(self, rows: int):
+        self.set_offset(self.offset + rows)
+    
+    def set_offset(self, offset: int):
+        """Move the visible window and re-render if it changed"""
+        offset = max(0, min(offset, self.total_results - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+    
+    def render(self):
+        """Fill the visible rows from the page cache"""
+        rows = self.cache.get_rows(self.offset, self.visible_rows)
+        
+        # Reuse row items; only create or delete when the window size changes
+        while len(self.row_items) < len(rows):
+            self.row_items.append(self.tree.insert('', tk.END))
+        while len(self.row_items) > len(rows):
+            self.tree.delete(self.row_items.pop())
+        
+        for item, result in zip(self.row_items, rows):
+            self.tree.item(item, values=tuple(result.get(column, '') for column in RESULT_COLUMNS))
+        
+        if self.total_results:
+            first = self.offset / self.total_results
+            last = (self.offset + len(rows)) / self.total_results
+            self.v_scrollbar.set(first, last)
+            self.range_var.set(f"Showing {self.offset + 1}-{self.offset + len(rows)} "
+                               f"of {self.total_results}")
+        else:
+            self.v_scrollbar.set(0, 1)
+            self.range_var.set("No results")
+        
+        # Prefetch the page after the visible window off the Tk thread
+        next_offset = self.offset + self.visible_rows + self.cache.page_size // 2
+        if next_offset < self.total_results:
+            self.start_prefetch(next_offset // self.cache.page_size)
+    
+    def start_prefetch(self, index: int):
+        """Fetch a page on the prefetch worker unless it is cached or a fetch is running"""
+        if index in self.cache.pages or self._prefetch is not None:
+            return
+        cache = self.cache
+        future = self._prefetcher.submit(cache.fetch_page, index, cache.cursor(index))
+        self._prefetch = (cache, index, future)
+        self._prefetch_after_id = self.after(self.PREFETCH_POLL_MS, self.finish_prefetch)
+    
+    def finish_prefetch(self):
+        """Cache the prefetched page once the worker is done (runs on the Tk thread)"""
+        cache, index, future = self._prefetch
+        if not future.done():
+            self._prefetch_after_id = self.after(self.PREFETCH_POLL_MS, self.finish_prefetch)
+            return
+        self._prefetch_after_id = None
+        self._prefetch = None
+        
+        try:
+            page = future.result()
+        except Exception as e:
+            logging.warning(f"Could not prefetch results page {index}: {e}")
+            return
+        
+        # Drop pages fetched for a query that has since been replaced
+        if cache is self.cache and index not in self.cache.pages:
+            self.cache.put_page(index, page)
+    
+    def destroy(self):
+        if self._prefetch_after_id is not None:
+            self.after_cancel(self._prefetch_after_id)
+            self._prefetch_after_id = None
+        # Don't block the Tk thread on a running query; the worker exits when it is done
+        self._prefetcher.shutdown(wait=False)
+        super().destroy()
+    
+    def export_results(self):
+        """Export results to a file; the format follows the chosen extension"""
+        if not self.total_results:
             messagebox.showwarning("Warning", "No results to export")
             return
         
@@ -218,57 +633,92 @@ class ResultsViewer(tk.Toplevel):
         keyword = self.task_info.get('keyword', 'results') if self.task_info else 'results'
         default_filename = f"{keyword.replace(' ', '_')}_{timestamp}.xlsx"
         
+        filetypes = []
+        for format_name in ExporterFactory.get_available_formats():
+            exporter = ExporterFactory.EXPORTERS[format_name]
+            filetypes.append((exporter.description, f"*{exporter.extension}"))
+        filetypes.append(("All files", "*.*"))
+        
         # Ask user for save location
         filename = filedialog.asksaveasfilename(
             defaultextension=".xlsx",
-            filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")],
+            filetypes=filetypes,
             initialdir=os.path.join(os.getcwd(), "exports"),
             initialfile=default_filename
         )
         
         if filename:
             try:
-                # Create DataFrame
-                df = pd.DataFrame(self.results)
-                
-                # Reorder columns for better readability
-                column_order = ['name', 'address', 'phone', 'email', 'website', 'rating', 'category']
-                existing_columns = [col for col in column_order if col in df.columns]
-                df = df[existing_columns]
-                
-                # Export to Excel
-                df.to_excel(filename, index=False, engine='openpyxl')
-                
-                messagebox.showinfo("Success", f"Results exported to:\n{filename}")
-                
+                # Exports run as background jobs owned by the main window
+                self.on_export(filename, self.task_id)
             except Exception as e:
-                messagebox.showerror("Error", f"Failed to export results:\n{str(e)}")
+                messagebox.showerror("Error", f"Failed to start export:\n{str(e)}")
 
 class StatusBar(ttk.Frame):
     """Status bar widget"""
     
+    CONNECTION_STATES = {
+        'connecting': ('● Connecting', 'orange'),
+        'connected': ('● Connected', 'green'),
+        'failed': ('● Disconnected', 'red')
+    }
+    
     def __init__(self, parent):
         super().__init__(parent)
         
         self.status_var = tk.StringVar()
         self.status_var.set("Ready")
         
+        # Database connection indicator
+        self.connection_label = tk.Label(self, text="", anchor=tk.W)
+        self.connection_label.pack(side=tk.LEFT, padx=5)
+        
         self.status_label = ttk.Label(self, textvariable=self.status_var)
         self.status_label.pack(side=tk.LEFT, padx=5)
         
-        # Progress bar (hidden by default)
+        # Aggregate throughput of running tasks
+        self.activity_var = tk.StringVar()
+        self.activity_label = ttk.Label(self, textvariable=self.activity_var)
+        self.activity_label.pack(side=tk.LEFT, padx=15)
+        
+        # Progress bar and cancel button (hidden by default)
         self.progress = ttk.Progressbar(self, mode='indeterminate')
+        self.cancel_button = ttk.Button(self, text="Cancel")
         
     def set_status(self, message: str):
         """Set status message"""
         self.status_var.set(message)
     
+    def set_activity(self, message: str):
+        """Set the running tasks summary"""
+        self.activity_var.set(message)
+    
+    def set_connection_state(self, state: str):
+        """Update the database connection indicator"""
+        text, color = self.CONNECTION_STATES[state]
+        self.connection_label.config(text=text, fg=color)
+    
     def show_progress(self):
         """Show and start progress bar"""
         self.progress.pack(side=tk.RIGHT, padx=5)
         self.progress.start()
     
+    def set_progress(self, percent: float, cancel_command: Callable = None):
+        """Show determinate progress, with an optional cancel button"""
+        self.progress.stop()
+        self.progress.config(mode='determinate', maximum=100, value=percent)
+        
+        if not self.progress.winfo_ismapped():
+            self.progress.pack(side=tk.RIGHT, padx=5)
+        
+        if cancel_command:
+            self.cancel_button.config(command=cancel_command)
+            if not self.cancel_button.winfo_ismapped():
+                self.cancel_button.pack(side=tk.RIGHT, padx=5, before=self.progress)
+    
     def hide_progress(self):
         """Hide and stop progress bar"""
         self.progress.stop()
+        self.progress.config(mode='indeterminate', value=0)
         self.progress.pack_forget()
+        self.cancel_button.pack_forget()
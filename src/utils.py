@@ -6,8 +6,12 @@ import os
 import re
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional
-import pandas as pd
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Rows per worksheet, including the header row (Excel's hard limit)
+EXCEL_MAX_ROWS = 1048576
+EXCEL_MAX_COLUMN_WIDTH = 50
 
 def setup_directories():
     """Create necessary directories if they don't exist"""
@@ -56,8 +60,11 @@ def sanitize_filename(filename: str) -> str:
     
     return filename
 
-def export_to_excel(data: List[Dict], filename: str, sheet_name: str = "Results") -> bool:
+def export_to_excel(data: Iterable[Dict], filename: str, sheet_name: str = "Results") -> bool:
     """Export data to Excel file with formatting"""
+    # pandas is slow to import and only needed here
+    import pandas as pd
+    
     try:
         # Ensure exports directory exists
         os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else 'exports', exist_ok=True)
@@ -99,6 +106,126 @@ def export_to_excel(data: List[Dict], filename: str, sheet_name: str = "Results"
         logging.error(f"Failed to export data to Excel: {e}")
         return False
 
+class ExportCancelled(Exception):
+    """Raised when an export is cancelled before it completes"""
+
+class ColumnWidthTracker:
+    """Running per-column text length statistics used to size Excel columns"""
+    
+    def __init__(self, columns: List[str]):
+        self.columns = columns
+        self.max_lengths = [len(column) for column in columns]
+        self.count = 0
+    
+    def update(self, values: List):
+        """Record the rendered lengths of one row"""
+        self.count += 1
+        for i, value in enumerate(values):
+            length = len(str(value)) if value is not None else 0
+            if length > self.max_lengths[i]:
+                self.max_lengths[i] = length
+    
+    def widths(self) -> List[int]:
+        """Column widths: longest value seen plus padding, capped"""
+        return [min(length + 2, EXCEL_MAX_COLUMN_WIDTH) for length in self.max_lengths]
+
+def _excel_value(value):
+    """Convert a result field to something openpyxl can write"""
+    if value is None or isinstance(value, (str, int, float, bool, datetime)):
+        return value
+    return str(value)
+
+def export_rows_to_excel(rows: Iterable[Dict], filename: str, columns: List[str],
+                         sheet_name: str = "Results", width_sample: int = 1000,
+                         progress_callback: Callable[[int], None] = None,
+                         cancel_event: threading.Event = None,
+                         progress_interval: int = 1000) -> int:
+    """Stream rows (e.g. from a database cursor) into an Excel file
+    
+    Uses openpyxl write-only mode so memory stays bounded regardless of the
+    number of rows. Column widths must be known before the first row is
+    written, so they are computed from running statistics over the first
+    `width_sample` rows, which are the only rows held in memory. Rows beyond
+    Excel's per-sheet limit continue on additional sheets.
+
+    `progress_callback` receives the running row count every
+    `progress_interval` rows; setting `cancel_event` aborts the export with
+    ExportCancelled and the partial file is removed.
+
+    With no rows, a workbook holding only the header row is written.
+    Returns the number of data rows written.
+    """
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+    
+    # Ensure the target directory exists; bare filenames go to the working directory
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    workbook = Workbook(write_only=True)
+    tracker = ColumnWidthTracker(columns)
+    rows = iter(rows)
+    
+    # Buffer a bounded sample to size the columns
+    sample = []
+    for row in rows:
+        values = [_excel_value(row.get(column, '')) for column in columns]
+        tracker.update(values)
+        sample.append(values)
+        if len(sample) >= width_sample:
+            break
+    
+    widths = tracker.widths()
+    sheet_index = 0
+    sheet_rows = EXCEL_MAX_ROWS
+    written = 0
+    worksheet = None
+    
+    def all_rows():
+        yield from sample
+        for row in rows:
+            yield [_excel_value(row.get(column, '')) for column in columns]
+    
+    def new_sheet():
+        title = sheet_name if sheet_index == 1 else f"{sheet_name} {sheet_index}"
+        sheet = workbook.create_sheet(title)
+        for i, width in enumerate(widths, 1):
+            sheet.column_dimensions[get_column_letter(i)].width = width
+        sheet.append(columns)
+        return sheet
+    
+    for values in all_rows():
+        if sheet_rows >= EXCEL_MAX_ROWS:
+            sheet_index += 1
+            worksheet = new_sheet()
+            sheet_rows = 1
+        
+        worksheet.append(values)
+        sheet_rows += 1
+        written += 1
+        
+        if written % progress_interval == 0:
+            if cancel_event is not None and cancel_event.is_set():
+                # Finalize the streamed sheets so their temp files are released
+                workbook.save(filename)
+                os.remove(filename)
+                raise ExportCancelled(f"Export to {filename} cancelled")
+            if progress_callback:
+                progress_callback(written)
+    
+    if worksheet is None:
+        # Still write the file the caller asked for, with just the header row
+        logging.warning(f"No data to export; writing only the header to {filename}")
+        sheet_index = 1
+        new_sheet()
+    
+    workbook.save(filename)
+    if progress_callback:
+        progress_callback(written)
+    logging.info(f"Exported {written} rows to {filename}")
+    return written
+
 def get_file_size(filepath: str) -> str:
     """Get human-readable file size"""
     try:
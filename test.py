@@ -43,8 +43,8 @@ def test_database_connection():
     print("\nTesting database connection...")
     
     try:
-        from src.database import DatabaseManager
-        db = DatabaseManager()
+        from src.database import StorageFactory
+        db = StorageFactory.create_storage()
         print("✅ Database connection successful")
         
         # Test basic operations
@@ -93,6 +93,7 @@ def test_configuration():
     try:
         from config.config import Config
         
+        print(f"✅ Storage backend: {Config.STORAGE_BACKEND}")
         print(f"✅ MongoDB URI: {Config.MONGODB_URI}")
         print(f"✅ Database name: {Config.DATABASE_NAME}")
         print(f"✅ Window size: {Config.WINDOW_WIDTH}x{Config.WINDOW_HEIGHT}")